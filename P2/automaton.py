@@ -9,14 +9,52 @@ Jose-Ignacio Fernández de la Puente Perez y Juan Larrondo Fernández de Córdob
 Última modificación: 7/nov/2025
 """
 
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from graphviz import Digraph
 from queue import Queue as q
 
+from bitset_nfa import BitsetNFA
+from lazy_dfa import LazyDFA
+from matcher import Matcher
+from searcher import Searcher
+
 """
 Podéis implementar cualquier función auxiliar que consideréis necesaria
 """
 
 
+class SymbolClass(frozenset):
+    """
+    Símbolo de transición que representa a un conjunto de caracteres.
+
+    Las clases de caracteres de las expresiones regulares (p.ej. [0-9]) se
+    compilan a una sola transición etiquetada con una SymbolClass en lugar de
+    una unión de transiciones. Los símbolos de un autómata deben ser disjuntos:
+    un carácter pertenece como mucho a una clase y, si pertenece a una, no es
+    a la vez un símbolo del alfabeto.
+    """
+
+    def __str__(self):
+        chars = sorted(self)
+        parts = []
+        i = 0
+        while i < len(chars):
+            j = i
+            while j + 1 < len(chars) and ord(chars[j + 1]) == ord(chars[j]) + 1:
+                j += 1
+            parts.append(chars[i] if j - i < 2 else f"{chars[i]}-{chars[j]}")
+            if j - i == 1:
+                parts.append(chars[j])
+            i = j + 1
+        return "[" + "".join(parts) + "]"
+
+    def __repr__(self):
+        return f"SymbolClass({str(self)!r})"
+
+
 class FiniteAutomaton:
     """
     Clase que representa un autómata finito (determinista o no determinista).
@@ -49,6 +87,9 @@ class FiniteAutomaton:
         self.symbols = symbols
         self.transitions = transitions  # Ya viene como dicc de diccs
         self.final_states = final_states
+        self._closures = None  # Índice de cierres lambda, ver _closure_index()
+        self._engines = {}  # Motores de evaluación en caché, ver accepts()
+        self._classes = None  # Carácter -> SymbolClass, ver _symbol_classes()
         
     def add_transition(self, start_state, symbol, end_state):
         """
@@ -71,6 +112,9 @@ class FiniteAutomaton:
             return False
 
         # Agregar la transición a la estructura
+        self._closures = None
+        self._engines = {}
+        self._classes = None
         if start_state in self.transitions:
             if symbol in self.transitions[start_state]:
                 if end_state in self.transitions[start_state][symbol]:
@@ -84,7 +128,7 @@ class FiniteAutomaton:
         
         return True
 
-    def accepts(self, cadena):
+    def accepts(self, cadena, backend="nfa"):
         """
         Determina si el autómata acepta una cadena de entrada.
         
@@ -95,15 +139,40 @@ class FiniteAutomaton:
 
         Asumimos que la cadena no contiene el simbolo lambda, por lo que 
         todo simbolo que no sea valido se devuelve False.
+
+        El motor de evaluación se elige con backend:
+
+        - "nfa": simulación directa sobre conjuntos de estados.
+        - "bitset": simulación sobre máscaras de bits (BitsetNFA), útil cuando
+          determinizar es demasiado caro.
+        - "lazy": AFD construido bajo demanda (LazyDFA).
+        - "dfa": tabla compilada con compile().
+
+        Los motores se construyen la primera vez que se usan y se guardan
+        hasta la siguiente llamada a add_transition().
+
+        Si entre los símbolos hay clases de caracteres (SymbolClass), cada
+        carácter de la cadena se traduce primero a la clase que lo contiene.
         
         Args:
             cadena (str): Cadena de entrada a evaluar.
+            backend (str, optional): Motor de evaluación. Por defecto "nfa".
         
         Returns:
             bool: True si la cadena es aceptada por el autómata, False en caso contrario.
                  También retorna False si la cadena contiene símbolos no pertenecientes
                  al alfabeto del autómata.
+
+        Raises:
+            ValueError: Si el motor no es válido.
         """
+        classes = self._symbol_classes()
+        if classes:
+            cadena = [classes.get(symbol, symbol) for symbol in cadena]
+
+        if backend != "nfa":
+            return self._engine(backend).accepts(cadena)
+
         current_states = self.lambda_clausure({self.initial_state})
         i = 0
 
@@ -124,7 +193,168 @@ class FiniteAutomaton:
         
         return current_states.intersection(self.final_states) != set()
 
-    def to_deterministic(self):
+    def accepts_many(self, cadenas, workers=None, chunksize=1024, executor="process"):
+        """
+        Evalúa muchas cadenas con el mismo autómata.
+
+        El autómata se compila una sola vez (compile()) y las cadenas se
+        reparten en bloques de chunksize entre workers procesos (o hilos). La
+        tabla compilada se envía a cada proceso una única vez, al arrancarlo.
+        Los resultados se devuelven en el mismo orden que la entrada, a medida
+        que se calculan; como mucho hay 2 * workers bloques en vuelo.
+
+        Args:
+            cadenas (iterable[str]): Cadenas a evaluar. Puede ser un generador.
+            workers (int, optional): Número de procesos o hilos. Si es None o
+                1, las cadenas se evalúan en el proceso actual.
+            chunksize (int, optional): Cadenas por bloque. Por defecto 1024.
+            executor (str, optional): "process" (por defecto) o "thread".
+
+        Yields:
+            bool: Resultado de accepts() para cada cadena, en orden.
+
+        Raises:
+            ValueError: Si el tipo de executor no es válido.
+        """
+        compiled = self._engine("dfa")
+
+        if not workers or workers <= 1:
+            for cadena in cadenas:
+                yield compiled.accepts(cadena)
+            return
+
+        if executor == "process":
+            pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(compiled,))
+            task = _accepts_chunk
+        elif executor == "thread":
+            pool = ThreadPoolExecutor(workers)
+            task = compiled._accepts_list
+        else:
+            raise ValueError(f"Unknown executor: {executor}")
+
+        cadenas = iter(cadenas)
+        pending = deque()
+        with pool:
+            # Los bloques pendientes se cancelan antes de que la salida del
+            # with espere a que terminen (p.ej. si se cierra el generador)
+            try:
+                while True:
+                    chunk = list(islice(cadenas, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(task, chunk))
+                    if len(pending) >= 2 * workers:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def matcher(self, encoding="utf-8"):
+        """
+        Crea un evaluador incremental para entradas que llegan por bloques.
+
+        Args:
+            encoding (str, optional): Codificación de los bloques de tipo bytes.
+                Por defecto "utf-8".
+
+        Returns:
+            Matcher: Evaluador con feed(), is_accepting(), reset(),
+                     snapshot()/restore() y feed_stream() para asyncio.
+        """
+        return Matcher(self._engine("dfa"), encoding)
+
+    def search(self, text, pos=0, endpos=None):
+        """
+        Busca la primera aparición del autómata dentro de un texto.
+
+        Se usa la semántica leftmost-longest: de las apariciones que empiezan
+        más a la izquierda se devuelve la más larga (ver searcher.py).
+
+        Args:
+            text (str | bytes | bytearray | memoryview): Texto. En los bytes
+                se buscan las cadenas codificadas en UTF-8.
+            pos (int, optional): Posición en la que empieza la búsqueda.
+            endpos (int, optional): Posición en la que termina.
+
+        Returns:
+            Match | None: La aparición, con sus posiciones, o None.
+        """
+        return self.searcher().search(text, pos, endpos)
+
+    def finditer(self, text, pos=0, endpos=None):
+        """
+        Recorre las apariciones sin solapamiento del autómata dentro de un texto.
+
+        Args:
+            text (str | bytes | bytearray | memoryview): Texto.
+            pos (int, optional): Posición en la que empieza la búsqueda.
+            endpos (int, optional): Posición en la que termina.
+
+        Returns:
+            iterator[Match]: Apariciones leftmost-longest, de izquierda a derecha.
+        """
+        return self.searcher().finditer(text, pos, endpos)
+
+    def searcher(self):
+        """
+        Devuelve (construyéndolo si hace falta) el buscador del autómata.
+
+        Returns:
+            Searcher: Buscador sobre la tabla compilada del autómata.
+        """
+        searcher = self._engines.get("search")
+        if searcher is None:
+            searcher = self._engines["search"] = Searcher(self._engine("dfa"))
+        return searcher
+
+    def _engine(self, backend):
+        """
+        Devuelve (construyéndolo si hace falta) el motor de evaluación pedido.
+
+        Args:
+            backend (str): "bitset", "lazy", "dfa" o "bytes" (tabla compilada
+                sobre bytes UTF-8, ver CompiledAutomaton.encode()).
+
+        Returns:
+            Objeto con un método accepts(cadena).
+
+        Raises:
+            ValueError: Si el motor no es válido.
+        """
+        engine = self._engines.get(backend)
+        if engine is None:
+            if backend == "bitset":
+                engine = BitsetNFA(self)
+            elif backend == "lazy":
+                engine = LazyDFA(self)
+            elif backend == "dfa":
+                engine = self.compile()
+            elif backend == "bytes":
+                engine = self._engine("dfa").encode()
+            else:
+                raise ValueError(f"Unknown backend: {backend}")
+            self._engines[backend] = engine
+        return engine
+
+    def _symbol_classes(self):
+        """
+        Devuelve el diccionario {carácter: SymbolClass} de las clases del alfabeto.
+
+        Returns:
+            dict: Clase de cada carácter que pertenece a alguna SymbolClass
+                  (vacío si el alfabeto no tiene clases).
+        """
+        if self._classes is None:
+            self._classes = {}
+            for symbol in self.symbols:
+                if isinstance(symbol, SymbolClass):
+                    for char in symbol:
+                        self._classes[char] = symbol
+        return self._classes
+
+    def to_deterministic(self, state_names=False):
         """
         Convierte el autómata a su versión determinista equivalente (AFD).
         
@@ -132,151 +362,241 @@ class FiniteAutomaton:
         un autómata finito no determinista (AFN) con transiciones lambda en un
         autómata finito determinista (AFD) equivalente. Cada estado del AFD
         representa un conjunto de estados del AFN original.
+
+        Args:
+            state_names (bool, optional): Si es True, cada estado se nombra con
+                el conjunto de estados del AFN que representa (p.ej. "{q0, q1}").
+                Por defecto es False y los estados se nombran "q0", "q1", ...
+                según su orden de descubrimiento. El conjunto vacío se llama
+                siempre "Empty".
         
         Returns:
             FiniteAutomaton: Nuevo autómata finito determinista equivalente al original.
-                            Los estados del nuevo autómata son representaciones en
-                            cadena de los conjuntos de estados del autómata original.
         
         Note:
             Si el autómata original ya es determinista, el resultado será equivalente
             pero con una representación diferente de los estados.
         """
-        init_st_set = self.lambda_clausure({self.initial_state})
-        all_st_set_list = [init_st_set]
-        new_init_st = str(init_st_set)
-        new_st_list = [new_init_st]
-        new_final_states = set()
-        if init_st_set.intersection(self.final_states) != set():
-            new_final_states.add(new_init_st)
+        symbols, subsets, delta = self._subset_construction()
 
-        A = FiniteAutomaton(new_init_st, new_st_list, self.symbols, {}, set())
+        names = []
+        for i, subset in enumerate(subsets):
+            if not subset:
+                names.append("Empty")
+            elif state_names:
+                names.append("{" + ", ".join(sorted(subset)) + "}")
+            else:
+                names.append(f"q{i}")
+
+        transitions = {}
+        for i, row in enumerate(delta):
+            transitions[names[i]] = {symbol: {names[j]} for symbol, j in zip(symbols, row)}
+
+        final_states = {names[i] for i, subset in enumerate(subsets)
+                        if not self.final_states.isdisjoint(subset)}
+
+        return FiniteAutomaton(names[0], names, self.symbols, transitions, final_states)
+
+    def _subset_construction(self):
+        """
+        Construcción de subconjuntos sobre índices enteros.
+
+        Los subconjuntos descubiertos se indexan en un diccionario por su
+        frozenset, y todos los movimientos de un subconjunto (uno por símbolo)
+        se calculan en una única pasada sobre sus estados.
+
+        Returns:
+            tuple[list, list[frozenset[str]], list[list[int]]]: Tupla con:
+                - Lista de símbolos (orden de las columnas).
+                - Lista de subconjuntos; el índice de cada uno es su id en el
+                  AFD y el 0 es el inicial.
+                - Tabla delta[id][columna] -> id destino (AFD completo).
+        """
+        symbols = sorted(self.symbols, key=str)
+        column = {symbol: i for i, symbol in enumerate(symbols)}
+        closures = self._closure_index()
+        transitions = self.transitions
+
+        initial = frozenset(self.lambda_clausure({self.initial_state}))
+        subset_ids = {initial: 0}
+        subsets = [initial]
+        delta = []
 
         i = 0
-        while i < len(all_st_set_list):
-            current_st_set = all_st_set_list[i]
-
-            for s in self.symbols:
-                goal_st_set = self.symbol_transitions(current_st_set, s)
-
-                new_goal_st = "Empty"
-                if goal_st_set not in all_st_set_list:
-                    if len(goal_st_set) > 0:
-                        new_goal_st = str(goal_st_set)
-                    new_st_list.append(new_goal_st)
-                    all_st_set_list.append(goal_st_set)
-                
-                elif len(goal_st_set) > 0:
-                    j = all_st_set_list.index(goal_st_set)
-                    new_goal_st = new_st_list[j]
-                A.add_transition(new_st_list[i], s, new_goal_st)
+        while i < len(subsets):
+            moves = [set() for _ in symbols]
+            for state in subsets[i]:
+                for symbol, end_states in transitions.get(state, {}).items():
+                    col = column.get(symbol)
+                    if col is None:
+                        continue  # Transición lambda o símbolo fuera del alfabeto
+                    goal = moves[col]
+                    for end_state in end_states:
+                        goal.update(closures.get(end_state, (end_state,)))
 
-                if goal_st_set.intersection(self.final_states) != set():
-                    new_final_states.add(new_goal_st)
+            row = []
+            for goal in moves:
+                goal = frozenset(goal)
+                j = subset_ids.get(goal)
+                if j is None:
+                    j = subset_ids[goal] = len(subsets)
+                    subsets.append(goal)
+                row.append(j)
+            delta.append(row)
             i += 1
 
-        A.final_states = new_final_states
-
-        return A
+        return symbols, subsets, delta
 
-    def to_minimized(self):
+    def to_minimized(self, algorithm="hopcroft"):
         """
         Minimiza el autómata eliminando estados equivalentes.
         
-        Implementa el algoritmo de minimización de autómatas finitos deterministas
-        mediante el método de partición-refinamiento. Primero elimina estados
-        inalcanzables mediante BFS, luego agrupa estados equivalentes en clases
-        de equivalencia iterativamente hasta que no se puedan refinar más.
+        Primero se descartan los estados inalcanzables desde el inicial y, si
+        falta alguna transición, se completa el autómata con un estado sumidero
+        implícito. Después se calcula la partición en clases de equivalencia
+        con el algoritmo elegido:
+
+        - "hopcroft": refinamiento de particiones de Hopcroft, O(n·k·log n),
+          con índices de transiciones inversas y una lista de separadores.
+        - "moore": refinamiento iterativo de Moore, O(n²·k) en el peor caso;
+          en cada ronda se separan los estados cuyas transiciones llevan a
+          clases distintas.
+
+        Ambos algoritmos producen el mismo autómata salvo renombrado.
         
+        Args:
+            algorithm (str, optional): "hopcroft" (por defecto) o "moore".
+
         Returns:
             FiniteAutomaton: Nuevo autómata finito minimizado equivalente al original.
-                            El autómata resultante tiene el menor número posible de
-                            estados manteniendo el mismo lenguaje reconocido.
+                            Cada estado se nombra con el conjunto de estados
+                            originales que agrupa.
+
+        Raises:
+            ValueError: Si el algoritmo no es válido.
         
         Note:
             El autómata debe ser determinista para que la minimización sea correcta.
             Si el autómata no es determinista, primero debe aplicarse to_deterministic().
         """
-        # BFS
-        reachable_st, transitions = self.automaton_bfs()
-        NF_states = set(reachable_st) - self.final_states
-
-        # Iteraciones
-        current_classes = {st: 0 if st in NF_states else 1 for st in reachable_st}
-        old_classes = {}
-
-        flag = True
-        k = 1
-        while flag:
-            flag = False
-            old_classes = current_classes
-            current_classes = {}
-            classes_map = {}
-
-            i = 0
-            class_number = 0
-            for st1 in reachable_st:
-                if st1 not in current_classes.keys():
-                    if st1 == list(reachable_st)[0]:
-                        current_classes[st1] = 0
-                        classes_map[0] = {st1}
-                    else:
-                        class_number += 1
-                        current_classes[st1] = class_number
-                        classes_map[class_number] = {st1}
-                
-                for st2 in list(reachable_st)[i+1:]:
-                    same_class = False
-                    if (st2 not in current_classes.keys()) and (old_classes[st2] == old_classes[st1]):
-                        same_class = True
-                        for symbol in transitions[st2]:
-                            stf1 = list(transitions[st1][symbol])[0]
-                            stf2 = list(transitions[st2][symbol])[0]
-                            if old_classes[stf1] != old_classes[stf2]:
-                                same_class = False
-                                break
-                    if same_class:
-                        current_classes[st2] = current_classes[st1]
-                        classes_map[class_number].add(st2)
-                i += 1
-                if i > len(reachable_st):
-                    break
-            if current_classes != old_classes:
-                flag = True
-            k += 1
-
-        # Autómata Minimizado
-        new_states = []
-        for st in classes_map.values():
-            new_states.append(str(st))
-
-        if len(self.final_states) > 0:
-            final_class = current_classes[list(self.final_states)[0]]
-            new_final_states = {str(classes_map[final_class])}
+        if algorithm == "hopcroft":
+            refine = _hopcroft
+        elif algorithm == "moore":
+            refine = _moore
         else:
-            new_final_states = set()
+            raise ValueError(f"Unknown minimization algorithm: {algorithm}")
 
-        initial_class = current_classes[self.initial_state]
-        new_initial_state = str(classes_map[initial_class])
+        states, symbols, delta = self._reachable_table()
+        labels = [state in self.final_states for state in states]
+        block_of = refine(delta, len(symbols), labels)
 
-        A = FiniteAutomaton(new_initial_state, new_states, self.symbols, {}, new_final_states)
-        for state in reachable_st:
-            j = current_classes[state]
-            current_st = str(classes_map[j])
-            for symbol in transitions[state]:
-                for state_fin in transitions[state][symbol]:
-                    i = current_classes[state_fin]
-                    A.add_transition(current_st, symbol, str(classes_map[i]))
+        # Estados del autómata minimizado, en orden de descubrimiento
+        members = {}
+        for i, block in enumerate(block_of):
+            members.setdefault(block, []).append(i)
+
+        names = {}
+        for block, ids in members.items():
+            real = sorted(states[i] for i in ids if states[i] is not None)
+            if real:
+                names[block] = "{" + ", ".join(real) + "}"
+
+        transitions = {}
+        for block, name in names.items():
+            row = delta[members[block][0]]
+            transitions[name] = {}
+            for symbol, j in zip(symbols, row):
+                goal = names.get(block_of[j])
+                if goal is not None:
+                    transitions[name][symbol] = {goal}
+
+        final_states = {names[block_of[i]] for i, label in enumerate(labels) if label}
+
+        return FiniteAutomaton(names[block_of[0]], list(names.values()), self.symbols,
+                               transitions, final_states)
+
+    def _reachable_table(self):
+        """
+        Tabla de transiciones entera de la parte alcanzable de un AFD.
+
+        Returns:
+            tuple[list, list, list[list[int]]]: Tupla con:
+                - Nombres de los estados alcanzables en orden BFS (el 0 es el
+                  inicial). Si el autómata no es completo se añade al final un
+                  estado sumidero con nombre None.
+                - Lista de símbolos (orden de las columnas).
+                - Tabla delta[estado][columna] -> estado destino.
+        """
+        symbols = sorted(self.symbols, key=str)
+        states = [self.initial_state]
+        index = {self.initial_state: 0}
+        delta = []
+        sink = None
+
+        i = 0
+        while i < len(states):
+            state_transitions = self.transitions.get(states[i], {})
+            row = []
+            for symbol in symbols:
+                end_states = state_transitions.get(symbol)
+                if not end_states:
+                    if sink is None:
+                        sink = []
+                    sink.append((i, len(row)))
+                    row.append(-1)
+                    continue
+                end_state = next(iter(end_states))
+                j = index.get(end_state)
+                if j is None:
+                    j = index[end_state] = len(states)
+                    states.append(end_state)
+                row.append(j)
+            delta.append(row)
+            i += 1
+
+        if sink is not None:
+            j = len(states)
+            states.append(None)
+            delta.append([j] * len(symbols))
+            for i, col in sink:
+                delta[i][col] = j
+
+        return states, symbols, delta
+
+    def compile(self):
+        """
+        Compila el autómata a una tabla de transiciones compacta.
+
+        Si el autómata no es determinista, primero se aplica to_deterministic().
+        El resultado numera estados y símbolos con enteros y guarda las
+        transiciones en un array('i') plano, de forma que evaluar una cadena
+        solo realiza accesos por índice.
+
+        Returns:
+            CompiledAutomaton: Tabla compilada equivalente al autómata.
+        """
+        automaton = self if self._is_deterministic() else self.to_deterministic()
+        return CompiledAutomaton.from_automaton(automaton)
+
+    def _is_deterministic(self):
+        """
+        Comprueba si el autómata es determinista (sin transiciones lambda y
+        con a lo sumo un destino por estado y símbolo).
+        """
+        for transitions in self.transitions.values():
+            for symbol, end_states in transitions.items():
+                if symbol is None or len(end_states) > 1:
+                    return False
+        return True
 
-        return A
-        
     def draw(self, path="./images/", filename="automata.png", view=False):
         """
         Genera una representación visual del autómata usando Graphviz.
         
         Crea un diagrama en formato PNG que muestra los estados, transiciones
         y estados finales del autómata. Los estados finales se representan
-        con doble círculo y las transiciones lambda se etiquetan con "λ".
+        con doble círculo, las transiciones lambda se etiquetan con "λ" y las
+        clases de caracteres con su representación como texto ("[0-9]").
         
         Args:
             path (str, optional): Directorio donde se guardará la imagen.
@@ -307,12 +627,23 @@ class FiniteAutomaton:
         dot.edge("", self.initial_state)
 
         # Almacenar transiciones
+        for state_ini, label, state_fin in self._edges():
+            dot.edge(state_ini, state_fin, label)
+
+        dot.render(path+filename, view=view)
+
+    def _edges(self):
+        """
+        Recorre las transiciones del autómata, para draw() y __str__().
+
+        Yields:
+            tuple[str, str, str]: (origen, etiqueta, destino). Las transiciones
+                lambda se etiquetan con "λ" y los símbolos con su texto.
+        """
         for state_ini in self.transitions:
             for symbol in self.transitions[state_ini]:
                 for state_fin in self.transitions[state_ini][symbol]:
-                    dot.edge(state_ini, state_fin, symbol if symbol is not None else "λ")
-
-        dot.render(path+filename, view=view)
+                    yield state_ini, str(symbol) if symbol is not None else "λ", state_fin
 
 
     
@@ -322,33 +653,120 @@ class FiniteAutomaton:
         
         El cierre lambda incluye todos los estados alcanzables desde los estados
         actuales mediante cero o más transiciones lambda (ε-transiciones).
+        Los cierres de cada estado se leen del índice de _closure_index(), por
+        lo que el coste es proporcional al tamaño del resultado.
         
         Args:
             current_states (set[str]): Conjunto de estados desde los que calcular
-                                       el cierre lambda.
+                                       el cierre lambda. No se modifica.
         
         Returns:
-            set[str]: Conjunto de estados actualizado con el cierre lambda.
-                     El conjunto incluye los estados originales más todos los
+            set[str]: Nuevo conjunto con los estados originales más todos los
                      estados alcanzables mediante transiciones lambda.
         """
+        closures = self._closure_index()
         new_states = set()
         for state in current_states:
-            if state in self.transitions:
-                transitions = self.transitions[state]
-                for s in transitions:
-                    if s is None:
-                        new_states.update(self.lambda_clausure(transitions[s]))
-        current_states.update(new_states)
-        return current_states
+            new_states.update(closures.get(state, (state,)))
+        return new_states
+
+    def _closure_index(self):
+        """
+        Devuelve el índice de cierres lambda, calculándolo si no existe.
+
+        El índice se construye una sola vez por autómata y se invalida en
+        add_transition().
+
+        Returns:
+            dict[str, frozenset[str]]: Cierre lambda de cada estado.
+        """
+        if self._closures is None:
+            self._closures = self._compute_closures()
+        return self._closures
+
+    def _compute_closures(self):
+        """
+        Calcula el cierre lambda de todos los estados en una sola pasada.
+
+        Aplica el algoritmo de Tarjan (iterativo) sobre el grafo de transiciones
+        lambda. Todos los estados de una componente fuertemente conexa comparten
+        cierre, y Tarjan emite las componentes en orden topológico inverso, de
+        modo que al cerrar una componente ya se conocen los cierres de todas sus
+        sucesoras. Los ciclos lambda no suponen ningún problema.
+
+        Returns:
+            dict[str, frozenset[str]]: Cierre lambda de cada estado.
+        """
+        lambda_edges = {}
+        for state, transitions in self.transitions.items():
+            if None in transitions:
+                lambda_edges[state] = list(transitions[None])
+
+        closures = {}
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        counter = 0
+
+        for root in lambda_edges:
+            if root in index:
+                continue
+            # Pila de trabajo: (estado, iterador sobre sus sucesores lambda)
+            work = [(root, iter(lambda_edges.get(root, ())))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                state, successors = work[-1]
+                advanced = False
+                for succ in successors:
+                    if succ not in index:
+                        index[succ] = lowlink[succ] = counter
+                        counter += 1
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        work.append((succ, iter(lambda_edges.get(succ, ()))))
+                        advanced = True
+                        break
+                    if succ in on_stack:
+                        lowlink[state] = min(lowlink[state], index[succ])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[state])
+
+                if lowlink[state] == index[state]:
+                    # state es la raíz de una componente: se extrae y se cierra
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == state:
+                            break
+                    closure = set(component)
+                    for member in component:
+                        for succ in lambda_edges.get(member, ()):
+                            if succ not in closure:
+                                closure.update(closures[succ])
+                    closure = frozenset(closure)
+                    for member in component:
+                        closures[member] = closure
+
+        return closures
 
     def symbol_transitions(self, current_states, symbol):
         """
         Calcula los estados alcanzables desde un conjunto de estados mediante un símbolo.
         
-        Primero aplica el cierre lambda a los estados actuales, luego aplica
-        las transiciones con el símbolo dado, y finalmente aplica nuevamente
-        el cierre lambda a los estados resultantes.
+        Aplica las transiciones con el símbolo dado y después el cierre lambda
+        a los estados resultantes.
         
         Args:
             current_states (set[str]): Conjunto de estados desde los que partir.
@@ -361,12 +779,9 @@ class FiniteAutomaton:
         new_states = set()
         for state in current_states:
             if state in self.transitions:
-                transitions = self.transitions[state]
-                for s in transitions:
-                    if s is symbol:
-                        new_states.update(self.lambda_clausure(transitions[s]))
+                new_states.update(self.transitions[state].get(symbol, ()))
         
-        return new_states
+        return self.lambda_clausure(new_states)
 
     def automaton_bfs(self) -> tuple[list[str], dict[str, dict[str, set[str]]]]:
         """
@@ -436,10 +851,416 @@ class FiniteAutomaton:
         s += f"  Initial state: {self.initial_state}\n"
         s += f"  Final states: {', '.join(self.final_states)}\n"
         s += "  Transitions:\n"
-        for state_ini in self.transitions:
-            for symbol in self.transitions[state_ini]:
-                for state_fin in self.transitions[state_ini][symbol]:
-                    sym = symbol if symbol is not None else "λ"
-                    s += f"    {state_ini} -{sym}-> {state_fin}\n"
+        for state_ini, sym, state_fin in self._edges():
+            s += f"    {state_ini} -{sym}-> {state_fin}\n"
+
+        return s
+
+
+def _hopcroft(delta, n_symbols, labels):
+    """
+    Algoritmo de minimización de Hopcroft sobre una tabla entera.
+
+    Args:
+        delta (list[list[int]]): Tabla de transiciones completa.
+        n_symbols (int): Número de columnas de la tabla.
+        labels (list): Etiqueta de cada estado; la partición inicial agrupa
+            los estados con la misma etiqueta.
+
+    Returns:
+        list[int]: Clase de equivalencia de cada estado.
+    """
+    n = len(delta)
+
+    # Índice inverso por símbolo: inverse[c][t] = estados s con delta[s][c] = t
+    inverse = [{} for _ in range(n_symbols)]
+    for s, row in enumerate(delta):
+        for c, t in enumerate(row):
+            inverse[c].setdefault(t, []).append(s)
+
+    groups = {}
+    for s, label in enumerate(labels):
+        groups.setdefault(label, []).append(s)
+
+    blocks = []
+    block_of = [0] * n
+    for members in groups.values():
+        for s in members:
+            block_of[s] = len(blocks)
+        blocks.append(set(members))
+
+    # Basta con usar como separadores todos los bloques salvo el mayor
+    largest = max(range(len(blocks)), key=lambda b: len(blocks[b]), default=0)
+    work = [(b, c) for b in range(len(blocks)) if b != largest for c in range(n_symbols)]
+
+    while work:
+        b, c = work.pop()
+        inv = inverse[c]
+
+        # Predecesores del separador agrupados por el bloque en el que están
+        touched = {}
+        for t in blocks[b]:
+            for s in inv.get(t, ()):
+                touched.setdefault(block_of[s], set()).add(s)
+
+        for y, split in touched.items():
+            block = blocks[y]
+            if len(split) == len(block):
+                continue
+            block -= split
+            # La parte pequeña se convierte en un bloque nuevo
+            if len(split) > len(block):
+                blocks[y], split = split, block
+            new = len(blocks)
+            blocks.append(split)
+            for s in split:
+                block_of[s] = new
+            # Si (y, d) estaba pendiente, y sigue pendiente y se añade la parte
+            # nueva; si no, basta con la parte pequeña, que es la nueva.
+            for d in range(n_symbols):
+                work.append((new, d))
+
+    return block_of
+
+
+def _moore(delta, n_symbols, labels):
+    """
+    Algoritmo de minimización de Moore sobre una tabla entera.
+
+    En cada ronda, dos estados siguen en la misma clase si estaban en la misma
+    clase y sus transiciones llevan a las mismas clases. Termina cuando una
+    ronda no separa ningún estado.
+
+    Args:
+        delta (list[list[int]]): Tabla de transiciones completa.
+        n_symbols (int): Número de columnas de la tabla.
+        labels (list): Etiqueta de cada estado (partición inicial).
+
+    Returns:
+        list[int]: Clase de equivalencia de cada estado.
+    """
+    classes = {}
+    block_of = [classes.setdefault(label, len(classes)) for label in labels]
+    n_classes = len(classes)
+
+    while True:
+        signatures = {}
+        new_block_of = [
+            signatures.setdefault((block_of[s], tuple(block_of[t] for t in row)), len(signatures))
+            for s, row in enumerate(delta)
+        ]
+        if len(signatures) == n_classes:
+            return new_block_of
+        block_of = new_block_of
+        n_classes = len(signatures)
+
+
+# Tabla compilada de cada proceso de accepts_many()
+_worker_compiled = None
+
+
+def _init_worker(compiled):
+    """Inicializador de los procesos de accepts_many()."""
+    global _worker_compiled
+    _worker_compiled = compiled
+
+
+def _accepts_chunk(cadenas):
+    """Evalúa un bloque de cadenas en un proceso de accepts_many()."""
+    return _worker_compiled._accepts_list(cadenas)
+
+
+class CompiledAutomaton:
+    """
+    Autómata finito determinista compilado a una tabla de transiciones densa.
+
+    Los estados y los símbolos se numeran con enteros. La transición del estado
+    s con el símbolo de columna c está en table[s * n_symbols + c]; el valor -1
+    indica que no hay transición o que el destino es un estado muerto (desde el
+    que no se alcanza ningún estado final), de modo que la evaluación puede
+    terminar en cuanto se llega a él.
+
+    Attributes:
+        initial_state (int): Índice del estado inicial.
+        states (list[str]): Nombre del estado original de cada índice.
+        symbols (list): Símbolo de cada columna de la tabla.
+        symbol_index (dict): Diccionario {símbolo: columna}. Los caracteres
+            de las clases (SymbolClass) también tienen la columna de su clase.
+        n_states (int): Número de estados.
+        n_symbols (int): Número de símbolos.
+        table (array): Tabla de transiciones plana de tipo array('i').
+        finals (bytearray): Mapa de bits de estados finales; el estado s es
+            final si el bit (s & 7) del byte s >> 3 está activo.
+        buffer: Objeto que respalda table y finals cuando son vistas de un
+            buffer externo (p.ej. un mmap cargado con BinaryAutomataFormat),
+            o None.
+    """
+
+    def __init__(self, initial_state, states, symbols, table, finals):
+        """
+        Inicializa una tabla compilada.
+
+        Args:
+            initial_state (int): Índice del estado inicial.
+            states (list[str]): Nombre de cada estado.
+            symbols (list): Símbolo de cada columna.
+            table (array): Tabla plana de len(states) * len(symbols) enteros.
+            finals (bytearray): Mapa de bits de estados finales.
+        """
+        self.initial_state = initial_state
+        self.states = states
+        self.symbols = symbols
+        self.symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+        for i, symbol in enumerate(symbols):
+            if isinstance(symbol, SymbolClass):
+                # Cada carácter de una clase usa la columna de la clase
+                for char in symbol:
+                    self.symbol_index[char] = i
+        self.n_states = len(states)
+        self.n_symbols = len(symbols)
+        self.table = table
+        self.finals = finals
+        self.buffer = None
+
+    @classmethod
+    def from_automaton(cls, automaton):
+        """
+        Construye la tabla a partir de un FiniteAutomaton determinista.
+
+        Solo se conservan los estados alcanzables desde el inicial que además
+        pueden alcanzar algún estado final; el resto se representa con -1.
+
+        Args:
+            automaton (FiniteAutomaton): Autómata determinista.
+
+        Returns:
+            CompiledAutomaton: Tabla compilada equivalente.
+        """
+        symbols = sorted(automaton.symbols, key=str)
+        transitions = automaton.transitions
+
+        # Estados alcanzables (BFS) y aristas inversas
+        reachable = [automaton.initial_state]
+        seen = {automaton.initial_state}
+        inverse = {}
+        queue = deque(reachable)
+        while queue:
+            state = queue.popleft()
+            for symbol, end_states in transitions.get(state, {}).items():
+                for end_state in end_states:
+                    inverse.setdefault(end_state, []).append(state)
+                    if end_state not in seen:
+                        seen.add(end_state)
+                        reachable.append(end_state)
+                        queue.append(end_state)
+
+        # Estados vivos: alcanzables que llegan a algún final
+        live = {st for st in reachable if st in automaton.final_states}
+        queue = deque(live)
+        while queue:
+            state = queue.popleft()
+            for prev_state in inverse.get(state, ()):
+                if prev_state not in live:
+                    live.add(prev_state)
+                    queue.append(prev_state)
+
+        # El estado inicial se conserva siempre, aunque esté muerto
+        states = [st for st in reachable if st in live or st == automaton.initial_state]
+        state_index = {st: i for i, st in enumerate(states)}
+
+        n_symbols = len(symbols)
+        table = array('i', [-1]) * (len(states) * n_symbols)
+        for i, state in enumerate(states):
+            state_transitions = transitions.get(state, {})
+            for j, symbol in enumerate(symbols):
+                for end_state in state_transitions.get(symbol, ()):
+                    if end_state in live:
+                        table[i * n_symbols + j] = state_index[end_state]
+
+        finals = bytearray((len(states) + 7) >> 3)
+        for i, state in enumerate(states):
+            if state in automaton.final_states:
+                finals[i >> 3] |= 1 << (i & 7)
+
+        return cls(state_index[automaton.initial_state], states, symbols, table, finals)
+
+    def to_automaton(self):
+        """
+        Reconstruye un FiniteAutomaton determinista a partir de la tabla.
+
+        Las transiciones con valor -1 no se incluyen. Los estados se nombran
+        con str() del nombre guardado en la tabla.
+
+        Returns:
+            FiniteAutomaton: Autómata determinista equivalente.
+        """
+        names = [str(state) for state in self.states]
+        transitions = {}
+        for s in range(self.n_states):
+            row = {}
+            for col, symbol in enumerate(self.symbols):
+                t = self.table[s * self.n_symbols + col]
+                if t >= 0:
+                    row[symbol] = {names[t]}
+            if row:
+                transitions[names[s]] = row
+        final_states = {names[s] for s in range(self.n_states) if self.is_final(s)}
+        return FiniteAutomaton(names[self.initial_state], names, set(self.symbols),
+                               transitions, final_states)
+
+    @property
+    def nbytes(self):
+        """int: Tamaño aproximado en bytes de la tabla y el mapa de finales."""
+        return 4 * self.n_states * self.n_symbols + len(self.finals)
+
+    @property
+    def byte_level(self):
+        """bool: True si los símbolos son bytes (enteros 0-255), ver encode()."""
+        return all(isinstance(symbol, int) for symbol in self.symbols)
+
+    def encode(self, encoding="utf-8"):
+        """
+        Traduce la tabla a una tabla equivalente sobre bytes.
+
+        Cada símbolo (o cada carácter de una SymbolClass) se sustituye por su
+        codificación; si ocupa varios bytes se añaden estados intermedios,
+        compartidos por los símbolos con el mismo prefijo desde el mismo
+        estado. La tabla resultante se puede ejecutar
+        directamente sobre bytes, bytearray, memoryview o mmap, cuyos elementos
+        son enteros, sin decodificar la entrada.
+
+        Args:
+            encoding (str, optional): Codificación de los símbolos. Debe ser
+                libre de prefijos, como UTF-8 (por defecto).
+
+        Returns:
+            CompiledAutomaton: Tabla cuyos símbolos son enteros 0-255.
+
+        Raises:
+            ValueError: Si la codificación de un símbolo es prefijo de la de otro.
+        """
+        n = self.n_states
+        byte_transitions = [{} for _ in range(n)]
+        states = list(self.states)
+
+        for s in range(n):
+            for col, symbol in enumerate(self.symbols):
+                t = self.table[s * self.n_symbols + col]
+                if t < 0:
+                    continue
+                chars = symbol if isinstance(symbol, SymbolClass) else (symbol,)
+                for char in chars:
+                    data = char.encode(encoding)
+                    current = s
+                    for i in range(len(data) - 1):
+                        next_state = byte_transitions[current].get(data[i])
+                        if next_state is None:
+                            next_state = len(byte_transitions)
+                            byte_transitions[current][data[i]] = next_state
+                            byte_transitions.append({})
+                            states.append(f"{self.states[s]}:{data[:i + 1].hex()}")
+                        elif next_state < n:
+                            raise ValueError(f"Encoding of {char!r} is not prefix-free")
+                        current = next_state
+                    if data[-1] in byte_transitions[current]:
+                        raise ValueError(f"Encoding of {char!r} is not prefix-free")
+                    byte_transitions[current][data[-1]] = t
+
+        symbols = sorted({b for transitions in byte_transitions for b in transitions})
+        column = {b: i for i, b in enumerate(symbols)}
+        table = array('i', [-1]) * (len(states) * len(symbols))
+        for s, transitions in enumerate(byte_transitions):
+            for b, t in transitions.items():
+                table[s * len(symbols) + column[b]] = t
+
+        finals = bytearray((len(states) + 7) >> 3)
+        finals[:len(self.finals)] = self.finals
 
+        return CompiledAutomaton(self.initial_state, states, symbols, table, finals)
+
+    def is_final(self, state):
+        """
+        Indica si un índice de estado es final. El estado -1 nunca lo es.
+
+        Args:
+            state (int): Índice del estado.
+
+        Returns:
+            bool: True si el estado es final.
+        """
+        return state >= 0 and (self.finals[state >> 3] >> (state & 7)) & 1 == 1
+
+    def run(self, cadena, state=None):
+        """
+        Ejecuta la tabla sobre una cadena y devuelve el estado alcanzado.
+
+        Args:
+            cadena: Secuencia de símbolos a procesar.
+            state (int, optional): Estado de partida. Por defecto, el inicial.
+
+        Returns:
+            int: Índice del estado final del recorrido, o -1 si la cadena
+                 contiene un símbolo desconocido o se llega a un estado muerto.
+        """
+        s = self.initial_state if state is None else state
+        if s < 0:
+            return -1
+
+        table = self.table
+        n = self.n_symbols
+        get = self.symbol_index.get
+        for c in cadena:
+            col = get(c)
+            if col is None:
+                return -1
+            s = table[s * n + col]
+            if s < 0:
+                return -1
         return s
+
+    def accepts(self, cadena):
+        """
+        Determina si la tabla acepta la cadena completa.
+
+        Args:
+            cadena: Secuencia de símbolos a evaluar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario.
+        """
+        return self.is_final(self.run(cadena))
+
+    def _accepts_list(self, cadenas):
+        """Lista con el resultado de accepts() para cada cadena."""
+        accepts = self.accepts
+        return [accepts(cadena) for cadena in cadenas]
+
+    def match(self, cadena, start=0):
+        """
+        Busca el prefijo aceptado más largo de cadena[start:].
+
+        Args:
+            cadena: Secuencia de símbolos a evaluar.
+            start (int, optional): Posición desde la que empezar. Por defecto 0.
+
+        Returns:
+            int: Posición final (exclusiva) del prefijo aceptado más largo,
+                 o -1 si ningún prefijo (ni siquiera el vacío) es aceptado.
+        """
+        s = self.initial_state
+        last = start if self.is_final(s) else -1
+
+        table = self.table
+        finals = self.finals
+        n = self.n_symbols
+        get = self.symbol_index.get
+        for i in range(start, len(cadena)):
+            col = get(cadena[i])
+            if col is None:
+                break
+            s = table[s * n + col]
+            if s < 0:
+                break
+            if (finals[s >> 3] >> (s & 7)) & 1:
+                last = i + 1
+        return last
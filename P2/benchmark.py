@@ -0,0 +1,158 @@
+"""
+Comparativa del motor de autómatas con el módulo re de Python.
+
+Compila las expresiones RE0-RE6 de P1/regular_expressions.py con REParser
+(sintaxis "re", construcción de Glushkov, determinización y minimización),
+genera un corpus de cadenas para cada una (cadenas aceptadas obtenidas con
+recorridos aleatorios del AFD, sus mutaciones y cadenas aleatorias sobre el
+alfabeto) y compara los resultados y el rendimiento con re.fullmatch.
+
+Uso:
+    python3 benchmark.py [--strings N] [--max-length L] [--seed S]
+
+Termina con código 1 si algún resultado no coincide con el de re.
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+
+from automaton import SymbolClass
+from re_parser import REParser
+
+try:
+    from vectorized import accepts_batch
+except ImportError:
+    accepts_batch = None
+
+PATTERN_NAMES = ["RE0", "RE1", "RE2", "RE3", "RE4", "RE5", "RE6"]
+P1_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "P1", "regular_expressions.py")
+
+
+def load_patterns(path=P1_PATH):
+    """Carga las expresiones RE0-RE6 del fichero de la práctica 1."""
+    spec = importlib.util.spec_from_file_location("regular_expressions", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {name: getattr(module, name) for name in PATTERN_NAMES}
+
+
+def compile_pattern(pattern):
+    """Compila una expresión a la tabla de su AFD mínimo."""
+    automaton = REParser().create_automaton(pattern, method="glushkov", syntax="re")
+    return automaton.to_deterministic().to_minimized().compile()
+
+
+def _random_char(symbol, rng):
+    if isinstance(symbol, SymbolClass):
+        return rng.choice(sorted(symbol))
+    return symbol
+
+
+def generate_corpus(compiled, n_strings, max_length, rng):
+    """
+    Genera un corpus de cadenas para una tabla compilada.
+
+    Un tercio son cadenas aceptadas (recorridos aleatorios hasta un estado
+    final), un tercio mutaciones de cadenas aceptadas y el resto cadenas
+    aleatorias sobre el alfabeto de la expresión y un carácter ajeno a él.
+    """
+    n = compiled.n_symbols
+    chars = sorted(char for char in compiled.symbol_index
+                   if isinstance(char, str) and len(char) == 1) + ["#"]
+
+    accepted = []
+    for _ in range(n_strings // 3):
+        state, string = compiled.initial_state, []
+        while len(string) < max_length:
+            if compiled.is_final(state) and (rng.random() < 0.2 or len(string) == max_length - 1):
+                break
+            moves = [(col, compiled.table[state * n + col]) for col in range(n)
+                     if compiled.table[state * n + col] >= 0]
+            if not moves:
+                break
+            col, state = rng.choice(moves)
+            string.append(_random_char(compiled.symbols[col], rng))
+        accepted.append("".join(string))
+
+    mutated = []
+    for string in accepted:
+        string = list(string)
+        position = rng.randint(0, len(string))
+        operation = rng.randrange(3)
+        if operation == 0 or not string:
+            string.insert(position, rng.choice(chars))
+        elif operation == 1:
+            string[min(position, len(string) - 1)] = rng.choice(chars)
+        else:
+            del string[min(position, len(string) - 1)]
+        mutated.append("".join(string))
+
+    noise = ["".join(rng.choice(chars) for _ in range(rng.randint(0, max_length)))
+             for _ in range(n_strings - len(accepted) - len(mutated))]
+
+    corpus = accepted + mutated + noise
+    rng.shuffle(corpus)
+    return corpus
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def run(n_strings=20000, max_length=24, seed=0, patterns=None):
+    """
+    Ejecuta la comparativa y escribe una tabla con los resultados.
+
+    Returns:
+        int: Número total de cadenas en las que el resultado no coincide con re.
+    """
+    rng = random.Random(seed)
+    patterns = patterns or load_patterns()
+
+    header = f"{'':4} {'states':>6} {'compile ms':>10} {'accepted':>8} {'re kstr/s':>10} {'dfa kstr/s':>10}"
+    if accepts_batch is not None:
+        header += f" {'numpy kstr/s':>12}"
+    print(header + f" {'mismatches':>10}")
+
+    total_mismatches = 0
+    for name, pattern in patterns.items():
+        compiled, compile_time = _timed(compile_pattern, pattern)
+        corpus = generate_corpus(compiled, n_strings, max_length, rng)
+
+        fullmatch = re.compile(pattern).fullmatch
+        expected, re_time = _timed(lambda: [fullmatch(string) is not None for string in corpus])
+        result, dfa_time = _timed(lambda: [compiled.accepts(string) for string in corpus])
+
+        mismatches = sum(a != b for a, b in zip(expected, result))
+        line = (f"{name:4} {compiled.n_states:>6} {1000 * compile_time:>10.2f} {sum(expected):>8}"
+                f" {len(corpus) / re_time / 1000:>10.1f} {len(corpus) / dfa_time / 1000:>10.1f}")
+        if accepts_batch is not None:
+            batch, numpy_time = _timed(accepts_batch, compiled, corpus)
+            mismatches += sum(a != bool(b) for a, b in zip(expected, batch))
+            line += f" {len(corpus) / numpy_time / 1000:>12.1f}"
+        print(line + f" {mismatches:>10}")
+        total_mismatches += mismatches
+
+    return total_mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strings", type=int, default=20000, help="cadenas por expresión")
+    parser.add_argument("--max-length", type=int, default=24, help="longitud máxima de las cadenas")
+    parser.add_argument("--seed", type=int, default=0, help="semilla del generador")
+    args = parser.parse_args(argv)
+
+    mismatches = run(args.strings, args.max_length, args.seed)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
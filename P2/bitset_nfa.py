@@ -0,0 +1,131 @@
+"""
+Módulo para la simulación de autómatas no deterministas con conjuntos de bits.
+
+Cada estado del autómata recibe un índice de bit y el conjunto de estados
+activos se representa con un entero de Python. Para cada símbolo se precalcula,
+por estado, la máscara de sucesores con el cierre lambda ya aplicado, de forma
+que avanzar un carácter consiste en unas pocas operaciones OR entre enteros.
+"""
+
+
+class BitsetNFA:
+    """
+    Simulador de un FiniteAutomaton sobre máscaras de bits.
+
+    Los bits se agrupan en bytes. Para cada símbolo y cada grupo se memoriza la
+    unión de sucesores de cada valor del byte visto durante la simulación, así
+    que un paso cuesta un OR por cada byte no nulo del conjunto activo.
+
+    Attributes:
+        states (list[str]): Estado correspondiente a cada bit.
+        symbols (set): Alfabeto del autómata.
+        initial (int): Máscara del cierre lambda del estado inicial.
+        finals (int): Máscara de los estados finales.
+
+    Note:
+        Las máscaras se calculan al crear el objeto; si después se modifica
+        el autómata hay que crear un BitsetNFA nuevo.
+    """
+
+    def __init__(self, automaton):
+        """
+        Inicializa el simulador.
+
+        Args:
+            automaton (FiniteAutomaton): Autómata (determinista o no) a simular.
+        """
+        states = list(dict.fromkeys(automaton.states))
+        for state, transitions in automaton.transitions.items():
+            states.append(state)
+            for end_states in transitions.values():
+                states.extend(end_states)
+        states = list(dict.fromkeys(states + [automaton.initial_state]))
+        bit = {state: i for i, state in enumerate(states)}
+
+        closures = automaton._closure_index()
+        closure_masks = []
+        for state in states:
+            mask = 0
+            for member in closures.get(state, (state,)):
+                mask |= 1 << bit[member]
+            closure_masks.append(mask)
+
+        self.states = states
+        self.symbols = automaton.symbols
+        self.initial = closure_masks[bit[automaton.initial_state]]
+        self.finals = 0
+        for state in automaton.final_states:
+            if state in bit:
+                self.finals |= 1 << bit[state]
+
+        # Máscara de sucesores (con cierre lambda) de cada bit, por símbolo
+        self._successors = {}
+        for state, transitions in automaton.transitions.items():
+            for symbol, end_states in transitions.items():
+                if symbol is None:
+                    continue
+                successors = self._successors.setdefault(symbol, [0] * len(states))
+                for end_state in end_states:
+                    successors[bit[state]] |= closure_masks[bit[end_state]]
+
+        self._n_bytes = (len(states) + 7) >> 3
+        self._tables = {}
+
+    def step(self, mask, symbol):
+        """
+        Avanza un conjunto de estados con un símbolo.
+
+        Args:
+            mask (int): Conjunto de estados activos.
+            symbol: Símbolo leído.
+
+        Returns:
+            int: Conjunto de estados alcanzados (0 si no hay ninguno).
+        """
+        tables = self._tables.get(symbol)
+        if tables is None:
+            tables = self._tables[symbol] = [{} for _ in range(self._n_bytes)]
+
+        next_mask = 0
+        for group, byte in enumerate(mask.to_bytes(self._n_bytes, "little")):
+            if byte:
+                table = tables[group]
+                successors = table.get(byte)
+                if successors is None:
+                    successors = table[byte] = self._group_successors(symbol, group, byte)
+                next_mask |= successors
+        return next_mask
+
+    def accepts(self, cadena):
+        """
+        Determina si el autómata acepta una cadena de entrada.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario o si
+                  contiene símbolos no pertenecientes al alfabeto.
+        """
+        symbols = self.symbols
+        mask = self.initial
+        for symbol in cadena:
+            if symbol not in symbols:
+                return False
+            mask = self.step(mask, symbol)
+            if not mask:
+                return False
+        return mask & self.finals != 0
+
+    def _group_successors(self, symbol, group, byte):
+        """Unión de las máscaras de sucesores de los bits activos de un byte."""
+        successors = self._successors.get(symbol)
+        if successors is None:
+            return 0
+        mask = 0
+        base = group << 3
+        while byte:
+            low = byte & -byte
+            mask |= successors[base + low.bit_length() - 1]
+            byte ^= low
+        return mask
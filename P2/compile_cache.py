@@ -0,0 +1,170 @@
+"""
+Módulo con una caché de compilación de expresiones regulares.
+
+Cada expresión se compila como REParser().create_automaton() (por defecto
+con la construcción de Glushkov, sin transiciones lambda), seguido de
+to_deterministic(), to_minimized() y compile(). Los resultados se guardan en
+dos niveles: una caché LRU en memoria acotada por tamaño y, opcionalmente, un
+directorio en disco con un fichero en formato binario (BinaryAutomataFormat)
+por expresión, que se reutiliza entre procesos y reinicios.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from re_parser import REParser, _re_to_rpn
+from utils import BinaryAutomataFormat, FormatParseError
+
+# Versión de la caché: debe incrementarse si cambia la sintaxis de las
+# expresiones o el resultado de la compilación.
+CACHE_VERSION = 2
+
+
+class CompileCache:
+    """
+    Caché de expresiones regulares compiladas a AFD mínimos.
+
+    La clave de cada expresión incluye la versión de la caché y del formato
+    binario y el método y la sintaxis de la construcción. En notación de
+    Kleene la expresión se normaliza a su notación polaca inversa (que no
+    depende de paréntesis redundantes); en sintaxis re se usa tal cual.
+
+    Es segura para varios hilos; en disco, cada fichero se escribe en un
+    temporal del mismo directorio y se publica con os.replace(), que es
+    atómico, así que varios procesos pueden compartir el directorio.
+
+    Attributes:
+        max_bytes (int): Tamaño máximo de la caché en memoria, en bytes.
+        directory (str): Directorio de la caché en disco, o None.
+        method (str): Método de construcción, ver REParser.create_automaton().
+        syntax (str): Sintaxis de las expresiones, "kleene" o "re".
+        memory_bytes (int): Tamaño actual de la caché en memoria.
+        hits (int): Expresiones servidas desde memoria.
+        disk_hits (int): Expresiones cargadas desde disco.
+        misses (int): Expresiones compiladas.
+    """
+
+    def __init__(self, max_bytes=64 << 20, directory=None, method="glushkov", syntax="kleene"):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_bytes (int, optional): Tamaño máximo en memoria. Por defecto 64 MiB.
+            directory (str, optional): Directorio de la caché en disco. Se crea
+                si no existe. Por defecto None (sin caché en disco).
+            method (str, optional): Método de construcción. Por defecto
+                "glushkov".
+            syntax (str, optional): Sintaxis de las expresiones. Por defecto
+                "kleene".
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.method = method
+        self.syntax = syntax
+        self.memory_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, re_string):
+        """
+        Clave normalizada de una expresión regular.
+
+        Args:
+            re_string (str): Expresión regular en la sintaxis de la caché.
+
+        Returns:
+            str: Clave de la expresión.
+        """
+        normalized = _re_to_rpn(re_string) if self.syntax == "kleene" else re_string
+        settings = f"{CACHE_VERSION}:{BinaryAutomataFormat.version}:{self.method}:{self.syntax}"
+        return f"{settings}:{normalized}"
+
+    def get(self, re_string):
+        """
+        Devuelve el AFD mínimo compilado de una expresión regular.
+
+        Args:
+            re_string (str): Expresión regular en la sintaxis de la caché.
+
+        Returns:
+            CompiledAutomaton: Tabla compilada del AFD mínimo.
+        """
+        key = self.key(re_string)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+
+        compiled = self._load(key)
+        if compiled is None:
+            automaton = REParser().create_automaton(re_string, method=self.method, syntax=self.syntax)
+            compiled = automaton.to_deterministic().to_minimized().compile()
+            self._store(key, compiled)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.disk_hits += 1
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = compiled
+                self.memory_bytes += compiled.nbytes
+                self._evict()
+        return compiled
+
+    def clear(self):
+        """Vacía la caché en memoria (la caché en disco se conserva)."""
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, re_string):
+        return self.key(re_string) in self._entries
+
+    def _evict(self):
+        """Descarta las entradas menos usadas hasta respetar max_bytes."""
+        while self.memory_bytes > self.max_bytes and len(self._entries) > 1:
+            _, compiled = self._entries.popitem(last=False)
+            self.memory_bytes -= compiled.nbytes
+
+    def _path(self, key):
+        """Ruta en disco de una clave."""
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + ".autb")
+
+    def _load(self, key):
+        """Carga una clave desde disco, o devuelve None si no está."""
+        if self.directory is None:
+            return None
+        try:
+            return BinaryAutomataFormat.load(self._path(key))
+        except (OSError, ValueError, FormatParseError):
+            return None
+
+    def _store(self, key, compiled):
+        """Escribe una clave en disco de forma atómica."""
+        if self.directory is None:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                BinaryAutomataFormat.dump(compiled, f)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,270 @@
+"""
+Módulo para la evaluación de repeticiones acotadas con contadores.
+
+Expandir r{m,n} en m..n copias de r hace que el AFN (y sobre todo el AFD)
+crezca con n. Un autómata con contadores representa cada repetición grande con
+un único fragmento y un contador acotado: las transiciones lambda que entran,
+repiten o salen del fragmento llevan una guarda y una actualización sobre el
+contador. El autómata se simula directamente sobre configuraciones (estado,
+valores de los contadores), de modo que su tamaño no depende de los límites.
+
+CountingAutomaton es una subclase de FiniteAutomaton: draw(), to_deterministic()
+y, a través de ella, compile(), to_minimized() y el motor "dfa" tienen en
+cuenta los contadores. Los motores "bitset" y "lazy" y los métodos que
+trabajan sobre conjuntos de estados sin contadores (lambda_clausure(),
+symbol_transitions() y automaton_bfs()) no se admiten.
+"""
+
+from automaton import FiniteAutomaton
+
+# Operaciones de las transiciones con contador
+ENTER = "enter"    # Entra en la repetición: contador = 0
+REPEAT = "repeat"  # Vuelve a empezar r: guarda contador + 1 < n; contador += 1
+EXIT = "exit"      # Sale de la repetición: guarda contador + 1 >= m; contador = 0
+
+
+class CountingAutomaton(FiniteAutomaton):
+    """
+    Autómata finito con transiciones lambda y contadores acotados.
+
+    Las transiciones tienen el mismo formato que en FiniteAutomaton. Además,
+    counter_transitions contiene las transiciones lambda que operan sobre un
+    contador. Un contador sin límite superior (r{m,}) se satura en m.
+
+    Los conjuntos de configuraciones visitados se guardan en caché con sus
+    transiciones, como en un AFD perezoso, hasta max_cached_states conjuntos.
+    Solo las repeticiones pequeñas se expanden (y por tanto se determinizan);
+    con contadores grandes las configuraciones rara vez se repiten y la caché
+    se vacía al llenarse.
+
+    Attributes:
+        initial_state (str): Estado inicial del autómata.
+        states (list[str]): Lista de todos los estados del autómata.
+        symbols (set): Conjunto de símbolos del alfabeto de entrada.
+        transitions (dict): Transiciones sin contador, como en FiniteAutomaton.
+        final_states (set[str]): Conjunto de estados finales.
+        counters (list[tuple[int, int | None]]): Límites (m, n) de cada contador.
+        counter_transitions (dict): Transiciones con contador. Estructura:
+            {estado_origen: [(estado_destino, contador, operación), ...]},
+            donde la operación es ENTER, REPEAT o EXIT.
+        max_cached_states (int): Conjuntos de configuraciones en caché.
+    """
+
+    def __init__(self, initial_state, states, symbols, transitions, final_states,
+                 counters, counter_transitions, max_cached_states=4096):
+        """
+        Inicializa un autómata con contadores.
+
+        Args:
+            initial_state (str): Estado inicial del autómata.
+            states (list[str]): Lista de todos los estados del autómata.
+            symbols (set): Conjunto de símbolos del alfabeto de entrada.
+            transitions (dict): Transiciones sin contador.
+            final_states (set[str]): Conjunto de estados finales.
+            counters (list[tuple[int, int | None]]): Límites de cada contador.
+            counter_transitions (dict): Transiciones con contador.
+            max_cached_states (int, optional): Conjuntos de configuraciones
+                que se guardan en caché. Por defecto 4096.
+        """
+        super().__init__(initial_state, states, symbols, transitions, final_states)
+        self.counters = counters
+        self.counter_transitions = counter_transitions
+        self.max_cached_states = max_cached_states
+
+        self._cache = {}
+        self._initial = self._closure({(initial_state, (0,) * len(counters))})
+
+    def add_transition(self, start_state, symbol, end_state):
+        """Añade una transición sin contador, ver FiniteAutomaton.add_transition()."""
+        added = super().add_transition(start_state, symbol, end_state)
+        self._cache = {}
+        self._initial = self._closure({(self.initial_state, (0,) * len(self.counters))})
+        return added
+
+    def accepts(self, cadena, backend="nfa"):
+        """
+        Determina si el autómata acepta una cadena de entrada.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+            backend (str, optional): "nfa" (por defecto) simula las
+                configuraciones; "dfa" usa la tabla compilada de
+                to_deterministic().
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario o si
+                  contiene símbolos no pertenecientes al alfabeto.
+
+        Raises:
+            ValueError: Si el motor no es válido o no admite contadores.
+        """
+        if backend != "nfa":
+            return super().accepts(cadena, backend)
+
+        classes = self._symbol_classes()
+        configurations = self._initial
+        for symbol in cadena:
+            symbol = classes.get(symbol, symbol)
+            if symbol not in self.symbols:
+                return False
+
+            cached = self._cache.get(configurations)
+            if cached is None:
+                if len(self._cache) >= self.max_cached_states:
+                    self._cache = {}
+                cached = self._cache[configurations] = {}
+            next_configurations = cached.get(symbol)
+            if next_configurations is None:
+                next_configurations = cached[symbol] = self._step(configurations, symbol)
+
+            configurations = next_configurations
+            if not configurations:
+                return False
+
+        return any(state in self.final_states for state, _ in configurations)
+
+    @property
+    def cached_states(self):
+        """int: Número de conjuntos de configuraciones en caché."""
+        return len(self._cache)
+
+    def to_deterministic(self, state_names=False):
+        """
+        Convierte el autómata en un AFD equivalente sin contadores.
+
+        Es la construcción de subconjuntos sobre conjuntos de configuraciones:
+        como los contadores están acotados hay un número finito de ellos, pero
+        puede crecer con los límites de las repeticiones.
+
+        Args:
+            state_names (bool, optional): Si es True, cada estado se nombra con
+                sus configuraciones (p.ej. "{q1:0, q3:2}"). Por defecto los
+                estados se nombran "q0", "q1", ... y el conjunto vacío "Empty".
+
+        Returns:
+            FiniteAutomaton: Autómata finito determinista equivalente.
+        """
+        symbols = sorted(self.symbols, key=str)
+        subset_ids = {self._initial: 0}
+        subsets = [self._initial]
+        delta = []
+
+        i = 0
+        while i < len(subsets):
+            row = []
+            for symbol in symbols:
+                goal = self._step(subsets[i], symbol)
+                j = subset_ids.get(goal)
+                if j is None:
+                    j = subset_ids[goal] = len(subsets)
+                    subsets.append(goal)
+                row.append(j)
+            delta.append(row)
+            i += 1
+
+        names = []
+        for i, subset in enumerate(subsets):
+            if not subset:
+                names.append("Empty")
+            elif state_names:
+                names.append("{" + ", ".join(sorted(f"{state}:{','.join(map(str, values))}"
+                                                    for state, values in subset)) + "}")
+            else:
+                names.append(f"q{i}")
+
+        transitions = {}
+        for i, row in enumerate(delta):
+            transitions[names[i]] = {symbol: {names[j]} for symbol, j in zip(symbols, row)}
+
+        final_states = {names[i] for i, subset in enumerate(subsets)
+                        if any(state in self.final_states for state, _ in subset)}
+
+        return FiniteAutomaton(names[0], names, self.symbols, transitions, final_states)
+
+    def to_minimized(self, algorithm="hopcroft"):
+        """
+        Minimiza el AFD equivalente, ver FiniteAutomaton.to_minimized().
+
+        Args:
+            algorithm (str, optional): "hopcroft" (por defecto) o "moore".
+
+        Returns:
+            FiniteAutomaton: AFD mínimo equivalente, sin contadores.
+        """
+        return self.to_deterministic().to_minimized(algorithm)
+
+    def lambda_clausure(self, current_states):
+        """No se admite: el cierre depende de los valores de los contadores."""
+        raise NotImplementedError("Counting automata have no lambda closure of plain states; "
+                                  "use accepts() or to_deterministic()")
+
+    def symbol_transitions(self, current_states, symbol):
+        """No se admite: las transiciones dependen de los valores de los contadores."""
+        raise NotImplementedError("Counting automata have no transitions of plain states; "
+                                  "use accepts() or to_deterministic()")
+
+    def automaton_bfs(self):
+        """No se admite: la alcanzabilidad depende de los valores de los contadores."""
+        raise NotImplementedError("Counting automata have no reachability of plain states; "
+                                  "use to_deterministic()")
+
+    def _is_deterministic(self):
+        """Un autómata con transiciones con contador nunca es determinista."""
+        return not self.counter_transitions and super()._is_deterministic()
+
+    def _engine(self, backend):
+        """Motor de evaluación, ver FiniteAutomaton._engine(); sin "bitset" ni "lazy"."""
+        if backend == "bitset" or backend == "lazy":
+            raise ValueError(f"Backend not supported by counting automata: {backend}")
+        return super()._engine(backend)
+
+    def _edges(self):
+        """Transiciones, incluidas las de contador ("λ operación cN")."""
+        yield from super()._edges()
+        for start_state, edges in self.counter_transitions.items():
+            for end_state, counter, operation in edges:
+                yield start_state, f"λ {operation} c{counter}", end_state
+
+    def _step(self, configurations, symbol):
+        """Configuraciones alcanzables desde configurations con symbol."""
+        transitions = self.transitions
+        goal = set()
+        for state, values in configurations:
+            if state in transitions:
+                for end_state in transitions[state].get(symbol, ()):
+                    goal.add((end_state, values))
+        return self._closure(goal)
+
+    def _closure(self, configurations):
+        """Cierre lambda de un conjunto de configuraciones, aplicando las guardas."""
+        transitions = self.transitions
+        counter_transitions = self.counter_transitions
+        counters = self.counters
+
+        result = set(configurations)
+        pending = list(result)
+        while pending:
+            state, values = pending.pop()
+            goal = [(end_state, values) for end_state in transitions.get(state, {}).get(None, ())]
+
+            for end_state, counter, operation in counter_transitions.get(state, ()):
+                low, high = counters[counter]
+                count = values[counter]
+                if operation == ENTER:
+                    count = 0
+                elif operation == REPEAT:
+                    if high is not None and count + 1 >= high:
+                        continue
+                    count = count + 1 if high is not None else min(count + 1, low)
+                else:
+                    if count + 1 < low:
+                        continue
+                    count = 0
+                goal.append((end_state, values[:counter] + (count,) + values[counter + 1:]))
+
+            for configuration in goal:
+                if configuration not in result:
+                    result.add(configuration)
+                    pending.append(configuration)
+
+        return frozenset(result)
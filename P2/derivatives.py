@@ -0,0 +1,176 @@
+"""
+Módulo para la evaluación de expresiones regulares con derivadas de Brzozowski.
+
+La derivada de una expresión r respecto a un símbolo a es otra expresión que
+acepta {w : aw ∈ L(r)}. Una cadena se acepta si, tras derivar la expresión por
+cada uno de sus símbolos, la expresión resultante acepta la cadena vacía.
+
+Las derivadas se calculan sobre el AST de re_ast, cuyos nodos están en forma
+canónica y con hash-consing, de modo que cada derivada distinta es un estado de
+un AFD que se construye bajo demanda: solo se crean los estados que visita la
+entrada. Al trabajar sobre la expresión se admiten también la intersección (&)
+y el complemento (~).
+"""
+
+import re_ast
+from re_parser import REParser
+
+
+class _DerivativeState:
+    """Estado del AFD de derivadas: expresión y transiciones ya calculadas."""
+
+    __slots__ = ("node", "final", "next")
+
+    def __init__(self, node):
+        self.node = node
+        self.final = node.nullable
+        self.next = {}
+
+
+# Símbolo que no aparece en ninguna expresión: representa a todos los símbolos
+# que no están en el alfabeto de la expresión, que tienen la misma derivada.
+_OTHER = object()
+
+
+class DerivativeMatcher:
+    """
+    AFD de derivadas de una expresión regular, construido bajo demanda.
+
+    Attributes:
+        node (re_ast.Node): Expresión regular evaluada.
+        symbols (set): Símbolos que aparecen en la expresión.
+
+    Note:
+        A diferencia de FiniteAutomaton, el complemento se toma respecto a
+        todas las cadenas, así que ~a acepta cadenas con símbolos que no
+        aparecen en la expresión.
+    """
+
+    def __init__(self, regex):
+        """
+        Inicializa el evaluador.
+
+        Args:
+            regex (str | re_ast.Node): Expresión regular en la sintaxis de
+                REParser (con & y ~) o su AST.
+        """
+        if isinstance(regex, str):
+            regex = REParser().parse(regex)
+
+        self.node = regex
+        self.symbols = re_ast.symbols(regex)
+        self._derivatives = {}
+        self._states = {}
+        self._initial = self._state(regex)
+
+    def accepts(self, cadena):
+        """
+        Determina si la expresión acepta una cadena de entrada.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario.
+        """
+        symbols = self.symbols
+        state = self._initial
+        empty = re_ast.empty()
+
+        for symbol in cadena:
+            if symbol not in symbols:
+                symbol = _OTHER
+            next_state = state.next.get(symbol)
+            if next_state is None:
+                next_state = state.next[symbol] = self._state(self.derivative(state.node, symbol))
+            state = next_state
+            if state.node is empty:
+                return False
+
+        return state.final
+
+    @property
+    def cached_states(self):
+        """int: Número de estados (derivadas distintas) construidos."""
+        return len(self._states)
+
+    def derivative(self, node, symbol):
+        """
+        Derivada de Brzozowski de una expresión respecto a un símbolo.
+
+        Las derivadas de los operandos se calculan antes que la del nodo, con
+        una pila explícita en postorden (como re_ast.postorder()), de modo que
+        la profundidad de la expresión no está limitada por la de la recursión.
+
+        Args:
+            node (re_ast.Node): Expresión a derivar.
+            symbol: Símbolo respecto al que se deriva.
+
+        Returns:
+            re_ast.Node: Derivada, en forma canónica.
+        """
+        derivatives = self._derivatives
+        root = node
+        pending = [(node, False)]
+        while pending:
+            node, expanded = pending.pop()
+            if (node, symbol) in derivatives:
+                continue
+            if not expanded:
+                missing = [arg for arg in _derived_operands(node)
+                           if (arg, symbol) not in derivatives]
+                if missing:
+                    pending.append((node, True))
+                    pending.extend((arg, False) for arg in missing)
+                    continue
+            derivatives[(node, symbol)] = self._derive(node, symbol)
+        return derivatives[(root, symbol)]
+
+    def _derive(self, node, symbol):
+        """Derivada de un nodo cuyos operandos ya están derivados."""
+        derivatives = self._derivatives
+        op = node.op
+        if op == re_ast.SYMBOL:
+            return re_ast.lambda_() if node.args[0] == symbol else re_ast.empty()
+        if op == re_ast.CLASS:
+            return re_ast.lambda_() if symbol in node.args[0] else re_ast.empty()
+        if op == re_ast.CONCAT:
+            head, tail = node.args
+            result = re_ast.concat(derivatives[(head, symbol)], tail)
+            if head.nullable:
+                result = re_ast.union(result, derivatives[(tail, symbol)])
+            return result
+        if op == re_ast.UNION:
+            return re_ast.union(*(derivatives[(arg, symbol)] for arg in node.args))
+        if op == re_ast.INTERSECTION:
+            return re_ast.intersection(*(derivatives[(arg, symbol)] for arg in node.args))
+        if op == re_ast.COMPLEMENT:
+            return re_ast.complement(derivatives[(node.args[0], symbol)])
+        if op == re_ast.STAR:
+            return re_ast.concat(derivatives[(node.args[0], symbol)], node)
+        if op == re_ast.REPEAT:
+            # d(r{m,n}) = d(r).r{m-1,n-1}, también si r acepta la cadena vacía
+            a, low, high = node.args
+            rest = re_ast.repeat(a, max(low - 1, 0), None if high is None else high - 1)
+            return re_ast.concat(derivatives[(a, symbol)], rest)
+        # ∅ y λ
+        return re_ast.empty()
+
+    def _state(self, node):
+        """Devuelve el estado de una expresión, creándolo si no existe."""
+        state = self._states.get(node)
+        if state is None:
+            state = self._states[node] = _DerivativeState(node)
+        return state
+
+
+def _derived_operands(node):
+    """Operandos de un nodo cuyas derivadas se necesitan para derivarlo."""
+    op = node.op
+    if op == re_ast.CONCAT:
+        return node.args if node.args[0].nullable else node.args[:1]
+    if op == re_ast.UNION or op == re_ast.INTERSECTION:
+        return node.args
+    if op == re_ast.COMPLEMENT or op == re_ast.STAR or op == re_ast.REPEAT:
+        return node.args[:1]
+    return ()
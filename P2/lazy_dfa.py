@@ -0,0 +1,159 @@
+"""
+Módulo para la evaluación de autómatas mediante un AFD perezoso.
+
+En lugar de aplicar to_deterministic() sobre todo el autómata, los estados del
+AFD (conjuntos de estados del AFN) se construyen solo cuando la entrada llega a
+ellos, y las transiciones (subconjunto, símbolo) -> subconjunto se guardan en
+una caché con un presupuesto de memoria configurable.
+"""
+
+import sys
+
+
+class _LazyState:
+    """Estado del AFD perezoso: subconjunto del AFN y transiciones ya calculadas."""
+
+    __slots__ = ("subset", "final", "next")
+
+    def __init__(self, subset, final):
+        self.subset = subset
+        self.final = final
+        self.next = {}
+
+
+class LazyDFA:
+    """
+    AFD construido bajo demanda a partir de un FiniteAutomaton.
+
+    Cuando la memoria estimada de la caché supera el presupuesto, la caché se
+    vacía y se sigue construyendo desde el estado actual. Si en una misma
+    evaluación se vacía más de max_flushes veces (la entrada visita demasiados
+    estados distintos como para que la caché sea útil), el resto de la cadena
+    se evalúa simulando directamente el AFN.
+
+    Attributes:
+        automaton (FiniteAutomaton): Autómata original.
+        memory_budget (int): Memoria máxima estimada de la caché, en bytes.
+        max_flushes (int): Vaciados de caché permitidos por evaluación antes
+            de pasar a la simulación del AFN.
+        memory_used (int): Memoria estimada ocupada por la caché, en bytes.
+        flushes (int): Número total de vaciados de caché.
+        fallbacks (int): Número de evaluaciones que terminaron simulando el AFN.
+
+    Note:
+        Los cierres lambda se toman del autómata al crear el objeto; si después
+        se modifica el autómata hay que crear un LazyDFA nuevo.
+    """
+
+    # Coste estimado, en bytes, de cada estado y de cada transición en caché
+    _STATE_COST = 200
+    _TRANSITION_COST = 100
+
+    def __init__(self, automaton, memory_budget=1 << 20, max_flushes=8):
+        """
+        Inicializa el AFD perezoso.
+
+        Args:
+            automaton (FiniteAutomaton): Autómata (determinista o no) a evaluar.
+            memory_budget (int, optional): Presupuesto de memoria de la caché en
+                bytes. Por defecto 1 MiB.
+            max_flushes (int, optional): Vaciados permitidos por evaluación antes
+                de simular el AFN. Por defecto 8.
+        """
+        self.automaton = automaton
+        self.memory_budget = memory_budget
+        self.max_flushes = max_flushes
+        self.memory_used = 0
+        self.flushes = 0
+        self.fallbacks = 0
+
+        self._closures = automaton._closure_index()
+        self._initial = frozenset(automaton.lambda_clausure({automaton.initial_state}))
+        self._states = {}
+
+    def accepts(self, cadena):
+        """
+        Determina si el autómata acepta una cadena de entrada.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            bool: True si la cadena es aceptada, False en caso contrario o si
+                  contiene símbolos no pertenecientes al alfabeto.
+        """
+        symbols = self.automaton.symbols
+        state = self._state(self._initial)
+        flushes = 0
+
+        for i, symbol in enumerate(cadena):
+            next_state = state.next.get(symbol)
+            if next_state is None:
+                if symbol not in symbols:
+                    return False
+
+                subset = self._step(state.subset, symbol)
+                if not subset:
+                    return False
+
+                cost = self._TRANSITION_COST
+                if subset not in self._states:
+                    cost += self._STATE_COST + sys.getsizeof(subset)
+                if self.memory_used + cost > self.memory_budget:
+                    self.flush()
+                    flushes += 1
+                    if flushes > self.max_flushes:
+                        self.fallbacks += 1
+                        return self._simulate(subset, cadena, i + 1)
+                    next_state = self._state(subset)
+                else:
+                    next_state = self._state(subset)
+                    state.next[symbol] = next_state
+                    self.memory_used += self._TRANSITION_COST
+
+            state = next_state
+
+        return state.final
+
+    def flush(self):
+        """Vacía la caché de estados y transiciones."""
+        self._states = {}
+        self.memory_used = 0
+        self.flushes += 1
+
+    @property
+    def cached_states(self):
+        """int: Número de estados del AFD actualmente en caché."""
+        return len(self._states)
+
+    def _state(self, subset):
+        """Devuelve el estado en caché de un subconjunto, creándolo si no existe."""
+        state = self._states.get(subset)
+        if state is None:
+            final = not self.automaton.final_states.isdisjoint(subset)
+            state = self._states[subset] = _LazyState(subset, final)
+            self.memory_used += self._STATE_COST + sys.getsizeof(subset)
+        return state
+
+    def _step(self, subset, symbol):
+        """Subconjunto alcanzable desde subset con symbol, con cierre lambda."""
+        closures = self._closures
+        transitions = self.automaton.transitions
+        goal = set()
+        for state in subset:
+            if state in transitions:
+                for end_state in transitions[state].get(symbol, ()):
+                    goal.update(closures.get(end_state, (end_state,)))
+        return frozenset(goal)
+
+    def _simulate(self, subset, cadena, start):
+        """Evalúa cadena[start:] simulando el AFN desde subset, sin caché."""
+        symbols = self.automaton.symbols
+        for i in range(start, len(cadena)):
+            symbol = cadena[i]
+            if symbol not in symbols:
+                return False
+            subset = self._step(subset, symbol)
+            if not subset:
+                return False
+        return not self.automaton.final_states.isdisjoint(subset)
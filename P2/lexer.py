@@ -0,0 +1,280 @@
+"""
+Módulo para generar analizadores léxicos a partir de expresiones regulares.
+
+Las reglas del analizador son tuplas (nombre del token, expresión, prioridad).
+Los autómatas de todas las expresiones se unen en un único AFD mínimo (ver
+regex_set._tagged_dfa()) cuyos estados finales llevan la regla ganadora: la
+de mayor prioridad y, a igual prioridad, la primera de la lista. El texto se
+recorre con la regla de la coincidencia más larga (longest match): desde cada
+posición se avanza por la tabla hasta el estado muerto y se emite el token
+del último estado final visitado.
+
+Los tokens se guardan en bloque en arrays paralelos (tipo, inicio, fin), sin
+crear un objeto por token. Para usarlo con ply, el analizador tiene la misma
+interfaz que los de ply.lex (input() y token()), y los objetos Token se crean
+solo cuando se piden.
+"""
+
+from array import array
+
+from re_parser import REParser
+from regex_set import _tagged_dfa
+
+
+class Token:
+    """
+    Token con los atributos de ply.lex.LexToken.
+
+    Attributes:
+        type (str): Nombre del token.
+        value (str): Fragmento del texto que forma el token.
+        lineno (int): Número de línea en el que empieza, desde 1.
+        lexpos (int): Posición del texto en la que empieza.
+    """
+
+    __slots__ = ("type", "value", "lineno", "lexpos", "lexer")
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+class TokenStream:
+    """
+    Secuencia de tokens guardada en arrays paralelos.
+
+    Al recorrerla o indexarla se obtienen los nombres de los tokens, de modo
+    que se puede pasar directamente a LL1Table.analyze() (ver
+    Lexer.tokenize(), parámetro end).
+
+    Attributes:
+        text (str): Texto analizado.
+        names (list[str]): Nombre de cada tipo de token.
+        types (array): Tipo de cada token (índice en names).
+        starts (array): Posición en la que empieza cada token.
+        ends (array): Posición siguiente al final de cada token.
+    """
+
+    __slots__ = ("text", "names", "types", "starts", "ends")
+
+    def __init__(self, text, names, types, starts, ends):
+        self.text = text
+        self.names = names
+        self.types = types
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.types)
+
+    def __getitem__(self, i):
+        return self.names[self.types[i]]
+
+    def __iter__(self):
+        names = self.names
+        return (names[t] for t in self.types)
+
+    def value(self, i):
+        """str: Fragmento del texto que forma el token i."""
+        return self.text[self.starts[i]:self.ends[i]]
+
+    def tokens(self):
+        """
+        Recorre los tokens como objetos Token.
+
+        Yields:
+            Token: Cada token, en orden, con su número de línea.
+        """
+        text = self.text
+        lineno = 1
+        last = 0
+        for t, start, end in zip(self.types, self.starts, self.ends):
+            lineno += text.count("\n", last, start)
+            last = start
+            yield Token(self.names[t], text[start:end], lineno, start)
+
+
+class Lexer:
+    """
+    Analizador léxico con un único AFD mínimo para todas las reglas.
+
+    Attributes:
+        rules (list[tuple]): Reglas (nombre, expresión, prioridad). Los
+            tokens de las reglas con nombre None se descartan.
+        ignore (str): Caracteres que se saltan entre tokens, como t_ignore
+            en ply.
+        names (list[str]): Nombres de los tipos de token, en el orden en el
+            que aparecen en las reglas.
+        n_states (int): Número de estados del AFD.
+        lineno (int): Línea del último token devuelto por token().
+        lexpos (int): Posición siguiente al último token devuelto por token().
+    """
+
+    def __init__(self, rules, ignore="", syntax="re"):
+        """
+        Construye el AFD de las reglas.
+
+        Args:
+            rules (iterable[tuple]): Reglas (nombre, expresión, prioridad).
+                A igual longitud, gana la regla de mayor prioridad y, a igual
+                prioridad, la primera.
+            ignore (str, optional): Caracteres que se saltan entre tokens.
+            syntax (str, optional): Sintaxis de las expresiones, "re" (por
+                defecto) o "kleene", ver REParser.parse().
+
+        Raises:
+            ValueError: Si alguna expresión acepta la cadena vacía.
+        """
+        self.rules = list(rules)
+        self.ignore = ignore
+        self.names = []
+        self._rule_type = []
+        for name, _, _ in self.rules:
+            if name is not None and name not in self.names:
+                self.names.append(name)
+            self._rule_type.append(-1 if name is None else self.names.index(name))
+
+        parser = REParser()
+        automata = []
+        for name, regex, _ in self.rules:
+            automaton = parser.create_automaton(regex, method="glushkov", syntax=syntax)
+            if automaton.initial_state in automaton.final_states:
+                raise ValueError(f"Rule {name!r} matches the empty string: {regex!r}")
+            automata.append(automaton)
+
+        def winner(ids):
+            if not ids:
+                return -1
+            return max(ids, key=lambda i: (self.rules[i][2], -i))
+
+        self.symbols, table, self._accept, symbol_index = _tagged_dfa(automata, winner)
+        self.n_states = len(self._accept)
+
+        # Tabla con una columna más, sin transiciones, para los caracteres
+        # que no están en el alfabeto; los caracteres se traducen a columnas
+        # en bloque con str.translate()
+        n = len(self.symbols)
+        self._table = array('i')
+        for s in range(self.n_states):
+            self._table.extend(table[s * n:(s + 1) * n])
+            self._table.append(-1)
+        self._columns = _Columns({ord(char): col for char, col in symbol_index.items()
+                                  if isinstance(char, str)}, n)
+
+        # Estados finales sin transiciones: el token termina en ellos
+        self._stop = [self._accept[s] >= 0 and max(table[s * n:(s + 1) * n], default=-1) < 0
+                      for s in range(self.n_states)]
+
+        self._tokens = iter(())
+        self.lexdata = ""
+        self.lineno = 1
+        self.lexpos = 0
+
+    def tokenize(self, text, end=None):
+        """
+        Divide un texto en tokens, con la coincidencia más larga en cada posición.
+
+        Args:
+            text (str): Texto a analizar.
+            end (str, optional): Si se da, se añade al final un token vacío
+                con este nombre, como el "$" que espera LL1Table.analyze().
+
+        Returns:
+            TokenStream: Tokens del texto.
+
+        Raises:
+            ValueError: Si en alguna posición no empieza ningún token.
+        """
+        table = self._table
+        accept = self._accept
+        stop = self._stop
+        rule_type = self._rule_type
+        ignore = self.ignore
+        n = len(self.symbols) + 1
+        size = len(text)
+        columns = self._columns.translate(text)
+
+        types, starts, ends = array('i'), array('q'), array('q')
+        pos = 0
+        while pos < size:
+            if ignore and text[pos] in ignore:
+                pos += 1
+                continue
+
+            s = 0 if accept else -1
+            rule, last = -1, pos
+            i = pos
+            while s >= 0 and i < size:
+                s = table[s * n + columns[i]]
+                i += 1
+                if s >= 0 and accept[s] >= 0:
+                    rule, last = accept[s], i
+                    if stop[s]:
+                        break
+            if rule < 0:
+                raise ValueError(f"Illegal character {text[pos]!r} at position {pos}")
+
+            if rule_type[rule] >= 0:
+                types.append(rule_type[rule])
+                starts.append(pos)
+                ends.append(last)
+            pos = last
+
+        names = self.names
+        if end is not None:
+            if end not in names:
+                names = names + [end]
+            types.append(names.index(end))
+            starts.append(size)
+            ends.append(size)
+        return TokenStream(text, names, types, starts, ends)
+
+    def input(self, data):
+        """
+        Analiza un texto entero y prepara sus tokens para token(), como en ply.
+
+        Args:
+            data (str): Texto a analizar.
+        """
+        self.lexdata = data
+        self.lineno = 1
+        self.lexpos = 0
+        self._tokens = self.tokenize(data).tokens()
+
+    def token(self):
+        """
+        Siguiente token del texto de input(), como en ply.
+
+        Returns:
+            Token | None: El token, o None al final del texto.
+        """
+        token = next(self._tokens, None)
+        if token is not None:
+            self.lineno = token.lineno
+            self.lexpos = token.lexpos + len(token.value)
+        return token
+
+    def __iter__(self):
+        return iter(self.token, None)
+
+
+class _Columns(dict):
+    """Diccionario {código de carácter: columna} que devuelve unknown para el resto."""
+
+    def __init__(self, columns, unknown):
+        super().__init__(columns)
+        self.unknown = unknown
+
+    def __missing__(self, code):
+        return self.unknown
+
+    def translate(self, text):
+        """Columna de cada carácter del texto, como bytes o como lista."""
+        if self.unknown < 256:
+            return text.translate(self).encode("latin-1")
+        return [self.get(ord(char), self.unknown) for char in text]
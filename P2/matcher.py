@@ -0,0 +1,121 @@
+"""
+Módulo para la evaluación incremental de autómatas sobre entradas por bloques.
+
+Un Matcher guarda el estado actual de una tabla compilada (CompiledAutomaton),
+de forma que la entrada puede llegar en trozos (cadenas o bytes) sin tener que
+reunirla entera en memoria.
+"""
+
+import codecs
+
+
+class Matcher:
+    """
+    Evaluador reanudable de un autómata compilado.
+
+    Los trozos pueden ser cadenas o bytes; los bytes se decodifican con un
+    decodificador incremental, así que un carácter multibyte puede quedar
+    partido entre dos trozos.
+
+    Attributes:
+        compiled (CompiledAutomaton): Tabla compilada que se evalúa.
+        encoding (str): Codificación usada para los trozos de tipo bytes.
+        state (int): Estado actual; -1 si la entrada ya no puede aceptarse.
+        consumed (int): Número de caracteres procesados desde el último reset().
+    """
+
+    def __init__(self, compiled, encoding="utf-8"):
+        """
+        Inicializa el evaluador en el estado inicial.
+
+        Args:
+            compiled (CompiledAutomaton): Tabla compilada a evaluar.
+            encoding (str, optional): Codificación de los trozos de tipo bytes.
+                Por defecto "utf-8".
+        """
+        self.compiled = compiled
+        self.encoding = encoding
+        self.reset()
+
+    def reset(self):
+        """Vuelve al estado inicial y descarta los bytes pendientes de decodificar."""
+        self.state = self.compiled.initial_state
+        self.consumed = 0
+        self._decoder = codecs.getincrementaldecoder(self.encoding)()
+
+    def feed(self, chunk):
+        """
+        Procesa un trozo de la entrada.
+
+        Args:
+            chunk (str | bytes | bytearray | memoryview): Trozo de la entrada.
+
+        Returns:
+            Matcher: El propio evaluador, para poder encadenar llamadas.
+        """
+        if isinstance(chunk, (bytes, bytearray, memoryview)):
+            chunk = self._decoder.decode(chunk)
+        self.state = self.compiled.run(chunk, self.state)
+        self.consumed += len(chunk)
+        return self
+
+    def is_accepting(self):
+        """
+        Indica si la entrada procesada hasta ahora es aceptada.
+
+        Returns:
+            bool: True si el estado actual es final y no quedan bytes de un
+                  carácter incompleto por decodificar.
+        """
+        if self._decoder.getstate()[0]:
+            return False
+        return self.compiled.is_final(self.state)
+
+    def is_dead(self):
+        """
+        Indica si ninguna continuación de la entrada puede ser aceptada.
+
+        Returns:
+            bool: True si el evaluador está en el estado muerto (-1).
+        """
+        return self.state < 0
+
+    def snapshot(self):
+        """
+        Guarda el estado del evaluador.
+
+        Returns:
+            tuple: Estado opaco que se puede pasar a restore().
+        """
+        return (self.state, self.consumed, self._decoder.getstate())
+
+    def restore(self, snapshot):
+        """
+        Recupera un estado guardado con snapshot().
+
+        Args:
+            snapshot (tuple): Estado devuelto por snapshot().
+        """
+        self.state, self.consumed, decoder_state = snapshot
+        self._decoder.setstate(decoder_state)
+
+    async def feed_stream(self, reader, chunk_size=1 << 16):
+        """
+        Procesa un asyncio.StreamReader hasta el final del flujo.
+
+        La lectura se detiene antes si se llega al estado muerto, ya que el
+        resultado no puede cambiar.
+
+        Args:
+            reader (asyncio.StreamReader): Flujo del que leer.
+            chunk_size (int, optional): Bytes por lectura. Por defecto 64 KiB.
+
+        Returns:
+            bool: Resultado de is_accepting() tras procesar el flujo.
+        """
+        while not self.is_dead():
+            chunk = await reader.read(chunk_size)
+            if not chunk:
+                break
+            self.feed(chunk)
+        return self.is_accepting()
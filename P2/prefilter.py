@@ -0,0 +1,226 @@
+"""
+Módulo con el análisis de prefiltros para la búsqueda de autómatas en textos.
+
+Un prefiltro descarta, con búsquedas de subcadenas en C (str.find, bytes.find
+y sus variantes rfind), las partes del texto en las que no puede haber ninguna
+aparición, de modo que el autómata solo se ejecuta en las zonas candidatas.
+Del AFD compilado se extraen:
+
+- Un literal obligatorio: una subcadena que contiene toda cadena aceptada. Se
+  obtiene de los dominadores del AFD (los estados por los que pasa todo
+  camino del inicial a un final): si a un dominador solo se llega con un
+  carácter, ese carácter aparece en toda cadena aceptada; y si desde él solo
+  sale una transición, con un único carácter, también, y lo mismo con los
+  estados siguientes mientras no sean finales.
+- Los símbolos iniciales y finales: los caracteres con los que puede empezar
+  o terminar una cadena aceptada no vacía. Mientras no hay ninguna aparición
+  en curso, la búsqueda salta directamente a la siguiente posición que
+  contiene uno de ellos.
+
+Las clases de caracteres (SymbolClass) se reconocen como frozenset para no
+importar automaton, que importa este módulo a través de searcher.
+"""
+
+
+class Prefilter:
+    """
+    Prefiltro de la tabla compilada de un autómata.
+
+    Los literales y los símbolos son str para las tablas sobre caracteres y
+    bytes para las tablas sobre bytes (ver CompiledAutomaton.encode()).
+
+    Attributes:
+        literal (str | bytes): Subcadena que contiene toda cadena aceptada;
+            vacía si no hay ninguna.
+        first (list | None): Símbolos con los que empieza toda cadena aceptada
+            no vacía, o None si son más de max_symbols o si el autómata acepta
+            la cadena vacía.
+        last (list | None): Símbolos con los que termina toda cadena aceptada
+            no vacía, con las mismas condiciones que first.
+    """
+
+    def __init__(self, compiled, max_symbols=3):
+        """
+        Analiza una tabla compilada.
+
+        Args:
+            compiled (CompiledAutomaton): Tabla compilada determinista.
+            max_symbols (int, optional): Número máximo de símbolos iniciales o
+                finales que se buscan con find(). Por defecto 3.
+        """
+        self._join = bytes if compiled.byte_level and compiled.n_symbols else "".join
+        self.literal = self._join(required_literal(compiled))
+
+        self.first = self.last = None
+        if compiled.initial_state >= 0 and not compiled.is_final(compiled.initial_state):
+            first, last = _boundary_symbols(compiled)
+            if len(first) <= max_symbols:
+                self.first = [self._join([symbol]) for symbol in first]
+            if len(last) <= max_symbols:
+                self.last = [self._join([symbol]) for symbol in last]
+
+    def rejects(self, text, pos, endpos):
+        """
+        Indica si el prefiltro descarta todo el fragmento text[pos:endpos].
+
+        Args:
+            text (str | bytes | bytearray | mmap.mmap): Texto.
+            pos (int): Posición inicial del fragmento.
+            endpos (int): Posición final del fragmento.
+
+        Returns:
+            bool: True si el fragmento no contiene el literal obligatorio.
+        """
+        return bool(self.literal) and text.find(self.literal, pos, endpos) < 0
+
+    def next_first(self, text, pos, endpos):
+        """Primera posición de [pos, endpos) con un símbolo inicial, o endpos."""
+        positions = [i for i in (text.find(symbol, pos, endpos) for symbol in self.first) if i >= 0]
+        return min(positions) if positions else endpos
+
+    def previous_last(self, text, pos, endpos):
+        """Última posición de [pos, endpos) con un símbolo final, o -1."""
+        return max(text.rfind(symbol, pos, endpos) for symbol in self.last) if self.last else -1
+
+
+def required_literal(compiled):
+    """
+    Calcula un literal que aparece en todas las cadenas que acepta un AFD.
+
+    Args:
+        compiled (CompiledAutomaton): Tabla compilada determinista.
+
+    Returns:
+        list: Símbolos (caracteres o bytes) del literal más largo encontrado;
+              vacía si no hay ninguno.
+    """
+    n = compiled.n_symbols
+    table = compiled.table
+    if compiled.initial_state < 0:
+        return []
+
+    incoming = {}
+    for state in range(compiled.n_states):
+        for col in range(n):
+            end_state = table[state * n + col]
+            if end_state >= 0:
+                incoming.setdefault(end_state, set()).add(col)
+
+    best = []
+    for state in _final_dominators(compiled):
+        literal = []
+        cols = incoming.get(state, ())
+        if state != compiled.initial_state and len(cols) == 1:
+            symbol = _single_symbol(compiled.symbols[next(iter(cols))])
+            if symbol is not None:
+                literal.append(symbol)
+
+        seen = set()
+        while not compiled.is_final(state) and state not in seen:
+            seen.add(state)
+            moves = [(col, table[state * n + col]) for col in range(n) if table[state * n + col] >= 0]
+            if len(moves) != 1:
+                break
+            col, state = moves[0]
+            symbol = _single_symbol(compiled.symbols[col])
+            if symbol is None:
+                break
+            literal.append(symbol)
+        if len(literal) > len(best):
+            best = literal
+    return best
+
+
+def _single_symbol(symbol):
+    """Único carácter de un símbolo, o None si es una clase de varios."""
+    if isinstance(symbol, frozenset):  # SymbolClass
+        return next(iter(symbol)) if len(symbol) == 1 else None
+    return symbol
+
+
+def _final_dominators(compiled):
+    """
+    Estados por los que pasa todo camino del estado inicial a un estado final.
+
+    Se calculan los dominadores inmediatos con el algoritmo iterativo de
+    Cooper, Harvey y Kennedy sobre el grafo de la tabla al que se añade un
+    nodo de salida, sucesor de todos los estados finales.
+    """
+    n = compiled.n_symbols
+    table = compiled.table
+    exit_node = compiled.n_states
+
+    def successors(state):
+        if state == exit_node:
+            return []
+        goal = {table[state * n + col] for col in range(n)}
+        goal.discard(-1)
+        if compiled.is_final(state):
+            goal.add(exit_node)
+        return goal
+
+    # Orden postorden inverso con un DFS iterativo
+    order = []
+    visited = {compiled.initial_state}
+    stack = [(compiled.initial_state, iter(successors(compiled.initial_state)))]
+    predecessors = {}
+    while stack:
+        state, pending = stack[-1]
+        for end_state in pending:
+            predecessors.setdefault(end_state, []).append(state)
+            if end_state not in visited:
+                visited.add(end_state)
+                stack.append((end_state, iter(successors(end_state))))
+                break
+        else:
+            stack.pop()
+            order.append(state)
+    order.reverse()
+    if exit_node not in visited:
+        return []
+
+    number = {state: i for i, state in enumerate(order)}
+    idom = {compiled.initial_state: compiled.initial_state}
+    changed = True
+    while changed:
+        changed = False
+        for state in order[1:]:
+            new_idom = None
+            for prev_state in predecessors[state]:
+                if prev_state not in idom:
+                    continue
+                if new_idom is None:
+                    new_idom = prev_state
+                    continue
+                a, b = prev_state, new_idom
+                while a != b:
+                    while number[a] > number[b]:
+                        a = idom[a]
+                    while number[b] > number[a]:
+                        b = idom[b]
+                new_idom = a
+            if idom.get(state) != new_idom:
+                idom[state] = new_idom
+                changed = True
+
+    dominators = []
+    state = exit_node
+    while state != compiled.initial_state:
+        state = idom[state]
+        dominators.append(state)
+    return dominators
+
+
+def _boundary_symbols(compiled):
+    """Símbolos con los que empiezan y con los que terminan las cadenas aceptadas no vacías."""
+    n = compiled.n_symbols
+    table = compiled.table
+
+    first, last = set(), set()
+    for col, symbol in enumerate(compiled.symbols):
+        chars = symbol if isinstance(symbol, frozenset) else (symbol,)
+        if table[compiled.initial_state * n + col] >= 0:
+            first.update(chars)
+        if any(compiled.is_final(table[s * n + col]) for s in range(compiled.n_states)):
+            last.update(chars)
+    return sorted(first), sorted(last)
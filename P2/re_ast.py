@@ -0,0 +1,508 @@
+"""
+Módulo con el árbol de sintaxis abstracta (AST) de las expresiones regulares.
+
+Los nodos se construyen con hash-consing: dos expresiones estructuralmente
+iguales son siempre el mismo objeto, así que se comparan por identidad y se
+pueden usar como claves de diccionarios en tiempo constante. Los constructores
+(empty, lambda_, symbol, concat, union, intersection, complement, star) dejan
+las expresiones en forma canónica:
+
+- La unión y la intersección son asociativas, conmutativas e idempotentes:
+  se aplanan, se eliminan duplicados y los operandos se ordenan.
+- ∅ es el elemento neutro de la unión y absorbente de la concatenación y la
+  intersección; λ es el elemento neutro de la concatenación.
+- La concatenación se asocia a la derecha.
+- (r*)* = r*, (λ+r)* = r*, λ* = ∅* = λ y ~~r = r.
+- r{0,0} = λ, r{1,1} = r y r{0,} = r*.
+- Los prefijos comunes de las alternativas de una unión se factorizan:
+  a.b + a.c = a.(b+c) y a + a.b = a.(λ+b).
+- Si alguna de las alternativas de un solo carácter es una clase de
+  caracteres (solo las hay en la sintaxis extendida, [...]), todas se
+  agrupan en una clase: a + b + [0-9] = [ab0-9]. Las uniones de símbolos
+  sueltos, como a + b, se mantienen, de modo que los autómatas de la
+  notación de Kleene tienen un símbolo por carácter.
+
+Así, una expresión más pequeña da lugar a autómatas más pequeños en
+REParser.create_automaton(), que construye los autómatas a partir del AST.
+"""
+
+import threading
+import weakref
+
+from automaton import SymbolClass
+
+
+class Node:
+    """
+    Nodo del AST de una expresión regular.
+
+    No debe crearse directamente, sino con las funciones constructoras del
+    módulo, que garantizan que cada expresión tiene un único nodo.
+
+    Attributes:
+        op (str): Operador del nodo (EMPTY, LAMBDA, SYMBOL, CLASS, CONCAT,
+            UNION, INTERSECTION, COMPLEMENT, STAR o REPEAT).
+        args (tuple): Operandos del nodo (el símbolo, para SYMBOL; la
+            SymbolClass, para CLASS; la expresión repetida y los límites
+            inferior y superior, None si no hay, para REPEAT).
+        nullable (bool): True si la expresión acepta la cadena vacía.
+        id (int): Número de creación del nodo, usado para ordenar operandos.
+    """
+
+    __slots__ = ("op", "args", "nullable", "id", "__weakref__")
+
+    def __init__(self, op, args, nullable, id):
+        self.op = op
+        self.args = args
+        self.nullable = nullable
+        self.id = id
+
+    def __repr__(self):
+        return f"Node({to_string(self)!r})"
+
+    def __str__(self):
+        return to_string(self)
+
+
+EMPTY = "∅"
+LAMBDA = "λ"
+SYMBOL = "symbol"
+CLASS = "class"
+CONCAT = "."
+UNION = "+"
+INTERSECTION = "&"
+COMPLEMENT = "~"
+STAR = "*"
+REPEAT = "{}"
+
+# Tabla de hash-consing: (op, args) -> nodo. Los nodos que ya no se usan
+# desaparecen de la tabla. El cerrojo garantiza que dos hilos que construyen
+# la misma expresión obtienen el mismo nodo.
+_nodes = weakref.WeakValueDictionary()
+_next_id = 0
+_lock = threading.Lock()
+
+
+def _node(op, args, nullable):
+    """Devuelve el nodo único para (op, args), creándolo si no existe."""
+    global _next_id
+    key = (op, args)
+    node = _nodes.get(key)
+    if node is None:
+        with _lock:
+            node = _nodes.get(key)
+            if node is None:
+                node = Node(op, args, nullable, _next_id)
+                _next_id += 1
+                _nodes[key] = node
+    return node
+
+
+# Los nodos constantes se mantienen vivos durante toda la ejecución
+_EMPTY = _node(EMPTY, (), False)
+_LAMBDA = _node(LAMBDA, (), True)
+_UNIVERSAL = _node(COMPLEMENT, (_EMPTY,), True)
+
+
+def empty():
+    """Expresión que acepta el lenguaje vacío (∅)."""
+    return _EMPTY
+
+
+def lambda_():
+    """Expresión que acepta solo la cadena vacía (λ)."""
+    return _LAMBDA
+
+
+def universal():
+    """Expresión que acepta cualquier cadena (~∅)."""
+    return _UNIVERSAL
+
+
+def symbol(x):
+    """Expresión que acepta un único símbolo."""
+    return _node(SYMBOL, (x,), False)
+
+
+def char_class(chars):
+    """Expresión que acepta un carácter cualquiera de un conjunto."""
+    chars = SymbolClass(chars)
+    if not chars:
+        return _EMPTY
+    if len(chars) == 1:
+        return symbol(next(iter(chars)))
+    return _node(CLASS, (chars,), False)
+
+
+def concat(a, b):
+    """Concatenación de dos expresiones."""
+    if a is _EMPTY or b is _EMPTY:
+        return _EMPTY
+    if a is _LAMBDA:
+        return b
+    if b is _LAMBDA:
+        return a
+    # (x.y).b = x.(y.b)
+    parts = []
+    while a.op == CONCAT:
+        parts.append(a.args[0])
+        a = a.args[1]
+    parts.append(a)
+    for part in reversed(parts):
+        b = _node(CONCAT, (part, b), part.nullable and b.nullable)
+    return b
+
+
+def _operands(op, nodes):
+    """Operandos distintos de una unión o intersección, aplanados y ordenados."""
+    operands = set()
+    for node in nodes:
+        if node.op == op:
+            operands.update(node.args)
+        else:
+            operands.add(node)
+    return sorted(operands, key=lambda node: node.id)
+
+
+def union(*nodes):
+    """Unión de varias expresiones."""
+    # Las uniones de las colas que deja el factorizado (ver _union()) se
+    # resuelven con una pila de generadores en lugar de con recursión, ya que
+    # su profundidad es la longitud del prefijo común de las alternativas
+    stack = [_union(nodes)]
+    result = None
+    while stack:
+        try:
+            request = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+        else:
+            stack.append(_union(request))
+            result = None
+    return result
+
+
+def _union(nodes):
+    """
+    Unión de varias expresiones, como generador.
+
+    Cada unión anidada que necesita se pide con yield de sus operandos, y
+    union() le envía el resultado.
+    """
+    operands = [node for node in _operands(UNION, nodes) if node is not _EMPTY]
+    if _UNIVERSAL in operands:
+        return _UNIVERSAL
+    if not operands:
+        return _EMPTY
+    if len(operands) == 1:
+        return operands[0]
+
+    # Agrupar las alternativas por su primer factor
+    tails = {}
+    for node in operands:
+        if node.op == CONCAT:
+            tails.setdefault(node.args[0], []).append(node.args[1])
+        else:
+            tails.setdefault(node, []).append(_LAMBDA)
+    if len(tails) < len(operands):
+        factored = []
+        for head, rest in tails.items():
+            factored.append(concat(head, (yield rest)))
+        return (yield factored)
+
+    # Agrupar las alternativas de un solo carácter, si alguna es una clase
+    chars = [node for node in operands if node.op == SYMBOL or node.op == CLASS]
+    if len(chars) > 1 and any(node.op == CLASS for node in chars):
+        merged = set()
+        for node in chars:
+            if node.op == SYMBOL:
+                merged.add(node.args[0])
+            else:
+                merged.update(node.args[0])
+        others = [node for node in operands if node.op != SYMBOL and node.op != CLASS]
+        return (yield [char_class(merged)] + others)
+
+    return _node(UNION, tuple(operands), any(node.nullable for node in operands))
+
+
+def intersection(*nodes):
+    """Intersección de varias expresiones."""
+    operands = [node for node in _operands(INTERSECTION, nodes) if node is not _UNIVERSAL]
+    if _EMPTY in operands:
+        return _EMPTY
+    if not operands:
+        return _UNIVERSAL
+    if len(operands) == 1:
+        return operands[0]
+    return _node(INTERSECTION, tuple(operands), all(node.nullable for node in operands))
+
+
+def complement(a):
+    """Complemento de una expresión respecto a todas las cadenas."""
+    if a.op == COMPLEMENT:
+        return a.args[0]
+    return _node(COMPLEMENT, (a,), not a.nullable)
+
+
+def star(a):
+    """Estrella de Kleene de una expresión."""
+    if a.op == STAR:
+        return a
+    if a is _EMPTY or a is _LAMBDA:
+        return _LAMBDA
+    if a.op == UNION and _LAMBDA in a.args:
+        # (λ+r)* = r*
+        return star(union(*(arg for arg in a.args if arg is not _LAMBDA)))
+    return _node(STAR, (a,), True)
+
+
+def repeat(a, low, high):
+    """
+    Repetición acotada de una expresión, entre low y high veces.
+
+    La repetición no se expande: se mantiene como un nodo REPEAT, que
+    expand() convierte en concatenaciones y que
+    REParser.create_counting_automaton() compila a un contador.
+
+    Args:
+        a (Node): Expresión repetida.
+        low (int): Número mínimo de repeticiones.
+        high (int | None): Número máximo de repeticiones (None si no hay).
+    """
+    if high == 0 or a is _LAMBDA:
+        return _LAMBDA
+    if a is _EMPTY:
+        return _LAMBDA if low == 0 else _EMPTY
+    if high is None and low == 0:
+        return star(a)
+    if low == 1 and high == 1:
+        return a
+    return _node(REPEAT, (a, low, high), low == 0 or a.nullable)
+
+
+def children(node):
+    """
+    Operandos de un nodo que son a su vez expresiones.
+
+    Args:
+        node (Node): Nodo del AST.
+
+    Returns:
+        tuple[Node]: Subexpresiones del nodo.
+    """
+    if node.op == SYMBOL or node.op == CLASS:
+        return ()
+    if node.op == REPEAT:
+        return node.args[:1]
+    return node.args
+
+
+def expand(root, max_count=None):
+    """
+    Expande las repeticiones acotadas de una expresión.
+
+    r{m,n} se convierte en m copias de r seguidas de n-m copias opcionales
+    anidadas, r{0,2} = (λ+r.(λ+r)), y r{m,} en m copias de r seguidas de r*.
+
+    Args:
+        root (Node): Expresión.
+        max_count (int, optional): Solo se expanden las repeticiones cuyo
+            límite (el superior o, si no hay, el inferior) no supera este
+            valor. Por defecto se expanden todas.
+
+    Returns:
+        Node: Expresión equivalente.
+    """
+    expanded = {}
+    pending = [root]
+    while pending:
+        node = pending[-1]
+        if node in expanded:
+            pending.pop()
+            continue
+        missing = [child for child in children(node) if child not in expanded]
+        if missing:
+            pending.extend(missing)
+            continue
+        pending.pop()
+
+        op = node.op
+        args = [expanded[child] for child in children(node)]
+        if op == CONCAT:
+            result = concat(*args)
+        elif op == UNION:
+            result = union(*args)
+        elif op == INTERSECTION:
+            result = intersection(*args)
+        elif op == COMPLEMENT:
+            result = complement(*args)
+        elif op == STAR:
+            result = star(*args)
+        elif op == REPEAT:
+            a, (_, low, high) = args[0], node.args
+            bound = low if high is None else high
+            if max_count is not None and bound > max_count:
+                result = repeat(a, low, high)
+            else:
+                result = star(a) if high is None else _LAMBDA
+                if high is not None:
+                    for _ in range(high - low):
+                        result = union(_LAMBDA, concat(a, result))
+                for _ in range(low):
+                    result = concat(a, result)
+        else:
+            result = node
+        expanded[node] = result
+
+    return expanded[root]
+
+
+def from_rpn(rpn_string):
+    """
+    Construye el AST de una expresión en notación polaca inversa.
+
+    Args:
+        rpn_string (str): Expresión en notación polaca inversa, tal y como la
+            devuelve re_parser._re_to_rpn().
+
+    Returns:
+        Node: Raíz del AST (∅ si la expresión está vacía).
+    """
+    # Las uniones encadenadas se acumulan en una lista y se construyen con una
+    # sola llamada a union(), en lugar de aplanar de nuevo en cada "+"
+    def pop():
+        node = stack.pop()
+        return union(*node) if isinstance(node, list) else node
+
+    stack = []
+    for x in rpn_string:
+        if x == "*":
+            stack.append(star(pop()))
+        elif x == "~":
+            stack.append(complement(pop()))
+        elif x == "+":
+            b = stack.pop()
+            a = stack.pop()
+            alternatives = a if isinstance(a, list) else [a]
+            alternatives.extend(b if isinstance(b, list) else [b])
+            stack.append(alternatives)
+        elif x == "." or x == "&":
+            b = pop()
+            a = pop()
+            stack.append(concat(a, b) if x == "." else intersection(a, b))
+        elif x == "λ":
+            stack.append(_LAMBDA)
+        else:
+            stack.append(symbol(x))
+
+    return pop() if stack else _EMPTY
+
+
+def postorder(node):
+    """
+    Recorre el árbol de una expresión en postorden, sin recursión.
+
+    Los nodos compartidos por hash-consing se visitan una vez por cada
+    aparición, como en el árbol de la expresión original.
+
+    Args:
+        node (Node): Raíz de la expresión.
+
+    Yields:
+        Node: Cada nodo, después de todos sus operandos.
+    """
+    pending = [(node, False)]
+    while pending:
+        node, expanded = pending.pop()
+        if expanded or not children(node):
+            yield node
+        else:
+            pending.append((node, True))
+            pending.extend((arg, False) for arg in reversed(children(node)))
+
+
+def symbols(node):
+    """
+    Símbolos que aparecen en una expresión.
+
+    Args:
+        node (Node): Expresión.
+
+    Returns:
+        set: Símbolos de la expresión.
+    """
+    result = set()
+    seen = set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if node.id in seen:
+            continue
+        seen.add(node.id)
+        if node.op == SYMBOL:
+            result.add(node.args[0])
+        elif node.op == CLASS:
+            result.update(node.args[0])
+        else:
+            pending.extend(children(node))
+    return result
+
+
+def leaves(node):
+    """
+    Símbolos y clases de caracteres que aparecen en una expresión.
+
+    Args:
+        node (Node): Expresión.
+
+    Returns:
+        set[Node]: Nodos SYMBOL y CLASS de la expresión.
+    """
+    result = set()
+    seen = set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if node.id in seen:
+            continue
+        seen.add(node.id)
+        if node.op == SYMBOL or node.op == CLASS:
+            result.add(node)
+        else:
+            pending.extend(children(node))
+    return result
+
+
+def to_string(node):
+    """
+    Representación de una expresión con la sintaxis de REParser.
+
+    Args:
+        node (Node): Expresión.
+
+    Returns:
+        str: Expresión en notación infija, con paréntesis en cada operador.
+    """
+    if node.op == SYMBOL:
+        return node.args[0]
+    if node.op == CLASS:
+        return str(node.args[0])
+    if node.op == EMPTY or node.op == LAMBDA:
+        return node.op
+    if node.op == STAR:
+        return f"({to_string(node.args[0])})*"
+    if node.op == COMPLEMENT:
+        return f"~({to_string(node.args[0])})"
+    if node.op == REPEAT:
+        a, low, high = node.args
+        return f"({to_string(a)}){{{low},{'' if high is None else high}}}"
+    if node.op == CONCAT:
+        # Recorrer la cadena de concatenaciones sin recursión
+        parts = []
+        while node.op == CONCAT:
+            parts.append(to_string(node.args[0]))
+            node = node.args[1]
+        parts.append(to_string(node))
+        return "(" + ".".join(parts) + ")"
+    return "(" + node.op.join(to_string(arg) for arg in node.args) + ")"
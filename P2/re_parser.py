@@ -3,13 +3,22 @@
     Última modificación: 7/nov/2025
 """
 
+from concurrent.futures import ProcessPoolExecutor
+
 from automaton import *
+import counting_automaton
+import re_ast
+from counting_automaton import CountingAutomaton
+from tagged_automaton import OrderedAST, TaggedAutomaton
 
 def _re_to_rpn(re_string):
     """
     Convert re to reverse polish notation (RPN).
 
-    Does not check that the input re is syntactically correct.
+    Does not check that the input re is syntactically correct. Besides the
+    Kleene operators, "&" (intersection, between "." and "+" in precedence)
+    and the prefix "~" (complement) are recognized. Concatenation is right
+    associative, so that long words become right-nested chains.
 
     Args:
         re_string: Regular expression in infix notation. Type: str
@@ -19,43 +28,324 @@ def _re_to_rpn(re_string):
 
     """
     stack = [] # List of strings
-    rpn_string = ""
+    rpn = [] # List of strings, joined at the end
     for x in re_string:
         if x == "+":
             while len(stack) > 0 and stack[-1] != "(":
-                rpn_string += stack.pop()
+                rpn.append(stack.pop())
+            stack.append(x)
+        elif x == "&":
+            while len(stack) > 0 and stack[-1] in ".&~":
+                rpn.append(stack.pop())
             stack.append(x)
         elif x == ".":
-            while len(stack) > 0 and stack[-1] == ".":
-                rpn_string += stack.pop()
+            while len(stack) > 0 and stack[-1] == "~":
+                rpn.append(stack.pop())
             stack.append(x)
-        elif x == "(":
+        elif x == "(" or x == "~":
             stack.append(x)
         elif x == ")":
             while stack[-1] != "(":
-                rpn_string += stack.pop()
+                rpn.append(stack.pop())
             stack.pop()
         else:
-            rpn_string += x
+            rpn.append(x)
 
     while len(stack) > 0:
-        rpn_string += stack.pop()
+        rpn.append(stack.pop())
+
+    rpn_string = "".join(rpn)
 
     return rpn_string
 
 
+# Predefined character classes and escapes of the extended syntax
+_ESCAPE_CLASSES = {
+    "d": "0123456789",
+    "w": "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz",
+    "s": " \t\n\r\f\v",
+}
+_ESCAPE_CHARS = {"t": "\t", "n": "\n", "r": "\r", "f": "\f", "v": "\v"}
+
+
+class _ExtendedParser():
+    """
+    Recursive descent parser for the extended, re-like regex syntax.
+
+    Supports alternation (|), implicit concatenation, the quantifiers *, +,
+    ? and {m}, {m,}, {,n}, {m,n}, groups ( ) and (?: ), character classes
+    with ranges ([a-z0-9_]) and the escapes \\d, \\w, \\s, \\t, \\n, ... The
+    result is the hash-consed abstract syntax tree of the regex.
+
+    The nodes are built with the constructors of ast (re_ast by default). If
+    captures is True, each capturing group ( ) is wrapped with
+    ast.group(node, index), numbered by its opening parenthesis as in re; the
+    number of groups is left in the groups attribute.
+    """
+
+    def __init__(self, re_string, ast=re_ast, captures=False):
+        self.re_string = re_string
+        self.pos = 0
+        self.ast = ast
+        self.captures = captures
+        self.groups = 0
+
+    def parse(self):
+        node = self._alternation()
+        if self.pos < len(self.re_string):
+            raise self._error("unbalanced parenthesis")
+        return node
+
+    def _error(self, message):
+        return ValueError(f"{message} at position {self.pos} in {self.re_string!r}")
+
+    def _peek(self):
+        return self.re_string[self.pos] if self.pos < len(self.re_string) else None
+
+    def _alternation(self):
+        branches = [self._concatenation()]
+        while self._peek() == "|":
+            self.pos += 1
+            branches.append(self._concatenation())
+        return self.ast.union(*branches)
+
+    def _concatenation(self):
+        factors = []
+        while self._peek() is not None and self._peek() not in "|)":
+            factors.append(self._repetition())
+        node = self.ast.lambda_()
+        for factor in reversed(factors):
+            node = self.ast.concat(factor, node)
+        return node
+
+    def _repetition(self):
+        node = self._atom()
+        x = self._peek()
+        if x == "*":
+            node = self.ast.star(node)
+        elif x == "+":
+            node = self.ast.concat(node, self.ast.star(node))
+        elif x == "?":
+            node = self.ast.union(node, self.ast.lambda_())
+        elif x == "{" and self._bounds() is not None:
+            low, high = self._bounds()
+            self.pos = self.re_string.index("}", self.pos)
+            node = self.ast.repeat(node, low, high)
+        else:
+            return node
+        self.pos += 1
+
+        # A lazy quantifier accepts the same language, but captures differently
+        if self._peek() == "?":
+            if self.captures:
+                raise self._error("unsupported lazy quantifier with capture groups")
+            self.pos += 1
+        x = self._peek()
+        if x is not None and (x in "*+?" or (x == "{" and self._bounds() is not None)):
+            raise self._error("multiple repeat")
+        return node
+
+    def _bounds(self):
+        """Bounds of a {m,n} quantifier at the current position, or None if it is a literal."""
+        end = self.re_string.find("}", self.pos)
+        if end < 0:
+            return None
+        low, comma, high = self.re_string[self.pos + 1:end].partition(",")
+        if not (low or comma) or not set(low + high) <= set("0123456789"):
+            return None
+        low = int(low) if low else 0
+        high = int(high) if high else (None if comma else low)
+        if high is not None and high < low:
+            raise self._error("min repeat greater than max repeat")
+        return low, high
+
+    def _atom(self):
+        x = self._peek()
+        self.pos += 1
+        if x == "(":
+            index = None
+            if self.re_string.startswith("?:", self.pos):
+                self.pos += 2
+            elif self._peek() == "?":
+                raise self._error("unsupported group extension")
+            elif self.captures:
+                self.groups += 1
+                index = self.groups
+            node = self._alternation()
+            if self._peek() != ")":
+                raise self._error("missing )")
+            self.pos += 1
+            return node if index is None else self.ast.group(node, index)
+        if x == "[":
+            return self.ast.char_class(self._class())
+        if x == "\\":
+            return self._escape()
+        if x in "*+?":
+            raise self._error("nothing to repeat")
+        if x in ".^$":
+            raise self._error(f"unsupported operator {x!r}")
+        return self.ast.symbol(x)
+
+    def _escape(self):
+        x = self._peek()
+        if x is None:
+            raise self._error("bad escape (end of pattern)")
+        if x in _ESCAPE_CLASSES:
+            self.pos += 1
+            return self.ast.char_class(_ESCAPE_CLASSES[x])
+        if x in _ESCAPE_CHARS:
+            self.pos += 1
+            return self.ast.symbol(_ESCAPE_CHARS[x])
+        # Other ASCII letters and digits are escapes of re (\D, \b, \x41,
+        # backreferences...) that are not supported, not literal characters
+        if x.isascii() and x.isalnum():
+            raise self._error(f"unsupported escape \\{x}")
+        self.pos += 1
+        return self.ast.symbol(x)
+
+    def _class(self):
+        if self._peek() == "^":
+            raise self._error("unsupported negated character class")
+        chars = set()
+        first = True
+        while True:
+            x = self._peek()
+            if x is None:
+                raise self._error("unterminated character set")
+            self.pos += 1
+            if x == "]" and not first:
+                return chars
+            first = False
+            if x == "\\":
+                escape = self._escape()
+                if escape.op == re_ast.CLASS:
+                    chars.update(escape.args[0])
+                    continue
+                x = escape.args[0]
+            if self._peek() == "-" and self.re_string[self.pos + 1:self.pos + 2] not in ("", "]"):
+                self.pos += 1
+                end = self._peek()
+                self.pos += 1
+                if end == "\\":
+                    end = self._escape().args[0]
+                if ord(end) < ord(x):
+                    raise self._error(f"bad character range {x}-{end}")
+                chars.update(chr(code) for code in range(ord(x), ord(end) + 1))
+            else:
+                chars.add(x)
+
+
+def _alphabet(root):
+    """
+    Split the symbols and character classes of a regex into disjoint symbols.
+
+    Characters that belong to the same classes (and are not used as plain
+    symbols) share a single SymbolClass, so each class becomes a few
+    transitions instead of one per character.
+
+    Args:
+        root: Root of the abstract syntax tree of the regex. Type: re_ast.Node
+
+    Returns:
+        Dictionary {SYMBOL or CLASS node: tuple of transition symbols}. Type: dict
+
+    """
+    leaves = re_ast.leaves(root)
+    literals = {leaf.args[0] for leaf in leaves if leaf.op == re_ast.SYMBOL}
+    classes = [leaf for leaf in leaves if leaf.op == re_ast.CLASS]
+
+    signatures = {}  # character -> indices of the classes that contain it
+    for i, leaf in enumerate(classes):
+        for char in leaf.args[0]:
+            if char not in literals:
+                signatures.setdefault(char, []).append(i)
+    groups = {}
+    for char, signature in signatures.items():
+        groups.setdefault(tuple(signature), []).append(char)
+
+    atoms = {leaf: (leaf.args[0],) for leaf in leaves if leaf.op == re_ast.SYMBOL}
+    class_atoms = [[char for char in leaf.args[0] if char in literals] for leaf in classes]
+    for signature, chars in groups.items():
+        label = chars[0] if len(chars) == 1 else SymbolClass(chars)
+        for i in signature:
+            class_atoms[i].append(label)
+    for leaf, labels in zip(classes, class_atoms):
+        atoms[leaf] = tuple(labels)
+    return atoms
+
+
+_KLEENE_OPERATORS = set("+.*()&~λ")
+_RE_OPERATORS = set("\\()[]{}|*+?.^$")
+
+
+def _literal_words(re_string, syntax):
+    """
+    Return the words of a regex that is an alternation of plain words.
+
+    In Kleene notation the words are concatenations of symbols ("λ" stands
+    for the empty word), and in the re syntax they are runs of characters
+    without metacharacters (an empty alternative is the empty word).
+
+    Args:
+        re_string: String with the regular expression. Type: str
+        syntax: "kleene" or "re". Type: str
+
+    Returns:
+        The words, or None if the regex is not a literal alternation. Type: list[str]
+
+    """
+    if syntax == "re":
+        if any(x in _RE_OPERATORS and x != "|" for x in re_string):
+            return None
+        return re_string.split("|")
+
+    if syntax != "kleene" or not re_string:
+        return None
+    words = []
+    for alternative in re_string.split("+"):
+        word = []
+        for symbol in alternative.split("."):
+            if len(symbol) != 1 or (symbol in _KLEENE_OPERATORS and symbol != "λ"):
+                return None
+            if symbol != "λ":
+                word.append(symbol)
+        words.append("".join(word))
+    return words
+
 
 class REParser():
-    """Class for processing regular expressions in Kleene's syntax."""
+    """
+    Class for processing regular expressions in Kleene's syntax.
+
+    The attributes set in __init__ are the state of a single Thompson
+    construction. create_automaton and create_counting_automaton run each
+    construction on a fresh parser, so one instance can be shared between
+    threads.
+    """
     
     def __init__(self) -> None:
         self.state_counter = 0
+        self._transitions = {}
+        self._symbols = set()
+        self._counters = []  # (low, high) of each counter
+        self._counter_transitions = {}
 
     def _new_state(self):
-        s = f"q{self.state_counter}"
+        s = self.state_counter
         self.state_counter += 1
         return s
 
+    def _add_transition(self, start, symbol, end):
+        """Add a transition to the shared transitions store."""
+        transitions = self._transitions.get(start)
+        if transitions is None:
+            transitions = self._transitions[start] = {}
+        end_states = transitions.get(symbol)
+        if end_states is None:
+            transitions[symbol] = {end}
+        else:
+            end_states.add(end)
+
 
     # def _epsilon_closure(self, aut, states):
     #     """Cierre-λ (None) sobre el autómata de Thompson ya construido."""
@@ -127,167 +417,614 @@ class REParser():
         Create an automaton that accepts the empty language.
 
         Returns:
-            Automaton that accepts the empty language. Type: FiniteAutomaton
+            Fragment (initial state, final state) that accepts the empty
+            language. Type: tuple[int, int]
 
         """
-        qi, qf = self._new_state(), self._new_state()
-        return FiniteAutomaton(
-            initial_state=qi,
-            states=[qi, qf],
-            symbols=set(),
-            transitions={},
-            final_states=set(qf),
-        )
-        
+        return self._new_state(), self._new_state()
 
     def _create_automaton_lambda(self):
         """
         Create an automaton that accepts the empty string.
 
         Returns:
-            Automaton that accepts the empty string. Type: FiniteAutomaton
+            Fragment (initial state, final state) that accepts the empty
+            string. Type: tuple[int, int]
 
         """
         qi, qf = self._new_state(), self._new_state()
-        return FiniteAutomaton(
-            initial_state=qi,
-            states=[qi, qf],
-            symbols=set(),
-            transitions={qi: {None, {qf}}},
-            final_states=set(qf),
-        )
-
+        self._add_transition(qi, None, qf)
+        return qi, qf
 
-    def _create_automaton_symbol(self, symbol):
+    def _create_automaton_symbol(self, symbol, *others):
         """
         Create an automaton that accepts one symbol.
 
         Args:
             symbol: Symbol that the automaton should accept. Type: str
+            others: Further symbols accepted by the same transition, for
+                character classes. Type: str or SymbolClass
 
         Returns:
-            Automaton that accepts a symbol. Type: FiniteAutomaton
+            Fragment (initial state, final state) that accepts a symbol.
+            Type: tuple[int, int]
 
         """
         q0, q1 = self._new_state(), self._new_state()
-        return FiniteAutomaton(
-            initial_state=q0,
-            states=[q0, q1],
-            symbols={symbol},
-            transitions={q0: {symbol: {q1}}},
-            final_states={q1},
-        )
+        for x in (symbol,) + others:
+            self._add_transition(q0, x, q1)
+            self._symbols.add(x)
+        return q0, q1
 
     def _create_automaton_star(self, A):
         """
         Create an automaton that accepts the Kleene star of another.
 
         Args:
-            automaton: Automaton whose Kleene star must be computed. Type: FiniteAutomaton
+            automaton: Fragment whose Kleene star must be computed. Type: tuple[int, int]
 
         Returns:
-            Automaton that accepts the Kleene star. Type: FiniteAutomaton
+            Fragment that accepts the Kleene star. Type: tuple[int, int]
 
         """
         qi, qf = self._new_state(), self._new_state()
-        states = [qi, qf] + A.states
-        symbols = set(A.symbols)
+        self._add_transition(qi, None, A[0])
+        self._add_transition(qi, None, qf)
+        self._add_transition(A[1], None, A[0])
+        self._add_transition(A[1], None, qf)
+        return qi, qf
+
+    def _create_automaton_union(self, A, B, *others):
+        """
+        Create an automaton that accepts the union of two or more automata.
 
-        A.add_transition(qi, None, A.states[0])
-        A.add_transition(qi, None, qf)
-        A.add_transition(A.states[1], None, A.states[0])
-        A.add_transition(A.states[1], None, qf)
+        All the branches share a single pair of initial and final states, so
+        the lambda closure of the union does not grow with its arity.
 
-        return FiniteAutomaton(qi, states, symbols, A.transitions, {qf})
+        Args:
+            automaton1: First fragment of the union. Type: tuple[int, int]
+            automaton2: Second fragment of the union. Type: tuple[int, int]
+            others: Further fragments of the union. Type: tuple[int, int]
+
+        Returns:
+            Fragment that accepts the union. Type: tuple[int, int]
 
+        """
+        qi, qf = self._new_state(), self._new_state()
+        for fragment in (A, B) + others:
+            self._add_transition(qi, None, fragment[0])
+            self._add_transition(fragment[1], None, qf)
+        return qi, qf
 
-    def _create_automaton_union(self, A, B):
+    def _create_automaton_concat(self, A, B):
         """
-        Create an automaton that accepts the union of two automata.
+        Create an automaton that accepts the concatenation of two automata.
 
         Args:
-            automaton1: First automaton of the union. Type: FiniteAutomaton.
-            automaton2: Second automaton of the union. Type: FiniteAutomaton.
+            automaton1: First fragment of the concatenation. Type: tuple[int, int]
+            automaton2: Second fragment of the concatenation. Type: tuple[int, int]
 
         Returns:
-            Automaton that accepts the union. Type: FiniteAutomaton.
+            Fragment that accepts the concatenation. Type: tuple[int, int]
 
         """
-        qi, qf = self._new_state(), self._new_state()
-        states = [qi, qf] + A.states + B.states
-        symbols = set(A.symbols) | set(B.symbols)
-        trans = A.transitions | B.transitions
+        self._add_transition(A[1], None, B[0])
+        return A[0], B[1]
 
-        C = FiniteAutomaton(qi, states, symbols, trans, {qf})
+    def _to_automaton(self, fragment):
+        """
+        Convert a fragment of the shared transitions store to an automaton.
 
-        C.add_transition(qi, None, A.states[0])
-        C.add_transition(qi, None, B.states[0])
-        C.add_transition(A.states[1], None, qf)
-        C.add_transition(B.states[1], None, qf)
+        State ``i`` is named ``q{i}``. The initial and final states of the
+        fragment are the first two states of the automaton.
 
-        return C
+        Args:
+            fragment: Fragment to convert. Type: tuple[int, int]
 
+        Returns:
+            Automaton with the states and transitions built so far. Type: FiniteAutomaton
 
-    def _create_automaton_concat(self, A, B):
         """
-        Create an automaton that accepts the concatenation of two automata.
+        names = [f"q{i}" for i in range(self.state_counter)]
+        qi, qf = fragment
+        states = [names[qi], names[qf]] + [name for i, name in enumerate(names) if i != qi and i != qf]
+        transitions = {
+            names[start]: {symbol: {names[end] for end in ends} for symbol, ends in edges.items()}
+            for start, edges in self._transitions.items()
+        }
+        return FiniteAutomaton(names[qi], states, set(self._symbols), transitions, {names[qf]})
+
+    def parse(self, re_string, syntax="kleene"):
+        """
+        Parse a regex into its abstract syntax tree.
+
+        Args:
+            re_string: String with the regular expression. Type: str
+            syntax: "kleene" for Kleene notation (optionally with "&" and
+                "~"), or "re" for the extended syntax of Python's re module
+                (|, implicit concatenation, *, +, ?, {m,n}, groups, classes
+                and ranges). Type: str
+
+        Returns:
+            Hash-consed root node of the regex, in canonical form. Type: re_ast.Node
+
+        """
+        if syntax == "re":
+            return _ExtendedParser(re_string).parse()
+        if syntax != "kleene":
+            raise ValueError(f"Unknown syntax: {syntax}")
+        return re_ast.from_rpn(_re_to_rpn(re_string))
+
+    def _create_position_automaton(self, root):
+        """
+        Create the position (Glushkov) automaton of a regex.
+
+        Each occurrence of a symbol (or character class) in the regex is a position and a state of
+        the automaton, plus an initial state q0. For every subexpression the
+        stack holds (nullable, firstpos, lastpos), and followpos is filled in
+        by concatenations and stars. The result has no lambda transitions.
 
         Args:
-            automaton1: First automaton of the concatenation. Type: FiniteAutomaton.
-            automaton2: Second automaton of the concatenation. Type: FiniteAutomaton.
+            root: Root of the abstract syntax tree of the regex. Type: re_ast.Node
 
         Returns:
-            Automaton that accepts the concatenation. Type: FiniteAutomaton.
+            Automaton equivalent to the regex. Type: FiniteAutomaton
 
         """
-        states = [A.states[0], B.states[1]] + [s for s in A.states if s not in [A.states[0]]] + [s for s in B.states if s not in [B.states[1]]]
-        symbols = set(A.symbols) | set(B.symbols)
-        trans = A.transitions | B.transitions
+        alphabet = _alphabet(root)
+        symbols = [()]  # Symbols of each position; position 0 is the initial state
+        followpos = [set()]
+
+        stack = []  # list of (nullable, firstpos, lastpos)
+        for node in re_ast.postorder(root):
+            op = node.op
+            if op == re_ast.STAR:
+                nullable, first, last = stack.pop()
+                for p in last:
+                    followpos[p] |= first
+                stack.append((True, first, last))
+            elif op == re_ast.UNION:
+                operands = stack[-len(node.args):]
+                del stack[-len(node.args):]
+                # Each set is used by a single subexpression, so it is safe to
+                # update it in place
+                nullable, first, last = operands[0]
+                for nullable2, first2, last2 in operands[1:]:
+                    nullable = nullable or nullable2
+                    first |= first2
+                    last |= last2
+                stack.append((nullable, first, last))
+            elif op == re_ast.CONCAT:
+                nullable2, first2, last2 = stack.pop()
+                nullable1, first1, last1 = stack.pop()
+                for p in last1:
+                    followpos[p] |= first2
+                if nullable1:
+                    first1 |= first2
+                if nullable2:
+                    last2 |= last1
+                stack.append((nullable1 and nullable2, first1, last2))
+            elif op == re_ast.LAMBDA:
+                stack.append((True, set(), set()))
+            elif op == re_ast.EMPTY:
+                stack.append((False, set(), set()))
+            elif op == re_ast.SYMBOL or op == re_ast.CLASS:
+                position = len(symbols)
+                symbols.append(alphabet[node])
+                followpos.append(set())
+                stack.append((False, {position}, {position}))
+            else:
+                raise ValueError("Intersection and complement are only supported by DerivativeMatcher")
 
-        C = FiniteAutomaton(A.states[0], states, symbols, trans, B.final_states)
-        C.add_transition(A.states[1], None, B.initial_state)
-        
-        return C
+        nullable, first, last = stack.pop()
+        followpos[0] = first
 
+        names = [f"q{i}" for i in range(len(symbols))]
+        transitions = {}
+        for p, follow in enumerate(followpos):
+            if follow:
+                edges = transitions[names[p]] = {}
+                for q in follow:
+                    for symbol in symbols[q]:
+                        edges.setdefault(symbol, set()).add(names[q])
+
+        final_states = {names[p] for p in last}
+        if nullable:
+            final_states.add(names[0])
+
+        return FiniteAutomaton(names[0], names, set().union(*symbols), transitions, final_states)
 
     def create_automaton(
         self,
         re_string,
+        method="auto",
+        syntax="kleene",
     ):
         """
         Create an automaton from a regex.
 
+        The regex is first parsed into its simplified abstract syntax tree
+        (see parse), and the automaton is built from the tree. With the
+        default method, alternations of two or more plain words (such as
+        "i.f+e.l.s.e") are instead built with create_literal_automaton, and
+        any other regex with the Thompson construction. An explicit method
+        always gives the automaton of that construction.
+
         Args:
             re_string: String with the regular expression in Kleene notation. Type: str
+            method: "thompson" for the Thompson NFA with lambda transitions,
+                "glushkov" for the position automaton, which has no lambda
+                transitions and one state per symbol occurrence, or "auto"
+                (the default) to use the minimal trie of literal
+                alternations and Thompson otherwise. Type: str
+            syntax: "kleene" or "re", see parse. Type: str
 
         Returns:
-            Automaton equivalent to the regex. Type: FiniteAutomaton
+            Automaton equivalent to the regex. Character classes are
+            transitions labelled with SymbolClass symbols. Type: FiniteAutomaton
 
         """
-        if not re_string:
-            return self._create_automaton_empty()
-        
-        rpn_string = _re_to_rpn(re_string)
+        if method not in ("auto", "thompson", "glushkov"):
+            raise ValueError(f"Unknown construction method: {method}")
+
+        if method == "auto":
+            words = _literal_words(re_string, syntax)
+            if words is not None and len(words) > 1:
+                return self.create_literal_automaton(words)
+
+        root = re_ast.expand(self.parse(re_string, syntax))
+        if method == "glushkov":
+            return self._create_position_automaton(root)
 
-        stack = []  # list of FiniteAutomatons
+        builder = type(self)()
+        return builder._to_automaton(builder._create_fragment(root))
+
+    def create_literal_automaton(self, words):
+        """
+        Create the minimal automaton of a list of words.
+
+        The words are inserted into a trie, which is already deterministic,
+        and the trie is minimized by merging, from the leaves up, the nodes
+        with the same finality and the same transitions. Since the trie is
+        acyclic this takes linear time, unlike the Thompson construction of
+        the alternation, whose lambda closures grow with the number of words.
+
+        Args:
+            words: Words of the language. Type: iterable[str]
+
+        Returns:
+            Minimal deterministic automaton that accepts exactly the words. Type: FiniteAutomaton
+
+        """
+        # Trie: each node maps symbols to children; None marks the end of a word
+        root = {}
+        for word in words:
+            node = root
+            for symbol in word:
+                child = node.get(symbol)
+                if child is None:
+                    child = node[symbol] = {}
+                node = child
+            node[None] = True
+
+        nodes = [root]
+        for node in nodes:
+            nodes.extend(child for symbol, child in node.items() if symbol is not None)
+
+        # Children come after their parents, so they are merged first
+        register = {}  # (final, transitions) -> state
+        state_of = {}
+        for node in reversed(nodes):
+            signature = (None in node, frozenset(
+                (symbol, state_of[id(child)]) for symbol, child in node.items() if symbol is not None
+            ))
+            state = register.get(signature)
+            if state is None:
+                state = register[signature] = len(register)
+            state_of[id(node)] = state
+
+        initial = state_of[id(root)]
+        names = {initial: "q0"}
+        for state in range(len(register)):
+            if state != initial:
+                names[state] = f"q{len(names)}"
+
+        symbols = set()
+        transitions = {}
+        final_states = set()
+        for (final, edges), state in register.items():
+            if final:
+                final_states.add(names[state])
+            if edges:
+                transitions[names[state]] = {symbol: {names[end]} for symbol, end in edges}
+                symbols.update(symbol for symbol, _ in edges)
+
+        return FiniteAutomaton("q0", list(names.values()), symbols, transitions, final_states)
+
+    def create_counting_automaton(
+        self,
+        re_string,
+        syntax="re",
+        max_expand=16,
+    ):
+        """
+        Create an automaton with bounded counters from a regex.
+
+        Repetitions r{m,n} whose bound (n, or m if there is no upper bound)
+        is at most max_expand are expanded as in create_automaton. Larger ones
+        become a single fragment for r driven by a counter, so the size of the
+        automaton does not depend on the bounds.
+
+        Args:
+            re_string: String with the regular expression. Type: str
+            syntax: "re" or "kleene", see parse. Type: str
+            max_expand: Largest repetition bound that is expanded. Type: int
+
+        Returns:
+            Automaton equivalent to the regex. Type: CountingAutomaton
+
+        """
+        root = re_ast.expand(self.parse(re_string, syntax), max_expand)
+        builder = type(self)()
+        fragment = builder._create_fragment(root)
+
+        automaton = builder._to_automaton(fragment)
+        counter_transitions = {}
+        for start, edges in builder._counter_transitions.items():
+            counter_transitions[f"q{start}"] = [(f"q{end}", counter, operation)
+                                               for end, counter, operation in edges]
+        return CountingAutomaton(automaton.initial_state, automaton.states, automaton.symbols,
+                                 automaton.transitions, automaton.final_states,
+                                 builder._counters, counter_transitions)
+
+    def create_tagged_automaton(self, re_string):
+        """
+        Create an automaton that records the capture groups of a regex.
+
+        The regex uses the extended syntax (see parse), where ( ) is a
+        capturing group and (?: ) is not. The tagged automaton is built from
+        an ordered tree that keeps the order of the alternatives, so its
+        groups are those of re.fullmatch(re_string, ...).groups(). Strings are
+        first checked with the compiled table of the equivalent automaton.
+
+        Args:
+            re_string: String with the regular expression. Type: str
+
+        Returns:
+            Automaton with capture groups. Type: TaggedAutomaton
+
+        """
+        parser = _ExtendedParser(re_string, ast=OrderedAST, captures=True)
+        root = parser.parse()
+        automaton = self.create_automaton(re_string, method="glushkov", syntax="re")
+        return TaggedAutomaton(root, parser.groups, automaton)
+
+    def _create_automaton_repeat(self, A, low, high):
+        """
+        Create an automaton with a counter that repeats another.
+
+        Args:
+            automaton: Fragment to repeat. Type: tuple[int, int]
+            low: Minimum number of repetitions. Type: int
+            high: Maximum number of repetitions, or None. Type: int
+
+        Returns:
+            Fragment that accepts between low and high repetitions. Type: tuple[int, int]
+
+        """
+        counter = len(self._counters)
+        self._counters.append((low, high))
+
+        qi, qf = self._new_state(), self._new_state()
+        self._counter_transitions.setdefault(qi, []).append((A[0], counter, counting_automaton.ENTER))
+        self._counter_transitions.setdefault(A[1], []).extend([
+            (A[0], counter, counting_automaton.REPEAT),
+            (qf, counter, counting_automaton.EXIT),
+        ])
+        if low == 0:
+            self._add_transition(qi, None, qf)
+        return qi, qf
+
+    def _create_fragment(self, root):
+        """
+        Build the Thompson fragment of a regex in the shared transitions store.
+
+        Args:
+            root: Root of the abstract syntax tree of the regex. Type: re_ast.Node
+
+        Returns:
+            Fragment equivalent to the regex. Type: tuple[int, int]
+
+        """
         self.state_counter = 0
-        for x in rpn_string:
-            if x == "*":
+        self._transitions = {}
+        self._symbols = set()
+        self._counters = []
+        self._counter_transitions = {}
+
+        alphabet = _alphabet(root)
+        stack = []  # list of fragments (initial state, final state)
+        for node in re_ast.postorder(root):
+            op = node.op
+            if op == re_ast.REPEAT:
+                aut = stack.pop()
+                stack.append(self._create_automaton_repeat(aut, node.args[1], node.args[2]))
+            elif op == re_ast.STAR:
                 aut = stack.pop()
                 stack.append(self._create_automaton_star(aut))
-            elif x == "+":
-                aut2 = stack.pop()
-                aut1 = stack.pop()
-                stack.append(self._create_automaton_union(aut1, aut2))
-            elif x == ".":
+            elif op == re_ast.UNION:
+                auts = stack[-len(node.args):]
+                del stack[-len(node.args):]
+                stack.append(self._create_automaton_union(*auts))
+            elif op == re_ast.CONCAT:
                 aut2 = stack.pop()
                 aut1 = stack.pop()
                 stack.append(self._create_automaton_concat(aut1, aut2))
-            elif x == "λ":
+            elif op == re_ast.LAMBDA:
                 stack.append(self._create_automaton_lambda())
+            elif op == re_ast.EMPTY:
+                stack.append(self._create_automaton_empty())
+            elif op == re_ast.SYMBOL or op == re_ast.CLASS:
+                stack.append(self._create_automaton_symbol(*alphabet[node]))
             else:
-                stack.append(self._create_automaton_symbol(x))
+                raise ValueError("Intersection and complement are only supported by DerivativeMatcher")
+
+        return stack.pop()
+
+
+def compile_many(patterns, workers=None, syntax="kleene", split_alternatives=False, chunksize=1):
+    """
+    Compile many regexes to the tables of their minimal DFAs.
+
+    Each regex is built with the Glushkov construction, determinized,
+    minimized and compiled, spreading the regexes across workers processes.
+    With split_alternatives, the top-level alternatives of each regex are
+    compiled as separate tasks, which spreads the subset construction of a
+    large alternation across the pool, and their tables are combined
+    afterwards with a product construction and minimized again.
+
+    Args:
+        patterns: Regular expressions to compile. Type: iterable[str]
+        workers: Number of processes. If None or 1, the regexes are compiled
+            in the current process. Type: int
+        syntax: "kleene" or "re", see REParser.parse. Type: str
+        split_alternatives: Compile top-level alternatives separately. Type: bool
+        chunksize: Tasks sent to a process at a time. Type: int
+
+    Returns:
+        Compiled minimal DFA of each regex, in order. Type: list[CompiledAutomaton]
+
+    """
+    patterns = list(patterns)
+    if split_alternatives:
+        branches = [_split_alternatives(pattern, syntax) for pattern in patterns]
+    else:
+        branches = [[pattern] for pattern in patterns]
+    tasks = [(branch, syntax) for alternatives in branches for branch in alternatives]
+
+    if not workers or workers <= 1:
+        results = [_compile_pattern(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_compile_pattern, tasks, chunksize=chunksize))
+
+    compiled = []
+    position = 0
+    for alternatives in branches:
+        parts = results[position:position + len(alternatives)]
+        position += len(alternatives)
+        compiled.append(parts[0] if len(parts) == 1 else _union_compiled(parts))
+    return compiled
+
+
+def _compile_pattern(task):
+    """Compile one (regex, syntax) task of compile_many."""
+    re_string, syntax = task
+    automaton = REParser().create_automaton(re_string, method="glushkov", syntax=syntax)
+    return automaton.to_deterministic().to_minimized().compile()
+
+
+def _split_alternatives(re_string, syntax):
+    """
+    Split a regex into its top-level alternatives.
+
+    Only the "+" (or "|", in the re syntax) outside parentheses, character
+    classes and escapes separate alternatives. Regexes with unbalanced
+    parentheses are not split, so that errors are reported for the whole
+    regex.
+
+    Args:
+        re_string: Regular expression. Type: str
+        syntax: "kleene" or "re". Type: str
+
+    Returns:
+        Top-level alternatives. Type: list[str]
+
+    """
+    extended = syntax == "re"
+    separator = "|" if extended else "+"
+    alternatives = []
+    depth = 0
+    start = 0
+    pos = 0
+    while pos < len(re_string):
+        x = re_string[pos]
+        if extended and x == "\\":
+            pos += 1
+        elif extended and x == "[":
+            pos += 1
+            if pos < len(re_string) and re_string[pos] == "]":
+                # A "]" right after "[" is a literal
+                pos += 1
+            while pos < len(re_string) and re_string[pos] != "]":
+                pos += 2 if re_string[pos] == "\\" else 1
+        elif x == "(":
+            depth += 1
+        elif x == ")":
+            depth -= 1
+            if depth < 0:
+                return [re_string]
+        elif x == separator and depth == 0:
+            alternatives.append(re_string[start:pos])
+            start = pos + 1
+        pos += 1
+
+    if depth != 0:
+        return [re_string]
+    alternatives.append(re_string[start:])
+    return alternatives
+
+
+def _union_compiled(automata):
+    """
+    Combine compiled DFAs into the minimal DFA of their union.
+
+    The product construction runs over the coarsest symbols that every
+    automaton tells apart: characters are grouped by the column they have in
+    each table.
+
+    Args:
+        automata: Compiled DFAs. Type: list[CompiledAutomaton]
+
+    Returns:
+        Compiled minimal DFA of the union. Type: CompiledAutomaton
+
+    """
+    groups = {}
+    for automaton in automata:
+        for char in automaton.symbol_index:
+            if isinstance(char, str) and char not in groups:
+                groups[char] = tuple(other.symbol_index.get(char, -1) for other in automata)
+    signatures = {}
+    for char, signature in groups.items():
+        signatures.setdefault(signature, []).append(char)
+    labels = [(chars[0] if len(chars) == 1 else SymbolClass(chars), signature)
+              for signature, chars in signatures.items()]
+
+    initial = tuple(automaton.initial_state for automaton in automata)
+    names = {initial: "q0"}
+    transitions = {}
+    final_states = set()
+    pending = [initial]
+    while pending:
+        states = pending.pop()
+        name = names[states]
+        if any(automaton.is_final(state) for automaton, state in zip(automata, states)):
+            final_states.add(name)
 
-        A = stack.pop()
+        edges = transitions[name] = {}
+        for label, signature in labels:
+            goal = tuple(
+                automaton.table[state * automaton.n_symbols + column] if state >= 0 and column >= 0 else -1
+                for automaton, state, column in zip(automata, states, signature)
+            )
+            if goal.count(-1) == len(goal):
+                continue
+            if goal not in names:
+                names[goal] = f"q{len(names)}"
+                pending.append(goal)
+            edges[label] = {names[goal]}
 
-        return A
+    automaton = FiniteAutomaton("q0", list(names.values()), {label for label, _ in labels},
+                                transitions, final_states)
+    return automaton.to_minimized().compile()
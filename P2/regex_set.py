@@ -0,0 +1,239 @@
+"""
+Módulo para evaluar muchas expresiones regulares a la vez.
+
+Un RegexSet une los autómatas de todas las expresiones en un único AFD cuyos
+estados llevan como etiqueta el conjunto de expresiones que aceptan la cadena
+leída hasta ese punto. Así, un único recorrido de la entrada indica qué
+expresiones la aceptan, y el coste por símbolo no crece con el número de
+expresiones.
+
+Las etiquetas se conservan en la construcción de subconjuntos (la etiqueta de
+un subconjunto es la unión de las de sus estados finales) y en la
+minimización, que parte de la partición de los estados por su etiqueta, de
+modo que nunca se fusionan estados con etiquetas distintas.
+"""
+
+from array import array
+from collections import deque
+
+from automaton import FiniteAutomaton, SymbolClass, _hopcroft
+from re_parser import REParser
+
+
+class RegexSet:
+    """
+    Conjunto de expresiones regulares evaluado con un único AFD etiquetado.
+
+    Attributes:
+        patterns (list[str]): Expresiones del conjunto; el identificador de
+            cada una es su posición en la lista.
+        symbols (list): Símbolo de cada columna de la tabla.
+        n_states (int): Número de estados vivos del AFD mínimo.
+    """
+
+    def __init__(self, patterns, syntax="kleene"):
+        """
+        Construye el AFD etiquetado de un conjunto de expresiones.
+
+        Args:
+            patterns (iterable[str]): Expresiones regulares.
+            syntax (str, optional): "kleene" (por defecto) o "re", ver
+                REParser.parse().
+        """
+        self.patterns = list(patterns)
+
+        parser = REParser()
+        automata = [parser.create_automaton(pattern, method="glushkov", syntax=syntax)
+                    for pattern in self.patterns]
+        self.symbols, self._table, self._tags, self._symbol_index = _tagged_dfa(automata)
+        self.n_states = len(self._tags)
+        self._initial = 0 if self._tags else -1
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def matches(self, cadena):
+        """
+        Calcula qué expresiones aceptan una cadena, con un único recorrido.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            set[int]: Identificadores de las expresiones que aceptan la cadena.
+        """
+        s = self._initial
+        if s < 0:
+            return set()
+
+        table = self._table
+        n = len(self.symbols)
+        get = self._symbol_index.get
+        for c in cadena:
+            col = get(c)
+            if col is None:
+                return set()
+            s = table[s * n + col]
+            if s < 0:
+                return set()
+        return set(self._tags[s])
+
+    def is_match(self, cadena):
+        """
+        Indica si alguna expresión del conjunto acepta una cadena.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            bool: True si alguna expresión acepta la cadena.
+        """
+        return bool(self.matches(cadena))
+
+
+def _tagged_dfa(automata, label=frozenset):
+    """
+    AFD mínimo etiquetado de la unión de varios autómatas.
+
+    La etiqueta de cada estado es label(ids), donde ids es el conjunto de
+    índices de los autómatas que aceptan la cadena leída hasta él. La
+    minimización parte de la partición por etiquetas y solo se conservan los
+    estados desde los que se llega a alguno cuya etiqueta no es
+    label(frozenset()), numerados en orden BFS desde el inicial (el 0).
+
+    Args:
+        automata (list[FiniteAutomaton]): Autómatas a unir.
+        label (callable, optional): Función de los conjuntos de índices a
+            las etiquetas. Por defecto, el propio conjunto.
+
+    Returns:
+        tuple: (símbolos de las columnas, tabla array('i') con -1 como estado
+        muerto, etiqueta de cada estado, diccionario {símbolo: columna}).
+    """
+    union, owner = _tagged_union(automata)
+
+    # Construcción de subconjuntos y minimización con las etiquetas como
+    # partición inicial
+    symbols, subsets, delta = union._subset_construction()
+    tags = [label(frozenset(owner[state] for state in subset if state in owner)) for subset in subsets]
+    block_of = _hopcroft(delta, len(symbols), tags)
+
+    # Tabla compacta de los bloques vivos (los que llegan a alguna etiqueta)
+    block_delta = {}
+    block_tags = {}
+    for state, block in enumerate(block_of):
+        if block not in block_delta:
+            block_delta[block] = [block_of[t] for t in delta[state]]
+            block_tags[block] = tags[state]
+    live = _live(block_delta, block_tags, label(frozenset()))
+
+    index = {}
+    queue = deque()
+    initial = block_of[0]
+    if initial in live:
+        index[initial] = 0
+        queue.append(initial)
+    order = []
+    while queue:
+        block = queue.popleft()
+        order.append(block)
+        for t in block_delta[block]:
+            if t in live and t not in index:
+                index[t] = len(index)
+                queue.append(t)
+
+    n = len(symbols)
+    table = array('i', [-1]) * (len(order) * n)
+    for i, block in enumerate(order):
+        for col, t in enumerate(block_delta[block]):
+            if t in index:
+                table[i * n + col] = index[t]
+
+    symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+    for i, symbol in enumerate(symbols):
+        if isinstance(symbol, SymbolClass):
+            for char in symbol:
+                symbol_index[char] = i
+    return symbols, table, [block_tags[block] for block in order], symbol_index
+
+
+def _tagged_union(automata):
+    """
+    Une varios autómatas en un AFN con un estado inicial nuevo.
+
+    Los estados de cada autómata se renombran con su índice como prefijo y
+    los símbolos se sustituyen por los átomos comunes (ver _common_symbols).
+
+    Returns:
+        tuple[FiniteAutomaton, dict]: AFN unión y diccionario
+        {estado final: índice del autómata al que pertenece}.
+    """
+    atoms = _common_symbols(automata)
+    initial = "init"
+    states = [initial]
+    transitions = {initial: {None: set()}}
+    owner = {}
+
+    for i, automaton in enumerate(automata):
+        names = {state: f"{i}:{state}" for state in automaton.states}
+        states.extend(names.values())
+        transitions[initial][None].add(names[automaton.initial_state])
+        for state in automaton.final_states:
+            owner[names[state]] = i
+
+        for state, edges in automaton.transitions.items():
+            renamed = transitions.setdefault(names[state], {})
+            for symbol, end_states in edges.items():
+                for atom in atoms[symbol] if symbol is not None else (None,):
+                    renamed.setdefault(atom, set()).update(names[end] for end in end_states)
+
+    symbols = {atom for labels in atoms.values() for atom in labels}
+    return FiniteAutomaton(initial, states, symbols, transitions, set(owner)), owner
+
+
+def _common_symbols(automata):
+    """
+    Átomos comunes a los alfabetos de varios autómatas.
+
+    Cada autómata agrupa los caracteres en sus propias clases (SymbolClass);
+    los caracteres se reparten en átomos según la clase a la que pertenecen
+    en cada autómata, de modo que cada símbolo de cada autómata es una unión
+    de átomos.
+
+    Returns:
+        dict: Diccionario {símbolo: conjunto de átomos que lo forman}.
+    """
+    signature = {}
+    for i, automaton in enumerate(automata):
+        for symbol in automaton.symbols:
+            for char in (symbol if isinstance(symbol, SymbolClass) else (symbol,)):
+                signature.setdefault(char, {})[i] = symbol
+
+    groups = {}
+    for char, classes in signature.items():
+        groups.setdefault(tuple(classes.items()), []).append(char)
+
+    atoms = {}
+    for key, chars in groups.items():
+        atom = chars[0] if len(chars) == 1 else SymbolClass(chars)
+        for _, symbol in key:
+            atoms.setdefault(symbol, set()).add(atom)
+    return atoms
+
+
+def _live(delta, tags, none):
+    """Bloques desde los que se llega a alguno con etiqueta distinta de none."""
+    inverse = {}
+    for block, row in delta.items():
+        for t in row:
+            inverse.setdefault(t, set()).add(block)
+
+    live = {block for block, tag in tags.items() if tag != none}
+    queue = deque(live)
+    while queue:
+        block = queue.popleft()
+        for prev_block in inverse.get(block, ()):
+            if prev_block not in live:
+                live.add(prev_block)
+                queue.append(prev_block)
+    return live
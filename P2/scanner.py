@@ -0,0 +1,103 @@
+"""
+Módulo para recorrer ficheros y buffers binarios con autómatas compilados.
+
+Los autómatas se ejecutan sobre su tabla compilada a bytes (ver
+CompiledAutomaton.encode()), de modo que los datos nunca se decodifican ni se
+copian a cadenas de Python: las líneas se recorren como vistas (memoryview) del
+buffer original, y los ficheros se proyectan en memoria con mmap.
+"""
+
+import mmap
+
+from automaton import CompiledAutomaton
+
+
+def scan_lines(automaton, buffer, only_accepted=False):
+    """
+    Evalúa cada línea de un buffer binario.
+
+    Las líneas se separan por b"\\n", que no forma parte de la línea. Si el
+    buffer termina en salto de línea no se produce una línea vacía final.
+
+    Args:
+        automaton (FiniteAutomaton | CompiledAutomaton): Autómata a ejecutar.
+        buffer (bytes | bytearray | memoryview | mmap.mmap): Datos a recorrer.
+        only_accepted (bool, optional): Si es True, solo se devuelven las
+            líneas aceptadas. Por defecto False.
+
+    Yields:
+        tuple[int, int, bool]: (inicio, fin, aceptada) de cada línea, con
+        posiciones en bytes relativas al buffer; fin es exclusivo.
+    """
+    compiled = _byte_automaton(automaton)
+    view = memoryview(buffer).cast("B")
+    run = compiled.run
+    is_final = compiled.is_final
+    size = len(view)
+
+    if hasattr(buffer, "find") and not isinstance(buffer, memoryview):
+        # Los saltos de línea se buscan con find() (en C) y cada línea se
+        # evalúa sobre una vista sin copia
+        start = 0
+        while start < size:
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                end = size
+            accepted = is_final(run(view[start:end]))
+            if accepted or not only_accepted:
+                yield start, end, accepted
+            start = end + 1
+        return
+
+    # memoryview arbitraria: un único recorrido byte a byte
+    table = compiled.table
+    finals = compiled.finals
+    n = compiled.n_symbols
+    column = compiled.symbol_index
+    initial = compiled.initial_state
+    state = initial
+    start = 0
+    for i, byte in enumerate(view):
+        if byte == 10:
+            accepted = state >= 0 and (finals[state >> 3] >> (state & 7)) & 1 == 1
+            if accepted or not only_accepted:
+                yield start, i, accepted
+            state = initial
+            start = i + 1
+        elif state >= 0:
+            col = column.get(byte)
+            state = -1 if col is None else table[state * n + col]
+    if start < size:
+        accepted = is_final(state)
+        if accepted or not only_accepted:
+            yield start, size, accepted
+
+
+def scan_file(automaton, path, only_accepted=False):
+    """
+    Evalúa cada línea de un fichero proyectándolo en memoria con mmap.
+
+    Args:
+        automaton (FiniteAutomaton | CompiledAutomaton): Autómata a ejecutar.
+        path (str): Ruta del fichero.
+        only_accepted (bool, optional): Si es True, solo se devuelven las
+            líneas aceptadas. Por defecto False.
+
+    Yields:
+        tuple[int, int, bool]: (inicio, fin, aceptada) de cada línea, con
+        posiciones en bytes desde el principio del fichero.
+    """
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Fichero vacío: no se puede proyectar y no tiene líneas
+        with data:
+            yield from scan_lines(automaton, data, only_accepted)
+
+
+def _byte_automaton(automaton):
+    """Tabla compilada sobre bytes de un FiniteAutomaton o CompiledAutomaton."""
+    if isinstance(automaton, CompiledAutomaton):
+        return automaton if automaton.byte_level else automaton.encode()
+    return automaton._engine("bytes")
@@ -0,0 +1,425 @@
+"""
+Módulo para buscar las apariciones de un autómata dentro de un texto.
+
+Las búsquedas usan la semántica leftmost-longest (POSIX): de las apariciones
+que empiezan más a la izquierda se elige la más larga. A partir de la tabla
+compilada del autómata se obtienen tres tablas deterministas:
+
+- la propia tabla (anclada), que desde un inicio dado encuentra el final de
+  la aparición más larga;
+- la tabla no anclada de Σ*·L, que encuentra el final de la primera aparición;
+- la tabla no anclada del reverso, Σ*·reverso(L), que se ejecuta de derecha a
+  izquierda y marca en un solo recorrido todas las posiciones en las que
+  empieza alguna aparición.
+
+Las dos tablas no ancladas se construyen bajo demanda, como en LazyDFA: cada
+transición se calcula la primera vez que un recorrido llega a ella, así que
+el coste de una búsqueda es lineal aunque el AFD completo sea exponencial.
+
+Un prefiltro (ver prefilter.py) descarta con find() los textos que no
+contienen el literal obligatorio del autómata. Si además se conocen los
+símbolos con los que empieza toda aparición, la tabla no anclada salta con
+find() hasta el siguiente de ellos mientras no hay ninguna aparición en curso,
+y el inicio de la primera aparición se busca solo entre los candidatos
+anteriores a su final; si hay demasiados candidatos fallidos, o no hay
+prefiltro, se usa el recorrido inverso, que es lineal.
+
+Los textos pueden ser str o bytes, bytearray, memoryview o mmap; para estos
+últimos se usa la tabla sobre bytes UTF-8 (ver CompiledAutomaton.encode()) y
+las posiciones se cuentan en bytes.
+"""
+
+from array import array
+
+from prefilter import Prefilter
+
+
+class Match:
+    """
+    Aparición de un autómata en un texto.
+
+    Attributes:
+        string (str | bytes | bytearray | memoryview): Texto en el que se buscó.
+    """
+
+    __slots__ = ("string", "_start", "_end")
+
+    def __init__(self, string, start, end):
+        self.string = string
+        self._start = start
+        self._end = end
+
+    def start(self):
+        """int: Posición en la que empieza la aparición."""
+        return self._start
+
+    def end(self):
+        """int: Posición siguiente al final de la aparición."""
+        return self._end
+
+    def span(self):
+        """tuple[int, int]: (inicio, fin) de la aparición."""
+        return self._start, self._end
+
+    def group(self):
+        """Fragmento del texto que forma la aparición."""
+        return self.string[self._start:self._end]
+
+    def __repr__(self):
+        return f"<Match span={self.span()!r} match={self.group()!r}>"
+
+
+class Searcher:
+    """
+    Buscador leftmost-longest sobre la tabla compilada de un autómata.
+
+    Las tablas derivadas se crean la primera vez que se busca en un texto de
+    cada tipo (str o bytes) y se reutilizan en las búsquedas siguientes; las
+    transiciones que ya se han calculado se conservan entre búsquedas.
+
+    Attributes:
+        compiled (CompiledAutomaton): Tabla compilada del autómata.
+    """
+
+    def __init__(self, compiled):
+        """
+        Inicializa el buscador.
+
+        Args:
+            compiled (CompiledAutomaton): Tabla compilada del autómata.
+        """
+        self.compiled = compiled
+        self._levels = {}
+
+    def search(self, text, pos=0, endpos=None):
+        """
+        Busca la primera aparición (leftmost-longest) en un texto.
+
+        Args:
+            text (str | bytes | bytearray | memoryview): Texto.
+            pos (int, optional): Posición en la que empieza la búsqueda.
+            endpos (int, optional): Posición en la que termina. Por defecto,
+                el final del texto.
+
+        Returns:
+            Match | None: La aparición, o None si no hay ninguna.
+        """
+        return next(self.finditer(text, pos, endpos), None)
+
+    def finditer(self, text, pos=0, endpos=None):
+        """
+        Recorre las apariciones sin solapamiento de un texto, de izquierda a derecha.
+
+        Tras una aparición, la búsqueda sigue en su final; tras una aparición
+        vacía, en la posición siguiente, como en re.finditer().
+
+        Args:
+            text (str | bytes | bytearray | memoryview): Texto.
+            pos (int, optional): Posición en la que empieza la búsqueda.
+            endpos (int, optional): Posición en la que termina. Por defecto,
+                el final del texto.
+
+        Yields:
+            Match: Cada aparición, en orden.
+        """
+        view, forward, unanchored, reverse, prefilter, source, endpos = self._prepare(text, endpos)
+        starts = None  # Mapa de inicios del recorrido inverso, desde base
+        base = pos
+        while pos <= endpos:
+            if starts is None:
+                if source is not None and prefilter.rejects(source, pos, endpos):
+                    return
+                found = None
+                if source is not None and prefilter.first is not None:
+                    first_end = _first_end(unanchored, view, pos, endpos, prefilter, source)
+                    if first_end < 0:
+                        return
+                    found = _verify(forward, view, pos, first_end, endpos, prefilter, source)
+                if found is None:
+                    # Sin símbolos iniciales que buscar, o demasiados candidatos
+                    # fallidos: se marcan todos los inicios con un único
+                    # recorrido inverso
+                    base = pos
+                    starts = _starts(reverse, view, pos, endpos, prefilter, source)
+            if starts is not None:
+                i = starts.find(1, pos - base)
+                if i < 0:
+                    return
+                found = base + i, _longest_end(forward, view, base + i, endpos)
+
+            start, end = found
+            yield Match(text, start, end)
+            pos = end if end > start else start + 1
+
+    def _prepare(self, text, endpos):
+        """
+        Vista del texto, tablas y prefiltro de su tipo, texto en el que se
+        puede usar find() (o None) y posición final de la búsqueda.
+        """
+        if isinstance(text, str):
+            view, level = text, "str"
+        else:
+            view, level = memoryview(text).cast("B"), "bytes"
+        source = text
+        if isinstance(text, memoryview):
+            # Una vista solo se puede buscar con find() a través del objeto
+            # que la respalda, si la vista lo cubre entero
+            source = text.obj
+            if not (text.c_contiguous and hasattr(source, "find") and len(source) == text.nbytes):
+                source = None
+
+        tables = self._levels.get(level)
+        if tables is None:
+            compiled = self.compiled
+            if level == "bytes" and not compiled.byte_level:
+                compiled = compiled.encode()
+            tables = self._levels[level] = (
+                (compiled.initial_state, compiled.table, compiled.finals,
+                 compiled.n_symbols, compiled.symbol_index),
+                _SubsetTable(compiled, reverse=False),
+                _SubsetTable(compiled, reverse=True),
+                Prefilter(compiled),
+            )
+
+        size = len(view)
+        endpos = size if endpos is None else min(endpos, size)
+        return (view,) + tables + (source, endpos)
+
+
+class _SubsetTable:
+    """
+    AFD no anclado de Σ*·L o Σ*·reverso(L), construido bajo demanda.
+
+    El reverso se obtiene invirtiendo las transiciones de la tabla: sus
+    estados iniciales son los finales de la tabla y su estado final es el
+    inicial. Como el autómata no está anclado, los estados iniciales se
+    añaden a cada subconjunto; los símbolos que no están en el alfabeto
+    llevan al subconjunto inicial.
+
+    Como en LazyDFA, cada transición se calcula la primera vez que un
+    recorrido llega a ella y se guarda en la tabla (-1 marca las que aún no
+    se han calculado), de modo que una búsqueda nunca construye más estados
+    que símbolos recorre. Si la caché llega a max_states estados, se vacía y
+    se sigue desde el estado actual.
+
+    Attributes:
+        initial (int): Estado inicial (siempre 0).
+        table (array): Tabla de transiciones, fila a fila.
+        finals (bytearray): Mapa de bits de los estados finales.
+        n (int): Número de símbolos (columnas).
+        column (dict): Diccionario {símbolo: columna}.
+        max_states (int): Número máximo de estados en caché.
+        flushes (int): Número de vaciados de la caché.
+    """
+
+    def __init__(self, compiled, reverse, max_states=4096):
+        """
+        Inicializa la tabla con solo el subconjunto inicial.
+
+        Args:
+            compiled (CompiledAutomaton): Tabla compilada del autómata.
+            reverse (bool): Si se construye el AFD del reverso.
+            max_states (int, optional): Número máximo de estados en caché.
+                Por defecto 4096.
+        """
+        n = compiled.n_symbols
+        self.initial = 0
+        self.table = array('i')
+        self.finals = bytearray()
+        self.n = n
+        self.column = compiled.symbol_index
+        self.max_states = max_states
+        self.flushes = 0
+
+        self._compiled = compiled
+        self._inverse = None
+        if reverse:
+            table = compiled.table
+            self._inverse = inverse = {}
+            for s in range(compiled.n_states):
+                for col in range(n):
+                    t = table[s * n + col]
+                    if t >= 0:
+                        inverse.setdefault(t * n + col, []).append(s)
+            initial = frozenset(s for s in range(compiled.n_states) if compiled.is_final(s))
+        else:
+            initial = frozenset([compiled.initial_state]) - {-1}
+        self._initial_subset = initial
+        self._index = {}
+        self._subsets = []
+        self._add(initial)
+
+    def step(self, s, col):
+        """Estado alcanzable desde s con la columna col, calculándolo si hace falta."""
+        n = self.n
+        subset = self._subsets[s]
+        if self._inverse is not None:
+            inverse = self._inverse
+            goal = {r for t in subset for r in inverse.get(t * n + col, ())}
+        else:
+            table = self._compiled.table
+            goal = {table[r * n + col] for r in subset}
+            goal.discard(-1)
+        goal = self._initial_subset.union(goal)
+
+        t = self._index.get(goal)
+        if t is None:
+            if len(self._subsets) >= self.max_states:
+                # La fila de s desaparece con la caché: no se guarda la transición
+                self.flush()
+                return 0 if goal == self._initial_subset else self._add(goal)
+            t = self._add(goal)
+        self.table[s * n + col] = t
+        return t
+
+    def flush(self):
+        """Vacía la caché, conservando solo el estado inicial sin transiciones."""
+        self.table[:] = array('i', [-1]) * self.n
+        del self.finals[1:]
+        self.finals[0] &= 1
+        self._index = {self._initial_subset: 0}
+        self._subsets = [self._initial_subset]
+        self.flushes += 1
+
+    def _add(self, subset):
+        """Añade el estado de un subconjunto, sin transiciones calculadas."""
+        s = len(self._subsets)
+        self._index[subset] = s
+        self._subsets.append(subset)
+        self.table.extend(array('i', [-1]) * self.n)
+        if s & 7 == 0:
+            self.finals.append(0)
+        if self._inverse is not None:
+            final = self._compiled.initial_state in subset
+        else:
+            final = any(self._compiled.is_final(r) for r in subset)
+        if final:
+            self.finals[s >> 3] |= 1 << (s & 7)
+        return s
+
+
+def _first_end(tables, view, pos, endpos, prefilter, source):
+    """
+    Final de la primera aparición que termina en [pos, endpos], o -1.
+
+    En el estado inicial, los símbolos que no pueden empezar una aparición
+    no cambian el estado, así que se saltan con prefilter.next_first().
+    """
+    initial, table, finals, n = tables.initial, tables.table, tables.finals, tables.n
+    get = tables.column.get
+    step = tables.step
+    s = initial
+    if (finals[s >> 3] >> (s & 7)) & 1:
+        return pos
+    skip = source is not None and prefilter.first is not None
+    i = pos
+    while i < endpos:
+        if s == initial and skip:
+            i = prefilter.next_first(source, i, endpos)
+            if i == endpos:
+                break
+        col = get(view[i])
+        if col is None:
+            s = initial
+        else:
+            t = table[s * n + col]
+            s = t if t >= 0 else step(s, col)
+        i += 1
+        if (finals[s >> 3] >> (s & 7)) & 1:
+            return i
+    return -1
+
+
+def _verify(tables, view, pos, first_end, endpos, prefilter, source):
+    """
+    Aparición leftmost-longest que empieza en [pos, first_end].
+
+    La primera aparición termina en first_end, así que la que empieza más a
+    la izquierda lo hace antes. Se prueban los candidatos de izquierda a
+    derecha (solo los que tienen un símbolo inicial, si hay prefiltro) con la
+    tabla anclada, hasta un presupuesto de símbolos recorridos en los
+    intentos fallidos proporcional a la ventana.
+
+    Returns:
+        tuple[int, int] | None: (inicio, fin) de la aparición, o None si se
+        agota el presupuesto.
+    """
+    initial, table, finals, n, column = tables
+    get = column.get
+    skip = source is not None and prefilter.first is not None
+    budget = 4 * (first_end - pos) + 64
+    start = pos
+    while start <= first_end:
+        if skip:
+            start = prefilter.next_first(source, start, first_end + 1)
+        s = initial
+        end = start if (finals[s >> 3] >> (s & 7)) & 1 else -1
+        i = start
+        while i < endpos:
+            col = get(view[i])
+            if col is None:
+                break
+            s = table[s * n + col]
+            if s < 0:
+                break
+            i += 1
+            if (finals[s >> 3] >> (s & 7)) & 1:
+                end = i
+        if end >= 0:
+            return start, end
+        budget -= i - start + 1
+        if budget < 0:
+            return None
+        start += 1
+    return None
+
+
+def _starts(tables, view, pos, endpos, prefilter, source):
+    """
+    Mapa de las posiciones de [pos, endpos] en las que empieza alguna aparición.
+
+    En el estado inicial, los símbolos que no pueden terminar una aparición
+    no cambian el estado, así que se saltan con prefilter.previous_last().
+    """
+    initial, table, finals, n = tables.initial, tables.table, tables.finals, tables.n
+    get = tables.column.get
+    step = tables.step
+    starts = bytearray(endpos - pos + 1)
+    s = initial
+    starts[endpos - pos] = (finals[s >> 3] >> (s & 7)) & 1
+    skip = source is not None and prefilter.last is not None
+    i = endpos - 1
+    while i >= pos:
+        if s == initial and skip:
+            i = prefilter.previous_last(source, pos, i + 1)
+            if i < 0:
+                break
+        col = get(view[i])
+        if col is None:
+            s = initial
+        else:
+            t = table[s * n + col]
+            s = t if t >= 0 else step(s, col)
+        if (finals[s >> 3] >> (s & 7)) & 1:
+            starts[i - pos] = 1
+        i -= 1
+    return starts
+
+
+def _longest_end(tables, view, start, endpos):
+    """Final de la aparición más larga que empieza en start, o -1."""
+    s, table, finals, n, column = tables
+    get = column.get
+    if s < 0:
+        return -1
+    end = start if (finals[s >> 3] >> (s & 7)) & 1 else -1
+    for i in range(start, endpos):
+        col = get(view[i])
+        if col is None:
+            break
+        s = table[s * n + col]
+        if s < 0:
+            break
+        if (finals[s >> 3] >> (s & 7)) & 1:
+            end = i + 1
+    return end
@@ -0,0 +1,402 @@
+"""
+Módulo para extraer los grupos de captura de una expresión regular.
+
+Un autómata con etiquetas (tagged NFA) es un AFN de Thompson cuyas
+transiciones lambda pueden llevar una etiqueta: al pasar por ella se guarda
+la posición actual de la entrada en un registro. Cada grupo de captura i usa
+dos registros, 2i y 2i+1, con su inicio y su final (el grupo 0 es la cadena
+entera).
+
+El AFN se simula como en una máquina de Pike: todos los hilos avanzan a la
+vez, un símbolo en cada paso, y cada hilo lleva sus propios registros. Como
+las alternativas y las repeticiones se recorren en orden de prioridad (la
+primera alternativa antes que la segunda; repetir antes que salir de una
+repetición), de los hilos que llegan a un mismo estado solo sobrevive el de
+mayor prioridad, y el resultado es el mismo que daría re, sin su
+backtracking: el coste es lineal en la longitud de la cadena.
+
+Las repeticiones siguen la regla de re: una iteración opcional que no consume
+nada se acepta, con sus grupos, y termina la repetición. Para ello cada hilo
+lleva además el conjunto de repeticiones cuya iteración actual aún no ha
+consumido nada (ITER las añade al empezar una iteración opcional y consumir
+un carácter las vacía), y dos hilos en el mismo estado solo se funden si
+también coinciden en ese conjunto. Así un hilo de menor prioridad no puede
+ocupar la salida de una repetición antes que el de mayor prioridad.
+
+El AST hash-consed de re_ast ordena los operandos de las uniones, así que los
+autómatas con etiquetas se construyen a partir de un árbol ordenado
+(OrderedAST), que conserva el orden de las alternativas y los grupos.
+"""
+
+import re_ast
+from automaton import SymbolClass
+
+GROUP = "()"
+
+# Instrucciones del programa del autómata
+CHAR = "char"      # Consume un carácter del conjunto arg
+SPLIT = "split"    # Sigue a x y, con menor prioridad, a y
+JMP = "jmp"        # Sigue a x
+ITER = "iter"      # Empieza una iteración opcional de la repetición arg
+LOOP = "loop"      # Sigue a x o, si la iteración de la repetición arg no ha
+                   # consumido nada, sale de ella por y
+CLEAR = "clear"    # Sale de la repetición arg
+SAVE = "save"      # Guarda la posición actual en el registro arg
+MATCH = "match"    # Estado final
+
+
+class OrderedNode:
+    """
+    Nodo del árbol ordenado de una expresión regular.
+
+    Usa los mismos operadores que re_ast (más GROUP, cuyos operandos son la
+    expresión y el número del grupo), pero no simplifica ni reordena nada.
+    Los operandos de REPEAT son la expresión y los límites low y high.
+    """
+
+    __slots__ = ("op", "args")
+
+    def __init__(self, op, args):
+        self.op = op
+        self.args = args
+
+    def __repr__(self):
+        return f"OrderedNode({self.op!r}, {self.args!r})"
+
+
+class OrderedAST:
+    """
+    Constructores del árbol ordenado, con la misma interfaz que re_ast.
+    """
+
+    @staticmethod
+    def empty():
+        return OrderedNode(re_ast.EMPTY, ())
+
+    @staticmethod
+    def lambda_():
+        return OrderedNode(re_ast.LAMBDA, ())
+
+    @staticmethod
+    def symbol(x):
+        return OrderedNode(re_ast.SYMBOL, (x,))
+
+    @staticmethod
+    def char_class(chars):
+        return OrderedNode(re_ast.CLASS, (SymbolClass(chars),))
+
+    @staticmethod
+    def concat(a, b):
+        if b.op == re_ast.LAMBDA:
+            return a
+        if a.op == re_ast.LAMBDA:
+            return b
+        return OrderedNode(re_ast.CONCAT, (a, b))
+
+    @staticmethod
+    def union(*branches):
+        if len(branches) == 1:
+            return branches[0]
+        return OrderedNode(re_ast.UNION, branches)
+
+    @staticmethod
+    def star(a):
+        return OrderedNode(re_ast.STAR, (a,))
+
+    @staticmethod
+    def repeat(a, low, high):
+        if high == 0:
+            return OrderedAST.lambda_()
+        if low == high == 1:
+            return a
+        return OrderedNode(re_ast.REPEAT, (a, low, high))
+
+    @staticmethod
+    def group(a, index):
+        return OrderedNode(GROUP, (a, index))
+
+
+class TaggedMatch:
+    """
+    Resultado de un autómata con etiquetas, con la interfaz de re.Match.
+
+    Attributes:
+        string (str): Cadena evaluada.
+    """
+
+    __slots__ = ("string", "_registers")
+
+    def __init__(self, string, registers):
+        self.string = string
+        self._registers = registers
+
+    def span(self, index=0):
+        """tuple[int, int]: (inicio, fin) del grupo, o (-1, -1) si no participa."""
+        start, end = self._registers[2 * index], self._registers[2 * index + 1]
+        return (-1, -1) if start is None or end is None else (start, end)
+
+    def start(self, index=0):
+        """int: Inicio del grupo, o -1 si no participa."""
+        return self.span(index)[0]
+
+    def end(self, index=0):
+        """int: Final del grupo, o -1 si no participa."""
+        return self.span(index)[1]
+
+    def group(self, *indices):
+        """
+        Fragmentos de la cadena capturados por uno o varios grupos.
+
+        Args:
+            *indices (int): Números de los grupos. Por defecto, el grupo 0.
+
+        Returns:
+            str | None | tuple: El fragmento de cada grupo (None si no
+            participa); una tupla si se piden varios.
+        """
+        if len(indices) > 1:
+            return tuple(self.group(index) for index in indices)
+        start, end = self.span(indices[0] if indices else 0)
+        return None if start < 0 else self.string[start:end]
+
+    def groups(self, default=None):
+        """
+        Fragmentos capturados por todos los grupos, del 1 en adelante.
+
+        Args:
+            default (optional): Valor de los grupos que no participan.
+
+        Returns:
+            tuple: Fragmento de cada grupo.
+        """
+        result = []
+        for index in range(1, len(self._registers) // 2):
+            value = self.group(index)
+            result.append(default if value is None else value)
+        return tuple(result)
+
+    def __repr__(self):
+        return f"<TaggedMatch span={self.span()!r} match={self.group()!r}>"
+
+
+class TaggedAutomaton:
+    """
+    Autómata con etiquetas que registra los grupos de captura en un recorrido.
+
+    Attributes:
+        groups (int): Número de grupos de captura.
+        automaton (FiniteAutomaton | None): Autómata equivalente sin
+            etiquetas. Si se da, fullmatch() descarta con su tabla compilada
+            las cadenas no aceptadas antes de simular los hilos.
+        program (list[tuple]): Instrucciones (op, arg, x, y) del AFN.
+    """
+
+    def __init__(self, root, groups, automaton=None):
+        """
+        Construye el autómata con etiquetas de un árbol ordenado.
+
+        Args:
+            root (OrderedNode): Raíz del árbol ordenado (ver OrderedAST).
+            groups (int): Número de grupos de captura del árbol.
+            automaton (FiniteAutomaton, optional): Autómata equivalente sin
+                etiquetas.
+        """
+        self.groups = groups
+        self.automaton = automaton
+        self.program = []
+        self._emit(SAVE, 0)
+        self._compile(root)
+        self._emit(SAVE, 1)
+        self._emit(MATCH)
+
+    def accepts(self, cadena):
+        """
+        Determina si el autómata acepta una cadena de entrada.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            bool: True si la cadena es aceptada.
+        """
+        if self.automaton is not None:
+            return self.automaton.accepts(cadena, backend="dfa")
+        return self.fullmatch(cadena) is not None
+
+    def fullmatch(self, cadena):
+        """
+        Evalúa una cadena entera y registra sus grupos, como re.fullmatch().
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            TaggedMatch | None: Los grupos, o None si la cadena no es aceptada.
+        """
+        if self.automaton is not None and not self.automaton.accepts(cadena, backend="dfa"):
+            return None
+        registers = self._run(cadena, full=True)
+        return None if registers is None else TaggedMatch(cadena, registers)
+
+    def match(self, cadena):
+        """
+        Evalúa el prefijo de una cadena que elegiría re.match() y registra sus grupos.
+
+        Args:
+            cadena (str): Cadena de entrada a evaluar.
+
+        Returns:
+            TaggedMatch | None: Los grupos, o None si ningún prefijo es aceptado.
+        """
+        registers = self._run(cadena, full=False)
+        return None if registers is None else TaggedMatch(cadena, registers)
+
+    def _emit(self, op, arg=None, x=None, y=None):
+        """Añade una instrucción al programa y devuelve su posición."""
+        self.program.append([op, arg, x, y])
+        return len(self.program) - 1
+
+    def _compile(self, node):
+        """Añade al programa las instrucciones de un nodo del árbol ordenado."""
+        # Las concatenaciones se asocian a la derecha: se recorren en un bucle
+        # para no anidar una llamada por factor
+        while node.op == re_ast.CONCAT:
+            self._compile(node.args[0])
+            node = node.args[1]
+
+        op = node.op
+        if op == re_ast.LAMBDA:
+            return
+        if op == re_ast.EMPTY:
+            self._emit(CHAR, frozenset())
+        elif op == re_ast.SYMBOL or op == re_ast.CLASS:
+            self._emit(CHAR, node.args[0])
+        elif op == GROUP:
+            a, index = node.args
+            self._emit(SAVE, 2 * index)
+            self._compile(a)
+            self._emit(SAVE, 2 * index + 1)
+        elif op == re_ast.STAR:
+            self._compile_repeat(node.args[0], 0, None)
+        elif op == re_ast.REPEAT:
+            self._compile_repeat(*node.args)
+        elif op == re_ast.UNION:
+            jumps = []
+            for branch in node.args[:-1]:
+                split = self._emit(SPLIT)
+                self._compile(branch)
+                jumps.append(self._emit(JMP))
+                self.program[split][2:] = [split + 1, len(self.program)]
+            self._compile(node.args[-1])
+            for jump in jumps:
+                self.program[jump][2] = len(self.program)
+        else:
+            raise ValueError(f"Unsupported operator in tagged automaton: {op}")
+
+    def _compile_repeat(self, a, low, high):
+        """
+        Añade las instrucciones de a{low,high} (high None si no tiene límite).
+
+        Las low iteraciones obligatorias se copian una tras otra. Las
+        opcionales son un bucle o, si hay límite, high - low copias. Cada una
+        empieza con SPLIT (iterar o salir) e ITER y termina con LOOP, que
+        sale si la iteración no ha consumido nada; todas las salidas pasan
+        por CLEAR.
+        """
+        for _ in range(low):
+            self._compile(a)
+        loop = len(self.program)
+        exits = []
+        for i in range(1 if high is None else high - low):
+            split = self._emit(SPLIT, x=len(self.program) + 1)
+            exits.append(split)
+            self._emit(ITER, loop)
+            self._compile(a)
+            if high is None:
+                exits.append(self._emit(LOOP, loop, x=split))
+            elif i < high - low - 1:
+                exits.append(self._emit(LOOP, loop, x=len(self.program) + 1))
+        end = self._emit(CLEAR, loop)
+        for pc in exits:
+            self.program[pc][3] = end
+
+    def _run(self, cadena, full):
+        """
+        Simula los hilos del AFN sobre una cadena.
+
+        Los hilos de cada paso se guardan en orden de prioridad. Si full es
+        False, al llegar un hilo a MATCH se descartan los de menor prioridad
+        y se sigue solo con los de mayor, que aún pueden dar otro resultado.
+
+        Returns:
+            tuple | None: Registros del hilo ganador, o None.
+        """
+        program = self.program
+        mark = [-1] * len(program)
+        added = [-1] * len(program)
+        registers = (None,) * (2 * self.groups + 2)
+        threads = self._add([], 0, registers, 0, mark, added, set())
+        result = None
+        for pos, c in enumerate(cadena):
+            next_threads = []
+            seen = set()
+            for pc, registers in threads:
+                op, arg = program[pc][0], program[pc][1]
+                if op == MATCH:
+                    if not full:
+                        result = registers
+                        break
+                elif c in arg:
+                    self._add(next_threads, pc + 1, registers, pos + 1, mark, added, seen)
+            threads = next_threads
+            if not threads:
+                return result
+
+        for pc, registers in threads:
+            if program[pc][0] == MATCH:
+                return registers
+        return result
+
+    def _add(self, threads, pc, registers, pos, mark, added, seen):
+        """
+        Añade a threads los hilos que se alcanzan desde pc sin consumir símbolos.
+
+        El recorrido es en profundidad y en orden de prioridad. Cada hilo
+        lleva el conjunto de repeticiones cuya iteración no ha consumido nada;
+        un estado que ya se visitó en este paso con el mismo conjunto
+        (mark[estado] == pos si está vacío; en seen si no) no se vuelve a
+        recorrer, porque el hilo que ya pasó tiene más prioridad. Al consumir
+        un carácter el conjunto se vacía, así que los hilos que esperan un
+        carácter o están en MATCH se añaden una vez por estado (added).
+        """
+        program = self.program
+        stack = [(pc, registers, frozenset())]
+        while stack:
+            pc, registers, active = stack.pop()
+            if not active:
+                if mark[pc] == pos:
+                    continue
+                mark[pc] = pos
+            elif (pc, active) in seen:
+                continue
+            else:
+                seen.add((pc, active))
+            op, arg, x, y = program[pc]
+            if op == JMP:
+                stack.append((x, registers, active))
+            elif op == SPLIT:
+                stack.append((y, registers, active))
+                stack.append((x, registers, active))
+            elif op == ITER:
+                stack.append((pc + 1, registers, active | {arg}))
+            elif op == LOOP:
+                # Una iteración vacía se acepta, pero termina la repetición
+                stack.append((y if arg in active else x, registers, active))
+            elif op == CLEAR:
+                stack.append((pc + 1, registers, active - {arg}))
+            elif op == SAVE:
+                stack.append((pc + 1, registers[:arg] + (pos,) + registers[arg + 1:], active))
+            elif added[pc] != pos:
+                added[pc] = pos
+                threads.append((pc, registers))
+        return threads
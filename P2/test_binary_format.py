@@ -0,0 +1,102 @@
+"""Test binary serialization of automata."""
+import io
+import os
+import tempfile
+import unittest
+
+from automaton import CompiledAutomaton
+from re_parser import REParser
+from utils import BinaryAutomataFormat, FormatParseError, deterministic_automata_isomorphism
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Tests for the binary automata format."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.automaton = REParser().create_automaton("(a+b+ñ)*.a.(a+b)").to_deterministic().to_minimized()
+        self.strings = ["aa", "ab", "ña", "ñab", "", "ba", "bbbbaa", "x"]
+
+    def _check_same(self, loaded):
+        self.assertIsInstance(loaded, CompiledAutomaton)
+        for string in self.strings:
+            with self.subTest(string=string):
+                self.assertEqual(loaded.accepts(string), self.automaton.accepts(string))
+
+    def test_round_trip(self):
+        """Test dumping to bytes and loading back."""
+        data = BinaryAutomataFormat.dumps(self.automaton)
+        self.assertEqual(data[:4], b"AUTB")
+
+        loaded = BinaryAutomataFormat.loads(data)
+        self.assertIsInstance(loaded.table, memoryview)
+        self._check_same(loaded)
+        self.assertTrue(deterministic_automata_isomorphism(
+            loaded.to_automaton().to_minimized(), self.automaton.to_minimized()) is not None)
+
+    def test_names(self):
+        """Test the optional names section."""
+        compiled = self.automaton.compile()
+        loaded = BinaryAutomataFormat.loads(BinaryAutomataFormat.dumps(compiled, names=True))
+        self.assertEqual(loaded.states, compiled.states)
+
+        loaded = BinaryAutomataFormat.loads(BinaryAutomataFormat.dumps(compiled))
+        self.assertEqual(list(loaded.states), list(range(compiled.n_states)))
+
+    def test_file(self):
+        """Test dumping to a file and loading it with mmap."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "automaton.autb")
+            BinaryAutomataFormat.dump(self.automaton, path)
+            self._check_same(BinaryAutomataFormat.load(path))
+
+        f = io.BytesIO()
+        BinaryAutomataFormat.dump(self.automaton, f)
+        self._check_same(BinaryAutomataFormat.loads(f.getvalue()))
+
+    def test_byte_level(self):
+        """Test automata whose symbols are bytes."""
+        encoded = self.automaton.compile().encode()
+        loaded = BinaryAutomataFormat.loads(BinaryAutomataFormat.dumps(encoded))
+
+        self.assertTrue(loaded.byte_level)
+        for string in self.strings:
+            with self.subTest(string=string):
+                self.assertEqual(loaded.accepts(string.encode("utf-8")), self.automaton.accepts(string))
+
+    def test_classes(self):
+        """Test automata with character class symbols."""
+        automaton = REParser().create_automaton("[a-z]+@[a-z0-9]+", syntax="re")
+        loaded = BinaryAutomataFormat.loads(BinaryAutomataFormat.dumps(automaton))
+
+        self.assertEqual(set(loaded.symbols), automaton.to_deterministic().symbols)
+        for string in ["ab@c1", "@c", "ab@", "aB@c", "x@9"]:
+            with self.subTest(string=string):
+                self.assertEqual(loaded.accepts(string), automaton.accepts(string))
+
+    def test_errors(self):
+        """Test invalid data."""
+        data = BinaryAutomataFormat.dumps(self.automaton)
+        with self.assertRaises(FormatParseError):
+            BinaryAutomataFormat.loads(b"XXXX" + data[4:])
+        with self.assertRaises(FormatParseError):
+            BinaryAutomataFormat.loads(data[:10])
+        with self.assertRaises(FormatParseError):
+            BinaryAutomataFormat.loads(data[:-3])
+        # Truncated inside the symbol table
+        with self.assertRaises(FormatParseError):
+            BinaryAutomataFormat.loads(data[:BinaryAutomataFormat.header.size + 2])
+        # Initial state out of range
+        header = list(BinaryAutomataFormat.header.unpack_from(data))
+        header[5] = header[3]
+        with self.assertRaises(FormatParseError):
+            BinaryAutomataFormat.loads(BinaryAutomataFormat.header.pack(*header) + data[BinaryAutomataFormat.header.size:])
+
+        # The text of this class takes more than 65535 bytes
+        automaton = REParser().create_automaton("[\u0100-\ud7a3]x", syntax="re")
+        with self.assertRaises(ValueError):
+            BinaryAutomataFormat.dumps(automaton)
+
+
+if __name__ == "__main__":
+    unittest.main()
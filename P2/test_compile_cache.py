@@ -0,0 +1,100 @@
+"""Test the regex compile cache."""
+import os
+import tempfile
+import threading
+import unittest
+
+from compile_cache import CompileCache
+
+
+class TestCompileCache(unittest.TestCase):
+    """Tests for the compile cache."""
+
+    def test_memory(self):
+        """Test memory hits and normalized keys."""
+        cache = CompileCache()
+        compiled = cache.get("(a+b)*.c")
+
+        self.assertTrue(compiled.accepts("abac"))
+        self.assertFalse(compiled.accepts("aba"))
+        self.assertIs(cache.get("((a+b)*).c"), compiled)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertIn("(a+b)*.c", cache)
+
+    def test_settings_in_key(self):
+        """Test that the construction method and syntax are part of the key."""
+        kleene = CompileCache()
+        self.assertNotEqual(kleene.key("a.b"), CompileCache(method="thompson").key("a.b"))
+
+        cache = CompileCache(syntax="re")
+        self.assertNotEqual(cache.key("a.b"), kleene.key("a.b"))
+        self.assertNotEqual(cache.key("(ab)"), cache.key("ab"))
+        compiled = cache.get("[a-c]+x{2}")
+        self.assertTrue(compiled.accepts("abcxx"))
+        self.assertFalse(compiled.accepts("abcx"))
+        self.assertIn("[a-c]+x{2}", cache)
+        self.assertNotIn("[a-c]+x{2}", kleene)
+
+    def test_eviction(self):
+        """Test size based LRU eviction."""
+        first = CompileCache().get("a.b")
+        cache = CompileCache(max_bytes=3 * first.nbytes)
+
+        cache.get("a.b")
+        cache.get("a.c")
+        cache.get("a.b")
+        cache.get("a.d")
+        cache.get("a.e")
+
+        self.assertLessEqual(cache.memory_bytes, cache.max_bytes)
+        self.assertIn("a.b", cache)
+        self.assertNotIn("a.c", cache)
+
+    def test_disk(self):
+        """Test the on disk tier shared between caches."""
+        with tempfile.TemporaryDirectory() as directory:
+            CompileCache(directory=directory).get("(a+b)*.c")
+            self.assertEqual([name[-5:] for name in os.listdir(directory)], [".autb"])
+
+            cache = CompileCache(directory=directory)
+            compiled = cache.get("(a+b)*.c")
+            self.assertEqual((cache.disk_hits, cache.misses), (1, 0))
+            self.assertTrue(compiled.accepts("bbc"))
+
+    def test_corrupt_file(self):
+        """Test that a truncated file on disk is compiled again."""
+        with tempfile.TemporaryDirectory() as directory:
+            CompileCache(directory=directory).get("(a+b)*.c")
+            path = os.path.join(directory, os.listdir(directory)[0])
+            with open(path, "r+b") as f:
+                f.truncate(30)
+
+            cache = CompileCache(directory=directory)
+            self.assertTrue(cache.get("(a+b)*.c").accepts("abc"))
+            self.assertEqual((cache.disk_hits, cache.misses), (0, 1))
+
+    def test_concurrent_writers(self):
+        """Test several caches writing the same entries concurrently."""
+        with tempfile.TemporaryDirectory() as directory:
+            patterns = ["(a+b)*.c", "a.b*", "(a.b+c)*"]
+
+            def worker():
+                cache = CompileCache(directory=directory)
+                for pattern in patterns * 5:
+                    cache.get(pattern)
+                    cache.clear()
+
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual(len(os.listdir(directory)), len(patterns))
+            cache = CompileCache(directory=directory)
+            self.assertTrue(cache.get("a.b*").accepts("abb"))
+            self.assertEqual(cache.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+"""Test compiled transition tables."""
+import time
+import unittest
+from unittest import mock
+
+from automaton import CompiledAutomaton
+from re_parser import REParser
+from utils import AutomataFormat
+
+
+class TestCompiled(unittest.TestCase):
+    """Tests for compiled automata."""
+
+    def _check_accept(self, compiled, string, should_accept = True):
+        with self.subTest(string=string):
+            self.assertEqual(compiled.accepts(string), should_accept)
+
+    def test_deterministic(self):
+        """Test compilation of a deterministic automaton."""
+        description = """
+        Automaton:
+            Symbols: Helo
+
+            Empty
+            H
+            He
+            Hel
+            Hell
+            Hello final
+
+            ini Empty -H-> H
+            H -e-> He
+            He -l-> Hel
+            Hel -l-> Hell
+            Hell -o-> Hello
+        """
+
+        compiled = AutomataFormat.read(description).compile()
+
+        self.assertIsInstance(compiled, CompiledAutomaton)
+        self.assertEqual(compiled.n_states, 6)
+        self._check_accept(compiled, "Hello", should_accept=True)
+        self._check_accept(compiled, "Hell", should_accept=False)
+        self._check_accept(compiled, "Helloo", should_accept=False)
+        self._check_accept(compiled, "Hella", should_accept=False)
+        self._check_accept(compiled, "", should_accept=False)
+
+    def test_non_deterministic(self):
+        """Test compilation of an automaton with lambdas."""
+        automaton = REParser().create_automaton("(a+b)*.c")
+        compiled = automaton.compile()
+
+        for string in ["c", "abc", "bbac", "", "ab", "cc", "abx"]:
+            with self.subTest(string=string):
+                self.assertEqual(compiled.accepts(string), automaton.accepts(string))
+
+    def test_dead_states(self):
+        """Test that transitions to dead states are pruned."""
+        compiled = REParser().create_automaton("a.b").compile()
+
+        self.assertEqual(compiled.run("b"), -1)
+        self.assertEqual(compiled.run("x"), -1)
+        self.assertTrue(compiled.is_final(compiled.run("ab")))
+
+    def test_match(self):
+        """Test longest prefix match."""
+        compiled = REParser().create_automaton("(a+b)*.c").compile()
+
+        self.assertEqual(compiled.match("abcab"), 3)
+        self.assertEqual(compiled.match("ccc"), 1)
+        self.assertEqual(compiled.match("xabc"), -1)
+        self.assertEqual(compiled.match("xabc", start=1), 4)
+
+        compiled = REParser().create_automaton("a*").compile()
+        self.assertEqual(compiled.match("b"), 0)
+        self.assertEqual(compiled.match("aab"), 2)
+
+    def test_encode(self):
+        """Test translation of a compiled table to bytes."""
+        compiled = REParser().create_automaton("(a+ñ+ó)*.b").compile()
+        encoded = compiled.encode()
+
+        self.assertTrue(encoded.byte_level)
+        self.assertFalse(compiled.byte_level)
+        # ñ and ó share their first UTF-8 byte, so each state needs one more
+        column = compiled.symbol_index["ñ"]
+        prefixed = [s for s in range(compiled.n_states) if compiled.table[s * compiled.n_symbols + column] >= 0]
+        self.assertEqual(encoded.n_states, compiled.n_states + len(prefixed))
+        for string in ["b", "ab", "ñób", "aaóñ", "x", ""]:
+            with self.subTest(string=string):
+                data = string.encode("utf-8")
+                self.assertEqual(encoded.accepts(data), compiled.accepts(string))
+                self.assertEqual(encoded.accepts(memoryview(data)), compiled.accepts(string))
+
+    def test_accepts_many(self):
+        """Test batch evaluation, in order, with and without workers."""
+        automaton = REParser().create_automaton("(a+b)*.c")
+        strings = ["c", "abc", "x", "", "ab", "bbac"] * 50
+        expected = [automaton.accepts(string) for string in strings]
+
+        self.assertEqual(list(automaton.accepts_many(strings)), expected)
+        self.assertEqual(
+            list(automaton.accepts_many(iter(strings), workers=2, chunksize=7, executor="thread")),
+            expected,
+        )
+        self.assertEqual(
+            list(automaton.accepts_many(strings, workers=2, chunksize=16)),
+            expected,
+        )
+
+        with self.assertRaises(ValueError):
+            list(automaton.accepts_many(strings, workers=2, executor="gpu"))
+
+    def test_accepts_many_close(self):
+        """Test that closing the generator cancels the chunks not yet started."""
+        automaton = REParser().create_automaton("(a+b)*.c")
+        accepts_list = CompiledAutomaton._accepts_list
+        calls = []
+
+        def slow_accepts_list(compiled, cadenas):
+            calls.append(len(cadenas))
+            time.sleep(0.05 if len(calls) == 1 else 0.3)
+            return accepts_list(compiled, cadenas)
+
+        with mock.patch.object(CompiledAutomaton, "_accepts_list", slow_accepts_list):
+            results = automaton.accepts_many(["abc"] * 100, workers=2, chunksize=10, executor="thread")
+            self.assertTrue(next(results))
+            results.close()
+
+        # 4 chunks were in flight: the first two and the one started when
+        # the first finished ran, and the last one was cancelled
+        self.assertLessEqual(len(calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Test automata with bounded counters."""
+import random
+import re
+import unittest
+from unittest import mock
+
+from graphviz import Digraph
+
+from automaton import FiniteAutomaton
+from counting_automaton import CountingAutomaton
+from re_parser import REParser
+from utils import deterministic_automata_isomorphism
+
+
+class TestCountingAutomaton(unittest.TestCase):
+    """Tests for counting automata."""
+
+    def _check_accept(self, automaton, string, should_accept = True):
+        with self.subTest(string=string):
+            self.assertEqual(automaton.accepts(string), should_accept)
+
+    def test_same_as_re(self):
+        """Test that counting automata agree with re.fullmatch."""
+        rng = random.Random(0)
+        for pattern in ["[0-9]{1,100}", "(ab|a){2,40}b", "(a?){20,30}", "[ab]*a{20}",
+                        "x{25,}y", "((ab){17,20}c){18,19}", "a{0,17}|b{3}"]:
+            automaton = REParser().create_counting_automaton(pattern)
+            alphabet = sorted(set(pattern) & set("abcxy0123"))
+            for _ in range(200):
+                string = alphabet[0] * rng.randint(0, 50)
+                string += "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 3)))
+                with self.subTest(pattern=pattern, string=string):
+                    self.assertEqual(automaton.accepts(string), re.fullmatch(pattern, string) is not None)
+
+    def test_size_does_not_grow(self):
+        """Test that the automaton size does not depend on the bounds."""
+        sizes = set()
+        for high in [100, 10000, 1000000]:
+            automaton = REParser().create_counting_automaton(f"[0-9]{{1,{high}}}-")
+            self.assertIsInstance(automaton, CountingAutomaton)
+            self.assertEqual(automaton.counters, [(1, high)])
+            sizes.add(len(automaton.states))
+        self.assertEqual(len(sizes), 1)
+
+        self._check_accept(automaton, "7" * 5000 + "-", should_accept=True)
+        self._check_accept(automaton, "-", should_accept=False)
+
+    def test_max_expand(self):
+        """Test that small repetitions are expanded instead of counted."""
+        automaton = REParser().create_counting_automaton("a{3}b{4,100}", max_expand=8)
+
+        self.assertEqual(automaton.counters, [(4, 100)])
+        self._check_accept(automaton, "aaabbbb", should_accept=True)
+        self._check_accept(automaton, "aaabbb", should_accept=False)
+        self._check_accept(automaton, "aabbbb", should_accept=False)
+
+    def test_cache(self):
+        """Test that the configuration cache is bounded."""
+        automaton = REParser().create_counting_automaton("a{1,500}")
+        automaton.max_cached_states = 10
+
+        self._check_accept(automaton, "a" * 500, should_accept=True)
+        self._check_accept(automaton, "a" * 501, should_accept=False)
+        self.assertLessEqual(automaton.cached_states, 10)
+
+    def test_finite_automaton_interface(self):
+        """Test the FiniteAutomaton methods that take the counters into account."""
+        automaton = REParser().create_counting_automaton("(ab|a){2,20}b")
+        self.assertIsInstance(automaton, FiniteAutomaton)
+
+        deterministic = automaton.to_deterministic()
+        self.assertTrue(deterministic._is_deterministic())
+        expected = REParser().create_automaton("(ab|a){2,20}b", syntax="re").to_deterministic()
+        self.assertTrue(deterministic_automata_isomorphism(deterministic.to_minimized(),
+                                                           expected.to_minimized()))
+        for string in ["aab", "ababb", "ab", "a" * 20 + "b", "a" * 21 + "b"]:
+            with self.subTest(string=string):
+                self.assertEqual(automaton.accepts(string, backend="dfa"), automaton.accepts(string))
+                self.assertEqual(automaton.compile().accepts(string), automaton.accepts(string))
+
+        # Minimized through the equivalent DFA, with its counters
+        automaton = REParser().create_counting_automaton("a{20,30}b", max_expand=4)
+        minimized = automaton.to_minimized()
+        self.assertTrue(minimized._is_deterministic())
+        for count in [19, 20, 25, 30, 31]:
+            with self.subTest(count=count):
+                self.assertEqual(minimized.accepts("a" * count + "b"), 20 <= count <= 30)
+        self.assertEqual(len(automaton.to_minimized(algorithm="moore").states), len(minimized.states))
+
+        # These methods and backends only see the transitions without counters
+        for method, args in [("lambda_clausure", ({automaton.initial_state},)),
+                             ("symbol_transitions", ({automaton.initial_state}, "a")),
+                             ("automaton_bfs", ())]:
+            with self.assertRaises(NotImplementedError):
+                getattr(automaton, method)(*args)
+        for backend in ("bitset", "lazy"):
+            with self.assertRaises(ValueError):
+                automaton.accepts("aab", backend=backend)
+
+        with mock.patch.object(Digraph, "render", autospec=True) as render:
+            automaton.draw(filename="test_counting", view=False)
+        source = render.call_args[0][0].source
+        for operation in ("enter", "repeat", "exit"):
+            self.assertIn(f"λ {operation} c0", source)
+        self.assertIn("-λ repeat c0->", str(automaton))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Test regex evaluation with Brzozowski derivatives."""
+import itertools
+import unittest
+
+import re_ast
+from derivatives import DerivativeMatcher
+from re_parser import REParser
+
+
+class TestDerivatives(unittest.TestCase):
+    """Tests for the derivative matcher."""
+
+    def _check_accept(self, matcher, string, should_accept = True):
+        with self.subTest(string=string):
+            self.assertEqual(matcher.accepts(string), should_accept)
+
+    def test_same_as_automaton(self):
+        """Test that the matcher agrees with the Thompson automaton."""
+        for regex in ["(a+b)*.c", "a.λ.b+λ", "(a+λ).(b+λ)*", "((a.b)*+c)*.a", "λ", ""]:
+            automaton = REParser().create_automaton(regex)
+            matcher = DerivativeMatcher(regex)
+            for length in range(5):
+                for string in itertools.product("abcx", repeat=length):
+                    string = "".join(string)
+                    with self.subTest(regex=regex, string=string):
+                        self.assertEqual(matcher.accepts(string), automaton.accepts(string))
+
+    def test_intersection(self):
+        """Test the intersection operator."""
+        matcher = DerivativeMatcher("(a+b)*.a.(a+b)*&(a+b)*.b.(a+b)*")
+
+        self._check_accept(matcher, "ab", should_accept=True)
+        self._check_accept(matcher, "bba", should_accept=True)
+        self._check_accept(matcher, "aaa", should_accept=False)
+        self._check_accept(matcher, "", should_accept=False)
+
+    def test_complement(self):
+        """Test the complement operator."""
+        matcher = DerivativeMatcher("(a+b)*&~((a+b)*.a.a.(a+b)*)")
+
+        self._check_accept(matcher, "", should_accept=True)
+        self._check_accept(matcher, "abab", should_accept=True)
+        self._check_accept(matcher, "abaab", should_accept=False)
+        self._check_accept(matcher, "abc", should_accept=False)
+
+        matcher = DerivativeMatcher("~a")
+        self._check_accept(matcher, "a", should_accept=False)
+        self._check_accept(matcher, "", should_accept=True)
+        self._check_accept(matcher, "x", should_accept=True)
+
+    def test_lazy_states(self):
+        """Test that only the visited derivatives are built."""
+        # The minimal DFA of this regex has 2^13 states
+        matcher = DerivativeMatcher("(a+b)*.a" + ".(a+b)" * 12)
+
+        self._check_accept(matcher, "b" * 1000 + "a" + "b" * 12, should_accept=True)
+        self._check_accept(matcher, "b" * 1000, should_accept=False)
+        self.assertLess(matcher.cached_states, 100)
+
+    def test_classes(self):
+        """Test character classes and the extended syntax."""
+        matcher = DerivativeMatcher(REParser().parse("[0-9]{2,3}|x[a-c]*", syntax="re"))
+
+        self._check_accept(matcher, "12", should_accept=True)
+        self._check_accept(matcher, "123", should_accept=True)
+        self._check_accept(matcher, "xabca", should_accept=True)
+        self._check_accept(matcher, "1", should_accept=False)
+        self._check_accept(matcher, "1234", should_accept=False)
+        self._check_accept(matcher, "xd", should_accept=False)
+
+    def test_canonical_form(self):
+        """Test that equivalent regexes share their hash-consed node."""
+        parser = REParser()
+
+        self.assertIs(parser.parse("a+b"), parser.parse("b+a"))
+        self.assertIs(parser.parse("(a+a)*"), parser.parse("a*"))
+        self.assertIs(parser.parse("(a*)*"), parser.parse("a*"))
+        self.assertIs(parser.parse("λ.a.λ"), parser.parse("a"))
+        self.assertIs(parser.parse("(a.b).c"), parser.parse("a.(b.c)"))
+        self.assertIs(parser.parse("~~a"), parser.parse("a"))
+        self.assertIs(parser.parse(""), re_ast.empty())
+
+    def test_deep_regex(self):
+        """Test regexes deeper than the recursion limit."""
+        # Every tail after a nullable head is derived
+        chars = [chr(0x100 + i) for i in range(1500)]
+        matcher = DerivativeMatcher(".".join(f"({char})*" for char in chars))
+        self.assertTrue(matcher.accepts(chars[0] * 3 + chars[700] + chars[-1]))
+        self.assertFalse(matcher.accepts(chars[700] + chars[0]))
+
+        # The union factors out a long common prefix
+        word = "ab" * 750
+        matcher = DerivativeMatcher(".".join(word + "c") + "+" + ".".join(word + "d"))
+        self.assertTrue(matcher.accepts(word + "d"))
+        self.assertFalse(matcher.accepts(word))
+
+    def test_automaton_rejects_extended_operators(self):
+        """Test that automaton constructions reject & and ~."""
+        for method in ("thompson", "glushkov"):
+            with self.subTest(method=method):
+                with self.assertRaises(ValueError):
+                    REParser().create_automaton("a&b", method=method)
+                with self.assertRaises(ValueError):
+                    REParser().create_automaton("~a", method=method)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -25,6 +25,10 @@ class TestEvaluatorBase(ABC, unittest.TestCase):
             pass
         self.assertEqual(accepted, should_accept)
 
+        for backend in ("bitset", "lazy", "dfa"):
+            accepted = self.automaton.accepts(string, backend=backend)
+            self.assertEqual(accepted, should_accept, backend)
+
     def _check_accept(self, string, should_accept = True, exception = None):
 
         with self.subTest(string=string):
@@ -101,6 +105,45 @@ class TestEvaluatorLambdas(TestEvaluatorBase):
         self._check_accept("a", should_accept=False)
 
 
+class TestEvaluatorLambdaCycle(TestEvaluatorBase):
+    """Test for lambda transitions forming a cycle."""
+
+    def _create_automata(self):
+
+        description = """
+        Automaton:
+            Symbols: ab
+
+            1
+            2
+            3
+            4 final
+
+            ini 1 --> 2
+            2 --> 3
+            3 --> 1
+            3 -a-> 4
+            4 --> 2
+        """
+
+        return AutomataFormat.read(description)
+
+    def test_lambda_cycle(self):
+        """Test for a lambda cycle."""
+        self._check_accept("", should_accept=False)
+        self._check_accept("a", should_accept=True)
+        self._check_accept("aaa", should_accept=True)
+        self._check_accept("b", should_accept=False)
+
+    def test_add_transition(self):
+        """Test that new transitions are seen by the closure index."""
+        self._check_accept("b", should_accept=False)
+        self.automaton.add_transition("2", None, "4")
+        self._check_accept("", should_accept=True)
+        self.automaton.add_transition("4", "b", "4")
+        self._check_accept("ab", should_accept=True)
+
+
 class TestEvaluatorNumber(TestEvaluatorBase):
     """Test for a fixed string."""
 
@@ -0,0 +1,48 @@
+"""Test lazy DFA evaluation."""
+import itertools
+import unittest
+
+from lazy_dfa import LazyDFA
+from re_parser import REParser
+
+
+class TestLazyDFA(unittest.TestCase):
+    """Tests for the lazy DFA."""
+
+    def _check_same(self, automaton, lazy, alphabet, max_length):
+        for length in range(max_length + 1):
+            for string in map("".join, itertools.product(alphabet, repeat=length)):
+                with self.subTest(string=string):
+                    self.assertEqual(lazy.accepts(string), automaton.accepts(string))
+
+    def test_accepts(self):
+        """Test that the lazy DFA accepts the same strings as the automaton."""
+        automaton = REParser().create_automaton("(a+b)*.a.(a+b).(a+b)")
+        lazy = LazyDFA(automaton)
+
+        self._check_same(automaton, lazy, "abc", 5)
+        self.assertEqual(lazy.flushes, 0)
+        self.assertLessEqual(lazy.cached_states, 9)
+
+    def test_budget(self):
+        """Test that a small budget flushes the cache and falls back to the NFA."""
+        automaton = REParser().create_automaton("(a+b)*.a.(a+b).(a+b).(a+b)")
+        lazy = LazyDFA(automaton, memory_budget=2000, max_flushes=2)
+
+        self._check_same(automaton, lazy, "ab", 7)
+        self.assertGreater(lazy.flushes, 0)
+        self.assertGreater(lazy.fallbacks, 0)
+        self.assertLessEqual(lazy.memory_used, 2000)
+
+    def test_lambda_cycle(self):
+        """Test automata with lambda cycles."""
+        automaton = REParser().create_automaton("(a*)*.b")
+        lazy = LazyDFA(automaton)
+
+        self.assertTrue(lazy.accepts("aab"))
+        self.assertFalse(lazy.accepts("aa"))
+        self.assertFalse(lazy.accepts("x"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""Test the automaton-backed lexer generator."""
+import importlib.util
+import os
+import unittest
+
+from lexer import Lexer
+
+try:
+    import ply.yacc as yacc
+except ImportError:
+    yacc = None
+
+GRAMMAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "P3", "src", "grammar.py")
+
+RULES = [
+    ("IF", "if", 2),
+    ("ID", "[a-z_][a-z0-9_]*", 1),
+    ("NUM", "[0-9]+", 1),
+    ("OP", "[-+*/=<>]|==|<=", 1),
+    (None, "#[a-z ]*", 0),
+]
+
+
+class TestLexer(unittest.TestCase):
+    """Tests for Lexer."""
+
+    def test_longest_match_and_priority(self):
+        """Test that the longest token wins and then the highest priority."""
+        lexer = Lexer(RULES, ignore=" \n")
+        stream = lexer.tokenize("if x1 == 42 # comment\n ifa <= if1+3")
+
+        self.assertEqual(list(stream), ["IF", "ID", "OP", "NUM", "ID", "OP", "ID", "OP", "NUM"])
+        self.assertEqual([stream.value(i) for i in range(len(stream))],
+                         ["if", "x1", "==", "42", "ifa", "<=", "if1", "+", "3"])
+        self.assertEqual(list(stream.starts[:3]), [0, 3, 6])
+        self.assertEqual(list(stream.ends[:3]), [2, 5, 8])
+        self.assertEqual([lexer.names[t] for t in stream.types], list(stream))
+
+        # Same length: the lowest priority loses, and the first rule wins ties
+        self.assertEqual(list(Lexer([("A", "ab", 0), ("B", "a[b]", 1)]).tokenize("ab")), ["B"])
+        self.assertEqual(list(Lexer([("A", "ab", 0), ("B", "a[b]", 0)]).tokenize("ab")), ["A"])
+
+    def test_single_character_tokens(self):
+        """Test the rules of the roman numerals lexer of P3."""
+        lexer = Lexer([(c, c, 0) for c in "MDCLXVI"], ignore=" \t\n")
+        self.assertEqual("".join(lexer.tokenize("MCM XC\nIV")), "MCMXCIV")
+        # Initial state and one final state per rule
+        self.assertEqual(lexer.n_states, 8)
+
+    def test_errors(self):
+        """Test illegal characters and rules that match the empty string."""
+        lexer = Lexer(RULES, ignore=" ")
+        with self.assertRaises(ValueError):
+            lexer.tokenize("x = 1 ; y")
+        with self.assertRaises(ValueError):
+            Lexer([("A", "a*", 0)])
+
+    def test_ply_interface(self):
+        """Test input() and token() with the attributes of ply tokens."""
+        lexer = Lexer(RULES, ignore=" \n")
+        lexer.input("if x\n  y1")
+        tokens = list(lexer)
+        self.assertEqual([(t.type, t.value, t.lineno, t.lexpos) for t in tokens],
+                         [("IF", "if", 1, 0), ("ID", "x", 1, 3), ("ID", "y1", 2, 7)])
+        self.assertIsNone(lexer.token())
+        self.assertEqual(lexer.lexpos, 9)
+
+    @unittest.skipIf(yacc is None, "ply is not installed")
+    def test_ply_parser(self):
+        """Test the lexer as the lexer of a ply parser."""
+
+        class Sum:
+            tokens = ("NUM", "PLUS")
+
+            def p_sum(self, p):
+                """sum : sum PLUS NUM
+                       | NUM"""
+                p[0] = int(p[1]) if len(p) == 2 else p[1] + int(p[3])
+
+            def p_error(self, p):
+                raise ValueError(p)
+
+        parser = yacc.yacc(module=Sum(), write_tables=False, debug=False)
+        lexer = Lexer([("NUM", "[0-9]+", 0), ("PLUS", "[+]", 0)], ignore=" ")
+        self.assertEqual(parser.parse("1 + 22 + 300", lexer=lexer), 323)
+
+    @unittest.skipUnless(os.path.exists(GRAMMAR_PATH), "P3 is not available")
+    def test_ll1_analyze(self):
+        """Test the token stream as the input of LL1Table.analyze of P3."""
+        spec = importlib.util.spec_from_file_location("grammar", GRAMMAR_PATH)
+        grammar = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(grammar)
+
+        table = grammar.LL1Table({"E", "T", "X", "Y"}, {"(", ")", "i", "+", "*", "$"})
+        for cell in [("E", "(", "TX"), ("E", "i", "TX"), ("T", "(", "(E)"), ("T", "i", "iY"),
+                     ("X", "+", "+E"), ("X", ")", ""), ("X", "$", ""), ("Y", "*", "*T"),
+                     ("Y", "+", ""), ("Y", ")", ""), ("Y", "$", "")]:
+            table.add_cell(*cell)
+
+        lexer = Lexer([("i", "[a-z][a-z0-9]*|[0-9]+", 0), ("(", "[(]", 0), (")", "[)]", 0),
+                       ("+", "[+]", 0), ("*", "[*]", 0)], ignore=" ")
+        self.assertTrue(table.analyze(lexer.tokenize("(x1 + 42 * y)", end="$"), "E"))
+        with self.assertRaises(grammar.SyntaxError):
+            table.analyze(lexer.tokenize("(x1 + 42", end="$"), "E")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Test incremental matchers."""
+import asyncio
+import unittest
+
+from re_parser import REParser
+
+
+class TestMatcher(unittest.TestCase):
+    """Tests for the resumable matcher."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.automaton = REParser().create_automaton("(a+ñ)*.b")
+
+    def test_feed(self):
+        """Test feeding a string in chunks."""
+        matcher = self.automaton.matcher()
+
+        matcher.feed("aa").feed("ña")
+        self.assertFalse(matcher.is_accepting())
+        matcher.feed("b")
+        self.assertTrue(matcher.is_accepting())
+        self.assertEqual(matcher.consumed, 5)
+
+        matcher.feed("b")
+        self.assertFalse(matcher.is_accepting())
+        self.assertTrue(matcher.is_dead())
+
+        matcher.reset()
+        self.assertFalse(matcher.is_dead())
+        self.assertTrue(matcher.feed("b").is_accepting())
+
+    def test_bytes(self):
+        """Test bytes chunks with a character split between chunks."""
+        data = "añab".encode("utf-8")
+        matcher = self.automaton.matcher()
+
+        matcher.feed(data[:2])
+        self.assertFalse(matcher.is_accepting())
+        matcher.feed(data[2:])
+        self.assertTrue(matcher.is_accepting())
+
+    def test_snapshot(self):
+        """Test snapshot and restore."""
+        matcher = self.automaton.matcher()
+        matcher.feed("a".encode("utf-8") + "ñ".encode("utf-8")[:1])
+        snapshot = matcher.snapshot()
+
+        matcher.feed("ñ".encode("utf-8")[1:] + b"b")
+        self.assertTrue(matcher.is_accepting())
+
+        matcher.restore(snapshot)
+        self.assertFalse(matcher.is_accepting())
+        matcher.feed("ñ".encode("utf-8")[1:] + b"x")
+        self.assertTrue(matcher.is_dead())
+
+        matcher.restore(snapshot)
+        self.assertTrue(matcher.feed("ñ".encode("utf-8")[1:] + b"ab").is_accepting())
+
+    def test_stream(self):
+        """Test consuming an asyncio stream."""
+        async def run(data, chunk_size):
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return await self.automaton.matcher().feed_stream(reader, chunk_size)
+
+        data = ("añ" * 1000 + "b").encode("utf-8")
+        self.assertTrue(asyncio.run(run(data, 7)))
+        self.assertFalse(asyncio.run(run(data + b"b", 7)))
+        self.assertFalse(asyncio.run(run(b"", 7)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 """Test evaluation of automatas."""
+import random
 import unittest
 from abc import ABC
 
@@ -14,6 +15,9 @@ class TestMinimize(ABC, unittest.TestCase):
         minimized = automaton.to_minimized()
         equiv_map = deterministic_automata_isomorphism(minimized, simplified)
 
+        moore = automaton.to_minimized(algorithm="moore")
+        self.assertTrue(deterministic_automata_isomorphism(minimized, moore) is not None)
+
         automaton.draw(filename=f"{tag}_orig",    view=False)
         minimized.draw(filename=f"{tag}_minimized",     view=False)
         simplified.draw(filename=f"{tag}_expected", view=False)
@@ -220,6 +224,30 @@ class TestMinimize(ABC, unittest.TestCase):
 
         self._check_minimize(automaton, simplified, "minimize_2")
 
+    def test_hopcroft_moore(self):
+        """Test that Hopcroft and Moore agree on random automata."""
+        for seed in range(100):
+            rng = random.Random(seed)
+            states = [f"s{i}" for i in range(rng.randint(1, 12))]
+            transitions = {
+                st: {symbol: {rng.choice(states)} for symbol in "abc" if rng.random() < 0.9}
+                for st in states
+            }
+            final_states = {st for st in states if rng.random() < 0.3}
+            automaton = FiniteAutomaton(states[0], states, set("abc"), transitions, final_states)
+
+            with self.subTest(seed=seed):
+                hopcroft = automaton.to_minimized(algorithm="hopcroft")
+                moore = automaton.to_minimized(algorithm="moore")
+                self.assertTrue(deterministic_automata_isomorphism(hopcroft, moore) is not None)
+                self.assertEqual(len(hopcroft.to_minimized().states), len(hopcroft.states))
+
+    def test_unknown_algorithm(self):
+        """Test that an unknown algorithm is rejected."""
+        automaton = FiniteAutomaton("q0", ["q0"], {"a"}, {"q0": {"a": {"q0"}}}, set())
+        with self.assertRaises(ValueError):
+            automaton.to_minimized(algorithm="brzozowski")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+"""Test prefilter analysis."""
+import unittest
+
+from prefilter import Prefilter
+from re_parser import REParser
+
+
+def _prefilter(pattern, byte_level=False):
+    automaton = REParser().create_automaton(pattern, syntax="re")
+    compiled = automaton.to_deterministic().to_minimized().compile()
+    return Prefilter(compiled.encode() if byte_level else compiled)
+
+
+class TestPrefilter(unittest.TestCase):
+    """Tests for required literals and boundary symbols."""
+
+    def test_required_literal(self):
+        """Test literals contained in every accepted string."""
+        for pattern, literal in [
+            ("abc", "abc"),
+            ("x(ab|cd)*error[0-9]+", "error"),
+            ("(foo|bar)baz", "baz"),
+            ("(GET|POST) /api", "T /api"),
+            ("ñ+error", "error"),
+            ("a|b", ""),
+            ("a*", ""),
+        ]:
+            with self.subTest(pattern=pattern):
+                self.assertEqual(_prefilter(pattern).literal, literal)
+                self.assertEqual(_prefilter(pattern, byte_level=True).literal, literal.encode())
+
+    def test_boundary_symbols(self):
+        """Test the symbols that start and end accepted strings."""
+        prefilter = _prefilter("(foo|bar)baz")
+        self.assertEqual(prefilter.first, ["b", "f"])
+        self.assertEqual(prefilter.last, ["z"])
+
+        # Too many symbols to search, or the empty string is accepted
+        self.assertIsNone(_prefilter("[0-9]+x").first)
+        self.assertEqual(_prefilter("[0-9]+x").last, ["x"])
+        self.assertIsNone(_prefilter("(ab)*").first)
+        self.assertIsNone(_prefilter("(ab)*").last)
+
+        self.assertEqual(_prefilter("ñ+a", byte_level=True).first, [b"\xc3"])
+
+    def test_rejects(self):
+        """Test rejecting texts without the required literal."""
+        prefilter = _prefilter("ERROR [0-9]+")
+
+        self.assertTrue(prefilter.rejects("INFO 200 ok", 0, 11))
+        self.assertFalse(prefilter.rejects("x ERROR 500", 0, 11))
+        self.assertTrue(prefilter.rejects("x ERROR 500", 3, 11))
+        self.assertFalse(_prefilter("a|b").rejects("xyz", 0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
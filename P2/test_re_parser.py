@@ -1,8 +1,15 @@
 """Test evaluation of regex parser."""
+import random
+import re
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
-from automaton import FiniteAutomaton
-from re_parser import REParser
+from graphviz import Digraph
+
+from automaton import FiniteAutomaton, SymbolClass
+from re_parser import REParser, compile_many
+from utils import deterministic_automata_isomorphism
 
 
 class TestREParser(unittest.TestCase):
@@ -17,6 +24,10 @@ class TestREParser(unittest.TestCase):
             accepted = evaluator.accepts(string)
             self.assertEqual(accepted, should_accept)
 
+            for backend in ("bitset", "lazy", "dfa"):
+                accepted = evaluator.accepts(string, backend=backend)
+                self.assertEqual(accepted, should_accept, backend)
+
     def test_fixed(self):
         """Test fixed regex."""
         evaluator = self._create_evaluator("H.e.l.l.o")
@@ -82,6 +93,255 @@ class TestREParser(unittest.TestCase):
         self._check_accept(evaluator, "13,", should_accept=True)
         self._check_accept(evaluator, "3,7,12", should_accept=False)
 
+    def test_star_of_star(self):
+        """Test nested Kleene stars, which produce lambda cycles."""
+        evaluator = self._create_evaluator("(a*)*.b")
+
+        self._check_accept(evaluator, "b", should_accept=True)
+        self._check_accept(evaluator, "ab", should_accept=True)
+        self._check_accept(evaluator, "aaab", should_accept=True)
+        self._check_accept(evaluator, "", should_accept=False)
+        self._check_accept(evaluator, "aba", should_accept=False)
+
+    def test_lambda(self):
+        """Test the empty string symbol."""
+        evaluator = self._create_evaluator("a.λ.b+λ")
+
+        self._check_accept(evaluator, "", should_accept=True)
+        self._check_accept(evaluator, "ab", should_accept=True)
+        self._check_accept(evaluator, "a", should_accept=False)
+
+    def test_empty(self):
+        """Test the empty regex."""
+        evaluator = self._create_evaluator("")
+
+        self._check_accept(evaluator, "", should_accept=False)
+        self._check_accept(evaluator, "a", should_accept=False)
+
+    def test_many_alternatives(self):
+        """Test a long alternation."""
+        words = [f"{i:04d}" for i in range(2000)]
+        evaluator = self._create_evaluator("(" + "+".join(".".join(word) for word in words) + ")")
+
+        # Common prefixes are factored: each of the 2222 prefixes is one symbol
+        # fragment, and each of the 223 branching prefixes one union gadget
+        self.assertEqual(len(evaluator.states), 2 * 2222 + 2 * 223)
+        self._check_accept(evaluator, "1999", should_accept=True)
+        self._check_accept(evaluator, "2000", should_accept=False)
+
+    def test_literal_alternatives(self):
+        """Test that alternations of plain words give a minimal trie."""
+        words = [f"{i:04d}" for i in range(2000)]
+        evaluator = REParser().create_automaton("+".join(".".join(word) for word in words))
+
+        # One state per prefix length
+        self.assertEqual(len(evaluator.states), 5)
+        self.assertTrue(evaluator._is_deterministic())
+        self._check_accept(evaluator, "1999", should_accept=True)
+        self._check_accept(evaluator, "2000", should_accept=False)
+        self._check_accept(evaluator, "199", should_accept=False)
+
+        evaluator = REParser().create_automaton("i.f+e.l.s.e+e.l.i.f+λ")
+        self.assertEqual(len(evaluator.states), 6)
+        for string in ["if", "else", "elif", ""]:
+            self._check_accept(evaluator, string, should_accept=True)
+        for string in ["i", "els", "elsif", "iff"]:
+            self._check_accept(evaluator, string, should_accept=False)
+
+        # A single word, or an explicit method, is not built as a trie
+        self.assertEqual(len(REParser().create_automaton("H.e.l.l.o").states),
+                         len(REParser().create_automaton("H.e.l.l.o", method="thompson").states))
+        self.assertEqual(len(REParser().create_automaton("i.f+e.l.s.e+e.l.i.f+λ", method="glushkov").states), 9)
+        self.assertFalse(REParser().create_automaton("if|else", method="thompson", syntax="re")._is_deterministic())
+
+    def test_word_list(self):
+        """Test automata built directly from a list of words."""
+        rng = random.Random(0)
+        words = {"".join(rng.choice("abc") for _ in range(rng.randint(0, 6))) for _ in range(300)}
+        automaton = REParser().create_literal_automaton(words)
+        expected = REParser().create_automaton("(" + "|".join(words) + ")", syntax="re")
+
+        self.assertTrue(deterministic_automata_isomorphism(expected.to_deterministic().to_minimized(),
+                                                           automaton.to_deterministic().to_minimized()))
+        for word in words:
+            self.assertTrue(automaton.accepts(word))
+
+        self.assertFalse(REParser().create_literal_automaton([]).accepts(""))
+
+    def test_simplification(self):
+        """Test that equivalent regexes give the same automaton."""
+        for regex, simplified in [
+            ("(a+a)*", "a*"),
+            ("a**", "a*"),
+            ("λ.x.λ", "x"),
+            ("(a.b+a.c+a)", "a.(λ+b+c)"),
+        ]:
+            with self.subTest(regex=regex):
+                automaton = self._create_evaluator(regex)
+                expected = self._create_evaluator(simplified)
+                self.assertEqual(len(automaton.states), len(expected.states))
+                for string in ["", "a", "ab", "ac", "aa", "x", "0101", "0112"]:
+                    self.assertEqual(automaton.accepts(string), expected.accepts(string))
+
+        self.assertLess(
+            len(self._create_evaluator("a.b.c+a.b.d").states),
+            len(self._create_evaluator("a.b.c+e.f.d").states),
+        )
+
+
+class TestREParserExtended(unittest.TestCase):
+    """Tests for the extended, re-like syntax."""
+
+    PATTERNS = [
+        "[ab]*a",
+        "0*|(0*10*10*)*",
+        "0?(10)*1?",
+        "[+-]?(([1-9][0-9]*)|0)([.][0-9]+)?",
+        "(0[1-9]|1[0-9]|2[0-9]|30)[/](0[1-9]|1[0-2])",
+        "a{2,4}b{,2}c{3}|x{2,}",
+        "(?:ab|a)+?",
+        "\\d[a-c-]\\+",
+        "[]a]|a|",
+    ]
+
+    def test_same_as_re(self):
+        """Test that automata agree with re.fullmatch."""
+        rng = random.Random(0)
+        for pattern in self.PATTERNS:
+            alphabet = sorted(set(pattern) - set("()[]|?*{},\\") | {"z"})
+            strings = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+                       for _ in range(500)]
+            for method in ("thompson", "glushkov"):
+                automaton = REParser().create_automaton(pattern, method=method, syntax="re")
+                compiled = automaton.compile()
+                for string in strings:
+                    with self.subTest(pattern=pattern, method=method, string=string):
+                        expected = re.fullmatch(pattern, string) is not None
+                        self.assertEqual(automaton.accepts(string), expected)
+                        self.assertEqual(compiled.accepts(string), expected)
+
+    def test_class_transitions(self):
+        """Test that character classes are single transitions."""
+        automaton = REParser().create_automaton("[a-z]*[0-9]", method="glushkov", syntax="re")
+
+        self.assertEqual(len(automaton.states), 3)
+        self.assertEqual(automaton.symbols, {SymbolClass("abcdefghijklmnopqrstuvwxyz"),
+                                             SymbolClass("0123456789")})
+        self.assertEqual(str(SymbolClass("abcdefghijklmnopqrstuvwxyz")), "[a-z]")
+        self.assertTrue(automaton.accepts("abc7"))
+        self.assertFalse(automaton.accepts("abc"))
+
+        # Characters used on their own split the classes into disjoint symbols
+        automaton = REParser().create_automaton("[a-z]*x", syntax="re")
+        self.assertEqual(automaton.symbols, {SymbolClass("abcdefghijklmnopqrstuvwyz"), "x"})
+        self.assertTrue(automaton.accepts("axbx"))
+
+        # Kleene alternations of single characters keep one symbol per character
+        automaton = REParser().create_automaton("(a+b)*.c")
+        self.assertEqual(automaton.symbols, {"a", "b", "c"})
+
+    def test_draw_classes(self):
+        """Test that character classes are drawn with their text as label."""
+        automaton = REParser().create_automaton("[0-9]+x", method="glushkov", syntax="re")
+        with mock.patch.object(Digraph, "render", autospec=True) as render:
+            automaton.draw(filename="test_classes", view=False)
+
+        source = render.call_args[0][0].source
+        self.assertIn('label="[0-9]"', source)
+        self.assertIn("label=x", source)
+
+    def test_errors(self):
+        """Test invalid or unsupported regexes."""
+        for pattern in ["a**", "(a", "a)", "[a", "*a", "[z-a]", "a{3,2}", "[^a]", "a.b",
+                        r"\D", r"a\b", r"\x41", r"[\D]", r"(a)\1"]:
+            with self.subTest(pattern=pattern):
+                with self.assertRaises(ValueError):
+                    REParser().create_automaton(pattern, syntax="re")
+
+
+class TestREParserGlushkov(TestREParser):
+    """Tests for regex parser with the position automaton construction."""
+
+    def _create_evaluator(self, regex):
+        automaton = REParser().create_automaton(regex, method="glushkov")
+        for transitions in automaton.transitions.values():
+            self.assertNotIn(None, transitions)
+        return automaton
+
+    def test_many_alternatives(self):
+        """Test a long alternation."""
+        words = [f"{i:04d}" for i in range(2000)]
+        evaluator = self._create_evaluator("(" + "+".join(".".join(word) for word in words) + ")")
+
+        # One state per symbol occurrence (one per prefix, once factored)
+        # plus the initial state
+        self.assertEqual(len(evaluator.states), 2222 + 1)
+        self._check_accept(evaluator, "1999", should_accept=True)
+        self._check_accept(evaluator, "2000", should_accept=False)
+
+    def test_same_language(self):
+        """Test that both constructions give the same minimal automaton."""
+        for regex in ["(a+b)*.c", "(a+λ).(b+λ)*", "((a.b)*+c)*.a", "(a*)*.b", "λ"]:
+            with self.subTest(regex=regex):
+                thompson = REParser().create_automaton(regex).to_deterministic().to_minimized()
+                glushkov = self._create_evaluator(regex).to_deterministic().to_minimized()
+                self.assertTrue(deterministic_automata_isomorphism(thompson, glushkov))
+
+    def test_unknown_method(self):
+        """Test that unknown construction methods are rejected."""
+        with self.assertRaises(ValueError):
+            REParser().create_automaton("a", method="brzozowski")
+
+
+
+class TestCompileMany(unittest.TestCase):
+    """Tests for reentrant and parallel compilation."""
+
+    PATTERNS = TestREParserExtended.PATTERNS + ["x{2,}|[a-c]*|\\||(a|b)c"]
+
+    def _check_same_as_re(self, compiled):
+        rng = random.Random(0)
+        for pattern, table in zip(self.PATTERNS, compiled):
+            alphabet = sorted(set(pattern) - set("()[]?*{},\\") | {"z"})
+            for _ in range(300):
+                string = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+                with self.subTest(pattern=pattern, string=string):
+                    expected = re.fullmatch(pattern, string) is not None
+                    self.assertEqual(table.accepts(string), expected)
+
+    def test_compile_many(self):
+        """Test that parallel compilation gives the minimal DFAs."""
+        sequential = compile_many(self.PATTERNS, syntax="re")
+        parallel = compile_many(self.PATTERNS, workers=2, syntax="re")
+        self._check_same_as_re(parallel)
+        for table, expected in zip(parallel, sequential):
+            self.assertEqual(table.n_states, expected.n_states)
+
+    def test_split_alternatives(self):
+        """Test that alternatives compiled separately are combined."""
+        compiled = compile_many(self.PATTERNS, workers=2, syntax="re", split_alternatives=True)
+        self._check_same_as_re(compiled)
+        for table, expected in zip(compiled, compile_many(self.PATTERNS, syntax="re")):
+            self.assertEqual(table.n_states, expected.n_states)
+
+        kleene = compile_many(["a.b+(c+d)*+λ"], split_alternatives=True)[0]
+        for string, expected in [("ab", True), ("", True), ("cdc", True), ("a", False), ("abc", False)]:
+            self.assertEqual(kleene.accepts(string), expected)
+
+    def test_shared_parser(self):
+        """Test that one parser can be used from several threads."""
+        parser = REParser()
+        patterns = [f"{i}(a|b)*c{{2,3}}|{i}d" for i in range(40)]
+        with ThreadPoolExecutor(8) as pool:
+            automata = list(pool.map(lambda pattern: parser.create_automaton(pattern, syntax="re"),
+                                     patterns))
+        for i, automaton in enumerate(automata):
+            expected = REParser().create_automaton(patterns[i], syntax="re")
+            self.assertEqual(len(automaton.states), len(expected.states))
+            self.assertTrue(automaton.accepts(f"{i}abcc"))
+            self.assertFalse(automaton.accepts(f"{i + 1}abcc"))
+        self.assertEqual(parser.state_counter, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
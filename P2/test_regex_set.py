@@ -0,0 +1,55 @@
+"""Test sets of regexes evaluated together."""
+import random
+import re
+import unittest
+
+from regex_set import RegexSet
+
+
+class TestRegexSet(unittest.TestCase):
+    """Tests for RegexSet."""
+
+    def test_same_as_re(self):
+        """Test that the matching ids agree with re.fullmatch."""
+        patterns = ["[a-z]+", "[0-9]+", "x[0-9]*", "(ab|a)*", "[a-c]{2,3}", "ab|ba", "x0|x1"]
+        regex_set = RegexSet(patterns, syntax="re")
+
+        rng = random.Random(0)
+        for _ in range(2000):
+            string = "".join(rng.choice("abcx09z-") for _ in range(rng.randint(0, 5)))
+            with self.subTest(string=string):
+                expected = {i for i, pattern in enumerate(patterns) if re.fullmatch(pattern, string)}
+                self.assertEqual(regex_set.matches(string), expected)
+                self.assertEqual(regex_set.is_match(string), bool(expected))
+
+    def test_tags_are_not_merged(self):
+        """Test that states accepting for different patterns stay apart."""
+        regex_set = RegexSet(["a.b", "a.c", "a.(b+c)"])
+
+        # Initial, after "a" and one final state per set of ids
+        self.assertEqual(regex_set.n_states, 4)
+        self.assertEqual(regex_set.matches("ab"), {0, 2})
+        self.assertEqual(regex_set.matches("ac"), {1, 2})
+        self.assertEqual(regex_set.matches("a"), set())
+        self.assertEqual(regex_set.matches("abc"), set())
+
+    def test_many_patterns(self):
+        """Test that the automaton stays small with many similar patterns."""
+        patterns = [f"id{i}=[0-9]+" for i in range(200)]
+        regex_set = RegexSet(patterns, syntax="re")
+
+        self.assertEqual(len(regex_set), 200)
+        self.assertEqual(regex_set.matches("id17=42"), {17})
+        self.assertEqual(regex_set.matches("id1=7"), {1})
+        self.assertEqual(regex_set.matches("id17="), set())
+        self.assertLess(regex_set.n_states, 1000)
+
+    def test_empty(self):
+        """Test sets without patterns or with the empty string."""
+        self.assertEqual(RegexSet([]).matches("a"), set())
+        self.assertEqual(RegexSet(["λ", "a*"]).matches(""), {0, 1})
+        self.assertEqual(RegexSet(["λ", "a*"]).matches("aa"), {1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Test scanning of binary buffers and files."""
+import os
+import tempfile
+import unittest
+
+from re_parser import REParser
+from scanner import scan_file, scan_lines
+
+
+class TestScanner(unittest.TestCase):
+    """Tests for line scanning."""
+
+    def setUp(self):
+        """Set up the tests."""
+        self.automaton = REParser().create_automaton("(a+ñ)*.b")
+        self.lines = ["ab", "b", "", "añb", "ba", "aaaa", "ññb"]
+        self.data = "\n".join(self.lines).encode("utf-8")
+
+    def _expected(self, data):
+        expected = []
+        start = 0
+        for line in data.split(b"\n"):
+            end = start + len(line)
+            expected.append((start, end, self.automaton.accepts(line.decode("utf-8"))))
+            start = end + 1
+        if data.endswith(b"\n"):
+            expected.pop()
+        return expected
+
+    def test_buffers(self):
+        """Test bytes, bytearray and memoryview buffers."""
+        for data in [self.data, self.data + b"\n", b"", b"\n\n"]:
+            expected = self._expected(data) if data else []
+            for buffer in [data, bytearray(data), memoryview(data)]:
+                with self.subTest(buffer=buffer):
+                    self.assertEqual(list(scan_lines(self.automaton, buffer)), expected)
+
+    def test_only_accepted(self):
+        """Test reporting only the offsets of accepted lines."""
+        expected = [(start, end, True) for start, end, accepted in self._expected(self.data) if accepted]
+        self.assertEqual(len(expected), 4)
+        self.assertEqual(list(scan_lines(self.automaton, self.data, only_accepted=True)), expected)
+        self.assertEqual(
+            list(scan_lines(self.automaton.compile(), memoryview(self.data), only_accepted=True)),
+            expected,
+        )
+
+    def test_file(self):
+        """Test scanning a memory mapped file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "data.txt")
+            with open(path, "wb") as f:
+                f.write(self.data)
+            self.assertEqual(list(scan_file(self.automaton, path)), self._expected(self.data))
+
+            with open(path, "wb"):
+                pass
+            self.assertEqual(list(scan_file(self.automaton, path)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
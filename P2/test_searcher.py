@@ -0,0 +1,125 @@
+"""Test searching automata inside texts."""
+import random
+import re
+import unittest
+
+from re_parser import REParser
+
+
+def _leftmost_longest(pattern, text):
+    """Non-overlapping leftmost-longest matches, trying every substring."""
+    matches = []
+    start = 0
+    while start <= len(text):
+        end = next((end for end in range(len(text), start - 1, -1)
+                    if re.fullmatch(pattern, text[start:end])), None)
+        if end is None:
+            start += 1
+            continue
+        matches.append((start, end))
+        start = end if end > start else start + 1
+    return matches
+
+
+class TestSearcher(unittest.TestCase):
+    """Tests for search() and finditer()."""
+
+    PATTERNS = ["abcd|c", "a*", "(ab|a)(bc|c)?", "[0-9]+(\\.[0-9]+)?", "x{2,3}", "b?", "(a|b)*c", "ñ+a",
+                "a[a-c]*b|c", "x01b|0"]
+
+    def test_same_as_brute_force(self):
+        """Test that matches are the leftmost-longest ones."""
+        rng = random.Random(0)
+        for pattern in self.PATTERNS:
+            automaton = REParser().create_automaton(pattern, syntax="re")
+            for _ in range(200):
+                text = "".join(rng.choice("abcx01.ñ") for _ in range(rng.randint(0, 12)))
+                with self.subTest(pattern=pattern, text=text):
+                    expected = _leftmost_longest(pattern, text)
+                    self.assertEqual([match.span() for match in automaton.finditer(text)], expected)
+
+                    match = automaton.search(text)
+                    self.assertEqual(match.span() if match else None, expected[0] if expected else None)
+
+                    if text.isascii():
+                        for data in (text.encode(), memoryview(text.encode()), memoryview(b"-" + text.encode())[1:]):
+                            self.assertEqual([match.span() for match in automaton.finditer(data)], expected)
+
+    def test_many_failed_candidates(self):
+        """Test texts where most candidate starts do not match."""
+        automaton = REParser().create_automaton("a[a-z]*b|c", syntax="re")
+        text = "a" * 5000 + "c-" + "a" * 5000 + "b"
+
+        self.assertEqual([match.span() for match in automaton.finditer(text)], [(5000, 5001), (5002, 10003)])
+
+    def test_exponential_dfa(self):
+        """Test that the unanchored tables are only built where the text reaches them."""
+        automaton = REParser().create_automaton("a[ab]{17}", syntax="re")
+        searcher = automaton.searcher()
+
+        self.assertIsNone(automaton.search("xxab"))
+        self.assertEqual(automaton.search("b" + "a" * 20).span(), (1, 19))
+        _, unanchored, reverse, _ = searcher._levels["str"]
+        self.assertLess(len(unanchored.finals) * 8, 100)
+        self.assertLess(len(reverse.finals) * 8, 100)
+
+    def test_cache_flush(self):
+        """Test that matches do not change when the table cache is flushed."""
+        rng = random.Random(1)
+        pattern = "a[a-c]*b|c"
+        automaton = REParser().create_automaton(pattern, syntax="re")
+        searcher = automaton.searcher()
+        automaton.search("")
+        for table in searcher._levels["str"][1:3]:
+            table.max_states = 2
+        for _ in range(200):
+            text = "".join(rng.choice("abcx") for _ in range(rng.randint(0, 12)))
+            with self.subTest(text=text):
+                self.assertEqual([match.span() for match in automaton.finditer(text)],
+                                 _leftmost_longest(pattern, text))
+        self.assertGreater(sum(table.flushes for table in searcher._levels["str"][1:3]), 0)
+
+    def test_leftmost_longest(self):
+        """Test the POSIX semantics, which differ from re's leftmost-first."""
+        automaton = REParser().create_automaton("a|ab|abc", syntax="re")
+        match = automaton.search("xxabcab")
+
+        self.assertEqual(match.span(), (2, 5))
+        self.assertEqual(match.group(), "abc")
+        self.assertEqual(re.search("a|ab|abc", "xxabcab").span(), (2, 3))
+        self.assertEqual([match.group() for match in automaton.finditer("xxabcab")], ["abc", "ab"])
+
+        # The leftmost match ends after an earlier, shorter one
+        automaton = REParser().create_automaton("abcd|c", syntax="re")
+        self.assertEqual(automaton.search("abcd").span(), (0, 4))
+
+    def test_bytes(self):
+        """Test searching bytes and memoryviews with byte offsets."""
+        automaton = REParser().create_automaton("ñ+a|b", syntax="re")
+        data = "xññab-ña".encode("utf-8")
+        expected = [(1, 6), (6, 7), (8, 11)]
+
+        self.assertEqual([match.span() for match in automaton.finditer(data)], expected)
+        self.assertEqual([match.span() for match in automaton.finditer(memoryview(data))], expected)
+        self.assertEqual([match.span() for match in automaton.finditer(bytearray(data))], expected)
+        self.assertEqual(automaton.search(data).group(), "ñña".encode("utf-8"))
+        self.assertEqual([match.span() for match in automaton.finditer("xññab-ña")],
+                         [(1, 4), (4, 5), (6, 8)])
+
+    def test_positions(self):
+        """Test searching between pos and endpos."""
+        automaton = REParser().create_automaton("a.b")
+
+        self.assertEqual(automaton.search("abab", 1).span(), (2, 4))
+        self.assertIsNone(automaton.search("abab", 1, 3))
+        self.assertEqual([match.span() for match in automaton.finditer("ababab", 1, 5)], [(2, 4)])
+        self.assertIsNone(automaton.search("ab", 3))
+
+    def test_no_match(self):
+        """Test texts and automata without matches."""
+        self.assertIsNone(REParser().create_automaton("a.b").search("xxxx"))
+        self.assertEqual(list(REParser().create_automaton("").finditer("ab")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
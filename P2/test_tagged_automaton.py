@@ -0,0 +1,97 @@
+"""Test capture groups with tagged automata."""
+import random
+import re
+import unittest
+
+from re_parser import REParser
+
+# RE5 and RE6 of P1/regular_expressions.py
+DATE = "(0[1-9]|1[0-9]|2[0-9]|30)[/](0[1-9]|1[0-2])[/]([1-9][0-9][0-9][0-9])"
+OCTET = "([0-9]|[1-9][0-9]|1[0-9][0-9]|2[0-4][0-9]|25[0-5])"
+
+
+class TestTaggedAutomaton(unittest.TestCase):
+    """Tests for REParser.create_tagged_automaton."""
+
+    def assert_same_as_re(self, pattern, strings):
+        """Check fullmatch and match against re for every string."""
+        automaton = REParser().create_tagged_automaton(pattern)
+        self.assertEqual(automaton.groups, re.compile(pattern).groups)
+        for string in strings:
+            with self.subTest(pattern=pattern, string=string):
+                expected = re.fullmatch(pattern, string)
+                result = automaton.fullmatch(string)
+                if expected is None:
+                    self.assertIsNone(result)
+                else:
+                    self.assertEqual(result.groups(), expected.groups())
+                    self.assertEqual([result.span(i) for i in range(automaton.groups + 1)],
+                                     [expected.span(i) for i in range(automaton.groups + 1)])
+
+                expected = re.match(pattern, string)
+                result = automaton.match(string)
+                if expected is None:
+                    self.assertIsNone(result)
+                else:
+                    self.assertEqual(result.span(), expected.span())
+                    self.assertEqual(result.groups(), expected.groups())
+
+    def test_p1_groups(self):
+        """Test the groups of the date and IP regexes of P1."""
+        parser = REParser()
+        date = parser.create_tagged_automaton(DATE)
+        self.assertEqual(date.fullmatch("01/12/2025").groups(), ("01", "12", "2025"))
+        self.assertIsNone(date.fullmatch("31/12/2025"))
+
+        ip = parser.create_tagged_automaton(rf"{OCTET}\.{OCTET}\.{OCTET}\.{OCTET}")
+        self.assertEqual(ip.fullmatch("192.168.0.1").groups(), ("192", "168", "0", "1"))
+        self.assertEqual(ip.fullmatch("255.25.2.250").group(1, 3), ("255", "2"))
+        self.assertIsNone(ip.fullmatch("256.1.1.1"))
+        self.assertIsNone(ip.fullmatch("01.1.1.1"))
+
+    def test_same_as_re(self):
+        """Test that groups and spans agree with re on ambiguous regexes."""
+        patterns = [
+            "(a|ab)(b?)", "(a*)(a*)", "((a)|b)*", "(a|b)*(b)", "(x(y)?)+",
+            "(a{1,3})(a{0,2})", "(?:(a)|(b))+c", "([ab]+)([bc]+)",
+            "(a|ab|abc)*(c?)", "((ab)*|a)(b*)", "(a*)+", "(|a)(a)", "(a)|b",
+        ]
+        rng = random.Random(0)
+        strings = ["".join(rng.choice("abcxy") for _ in range(rng.randint(0, 6))) for _ in range(300)]
+        for pattern in patterns:
+            self.assert_same_as_re(pattern, strings)
+
+    def test_empty_iterations(self):
+        """Test that an iteration that matches nothing ends the repetition, as in re."""
+        patterns = [
+            "b?([b0-2]{,2}b?)*c+|0", "(a*)*", "(a*)*(b)", "[ab]+(|[b0-2]){2,}|",
+            "(|0a)(?:(?:())|){2,}(((|0{1,2}b*)|(?:a*)){2})*|", "((a?)(b?)){2,3}",
+            "(?:(a*)|b)*", "((a)|())*", "(a|())+b?",
+        ]
+        rng = random.Random(1)
+        strings = ["".join(rng.choice("ab0c") for _ in range(rng.randint(0, 5))) for _ in range(200)]
+        for pattern in patterns:
+            self.assert_same_as_re(pattern, strings)
+
+        pattern = "b?([b0-2]{,2}b?)*c+|0"
+        self.assertEqual(REParser().create_tagged_automaton(pattern).fullmatch("b0c").groups(),
+                         re.fullmatch(pattern, "b0c").groups())
+
+    def test_unsupported(self):
+        """Test that lazy quantifiers are rejected with capture groups."""
+        parser = REParser()
+        with self.assertRaises(ValueError):
+            parser.create_tagged_automaton("(a*?)b")
+        # Without capture groups, lazy quantifiers are accepted
+        self.assertTrue(parser.create_automaton("a*?b", syntax="re").accepts("aab"))
+
+    def test_linear(self):
+        """Test that a long string is evaluated without backtracking."""
+        automaton = REParser().create_tagged_automaton("((a|b)*)(c)")
+        string = "ab" * 20000 + "c"
+        self.assertEqual(automaton.fullmatch(string).groups(), (string[:-1], "b", "c"))
+        self.assertIsNone(automaton.fullmatch("ab" * 20000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -166,6 +166,33 @@ class TestTransform(ABC, unittest.TestCase):
 
         self._check_transform(automaton, expected)
 
+    def test_state_names(self):
+        """Test optional descriptive state names."""
+        automaton_str = """
+        Automaton:
+        Symbols: 01
+
+        q0
+        q1
+        q2 final
+
+        ini q0 -0-> q1
+        q0 -0-> q2
+        q1 -1-> q2
+        """
+
+        automaton = AutomataFormat.read(automaton_str)
+
+        transformed = automaton.to_deterministic()
+        self.assertEqual(transformed.initial_state, "q0")
+        self.assertIn("Empty", transformed.states)
+
+        named = automaton.to_deterministic(state_names=True)
+        self.assertEqual(named.initial_state, "{q0}")
+        self.assertIn("{q1, q2}", named.states)
+        self.assertIn("{q1, q2}", named.final_states)
+        self.assertTrue(deterministic_automata_isomorphism(transformed, named) is not None)
+
 
 if __name__ == '__main__':
     unittest.main()
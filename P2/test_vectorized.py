@@ -0,0 +1,50 @@
+"""Test vectorized batch evaluation."""
+import random
+import unittest
+
+from re_parser import REParser
+
+try:
+    import numpy
+    from vectorized import accepts_batch
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestVectorized(unittest.TestCase):
+    """Tests for NumPy batch evaluation."""
+
+    def _check_batch(self, regex, strings):
+        automaton = REParser().create_automaton(regex)
+        result = accepts_batch(automaton, strings)
+
+        self.assertEqual(result.dtype, numpy.bool_)
+        self.assertEqual(len(result), len(strings))
+        for string, accepted in zip(strings, result):
+            with self.subTest(string=string):
+                self.assertEqual(bool(accepted), automaton.accepts(string))
+
+    def test_batch(self):
+        """Test a batch of random strings."""
+        rng = random.Random(0)
+        strings = ["".join(rng.choice("abcz") for _ in range(rng.randint(0, 12)))
+                   for _ in range(300)]
+        self._check_batch("(a+b)*.a.(a+b)+c*", strings)
+
+    def test_classes(self):
+        """Test character class symbols."""
+        automaton = REParser().create_automaton("[0-9]+([.][0-9]+)?", syntax="re")
+        strings = ["1", "12.5", "1.", ".5", "", "1a", "99.01"]
+        result = accepts_batch(automaton, strings)
+        self.assertEqual(list(result), [automaton.accepts(string) for string in strings])
+
+    def test_edge_cases(self):
+        """Test empty batches, empty strings and unknown symbols."""
+        self._check_batch("a.b", [])
+        self._check_batch("a*", ["", "", "aaa", "aλa", "€"])
+        self._check_batch("a.b", ["", "ab", "abab", "b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
 """General utilities to work with automatas."""
+import mmap
 import re
+import struct
+import sys
+from array import array
 import automaton as aut
 from collections import deque, defaultdict
 
@@ -78,6 +82,181 @@ class AutomataFormat():
 
         return automata
 
+class BinaryAutomataFormat():
+    """
+    Versioned binary format for compiled automata.
+
+    Layout (little endian):
+
+    - Header: magic ``AUTB``, version, flags, number of states, number of
+      symbols, initial state, size of the symbol table and size of the names
+      section.
+    - Symbol table: one byte per symbol for byte level automata, otherwise
+      each symbol as a 16 bit length followed by its UTF-8 encoding. If the
+      alphabet has character classes, the text of a class symbol holds its
+      characters and a bitmap with one bit per symbol marks the classes.
+    - Transition table: ``n_states * n_symbols`` 32 bit integers, aligned to
+      4 bytes (-1 means no transition).
+    - Final states bitmap: one bit per state.
+    - State names (optional): each name as a 16 bit length and UTF-8 text.
+
+    A loaded automaton reads its table and bitmap straight from the buffer
+    (or ``mmap``) through ``memoryview`` objects.
+    """
+
+    magic = b"AUTB"
+    version = 1
+    header = struct.Struct("<4sHHIIiII")
+
+    FLAG_BYTES = 1
+    FLAG_NAMES = 2
+    FLAG_CLASSES = 4
+
+    @classmethod
+    def dumps(cls, automaton, names=False):
+        """
+        Serialize an automaton (compiled first if needed) to bytes.
+
+        Raises a ValueError if a symbol or a state name takes 65536 bytes or
+        more in UTF-8, since their lengths are stored in 16 bits.
+        """
+        compiled = automaton if isinstance(automaton, aut.CompiledAutomaton) else automaton._engine("dfa")
+
+        flags = 0
+        if compiled.byte_level:
+            flags |= cls.FLAG_BYTES
+            symtab = bytes(compiled.symbols)
+        elif any(isinstance(symbol, aut.SymbolClass) for symbol in compiled.symbols):
+            flags |= cls.FLAG_CLASSES
+            classes = bytearray((compiled.n_symbols + 7) >> 3)
+            strings = []
+            for i, symbol in enumerate(compiled.symbols):
+                if isinstance(symbol, aut.SymbolClass):
+                    classes[i >> 3] |= 1 << (i & 7)
+                    symbol = "".join(sorted(symbol))
+                strings.append(_pack_string(symbol))
+            symtab = b"".join(strings) + bytes(classes)
+        else:
+            symtab = b"".join(_pack_string(str(symbol)) for symbol in compiled.symbols)
+
+        names_section = b""
+        if names:
+            flags |= cls.FLAG_NAMES
+            names_section = b"".join(_pack_string(str(state)) for state in compiled.states)
+
+        table = array("i", compiled.table)
+        if sys.byteorder != "little":
+            table.byteswap()
+
+        head = cls.header.pack(
+            cls.magic, cls.version, flags, compiled.n_states, compiled.n_symbols,
+            compiled.initial_state, len(symtab), len(names_section),
+        ) + symtab
+        padding = b"\0" * (-len(head) % 4)
+
+        return head + padding + table.tobytes() + bytes(compiled.finals) + names_section
+
+    @classmethod
+    def dump(cls, automaton, file, names=False):
+        """Write an automaton to a path or a binary file object."""
+        data = cls.dumps(automaton, names)
+        if hasattr(file, "write"):
+            file.write(data)
+        else:
+            with open(file, "wb") as f:
+                f.write(data)
+
+    @classmethod
+    def loads(cls, data):
+        """Load a compiled automaton from a bytes-like object without copying it."""
+        view = memoryview(data).cast("B")
+        if len(view) < cls.header.size:
+            raise FormatParseError("Truncated header")
+
+        magic, version, flags, n_states, n_symbols, initial, symtab_size, names_size = \
+            cls.header.unpack_from(view)
+        if magic != cls.magic:
+            raise FormatParseError("Not a binary automaton")
+        if version != cls.version:
+            raise FormatParseError(f"Unsupported version: {version}")
+        if flags & ~(cls.FLAG_BYTES | cls.FLAG_NAMES | cls.FLAG_CLASSES) or \
+                (flags & cls.FLAG_BYTES and flags & cls.FLAG_CLASSES):
+            raise FormatParseError(f"Invalid flags: {flags}")
+        if not 0 <= initial < n_states:
+            raise FormatParseError(f"Invalid initial state: {initial}")
+
+        # Check the size of every section before reading any of them
+        offset = cls.header.size
+        table_offset = offset + symtab_size + (-(offset + symtab_size) % 4)
+        table_size = 4 * n_states * n_symbols
+        finals_size = (n_states + 7) >> 3
+        if len(view) < table_offset + table_size + finals_size + names_size:
+            raise FormatParseError("Truncated data")
+
+        symtab = view[offset:offset + symtab_size]
+        if flags & cls.FLAG_BYTES:
+            symbols = list(symtab)
+        else:
+            symbols = _unpack_strings(symtab, n_symbols)
+        if flags & cls.FLAG_CLASSES:
+            classes = symtab[len(symtab) - ((n_symbols + 7) >> 3):]
+            for i in range(n_symbols):
+                if (classes[i >> 3] >> (i & 7)) & 1:
+                    symbols[i] = aut.SymbolClass(symbols[i])
+        offset = table_offset
+
+        if sys.byteorder == "little":
+            table = view[offset:offset + table_size].cast("i")
+        else:
+            table = array("i", view[offset:offset + table_size].tobytes())
+            table.byteswap()
+        offset += table_size
+
+        finals = view[offset:offset + finals_size]
+        offset += finals_size
+
+        if flags & cls.FLAG_NAMES:
+            states = _unpack_strings(view[offset:offset + names_size], n_states)
+        else:
+            states = range(n_states)
+
+        compiled = aut.CompiledAutomaton(initial, states, symbols, table, finals)
+        compiled.buffer = data
+        return compiled
+
+    @classmethod
+    def load(cls, file):
+        """Load a compiled automaton from a path, mapping the file in memory."""
+        with open(file, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.loads(data)
+
+
+def _pack_string(string):
+    data = string.encode("utf-8")
+    if len(data) > 0xFFFF:
+        raise ValueError(f"String too long for the binary format: {len(data)} bytes (max 65535)")
+    return struct.pack("<H", len(data)) + data
+
+
+def _unpack_strings(view, count):
+    strings = []
+    offset = 0
+    for _ in range(count):
+        if offset + 2 > len(view):
+            raise FormatParseError("Truncated string table")
+        size, = struct.unpack_from("<H", view, offset)
+        offset += 2
+        if offset + size > len(view):
+            raise FormatParseError("Truncated string table")
+        try:
+            strings.append(bytes(view[offset:offset + size]).decode("utf-8"))
+        except UnicodeDecodeError as error:
+            raise FormatParseError(f"Invalid string: {error}") from None
+        offset += size
+    return strings
+
+
 def _get_all_transitions(automaton):
     automaton_all_transitions = []
     for state_ini in automaton.transitions:
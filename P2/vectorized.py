@@ -0,0 +1,104 @@
+"""
+Módulo para la evaluación vectorizada de autómatas deterministas con NumPy.
+
+Las cadenas de un lote se codifican en una matriz de columnas de símbolos,
+rellenada hasta la longitud de la cadena más larga, y todas avanzan a la vez
+columna a columna indexando la tabla de transiciones compilada.
+
+NumPy es una dependencia opcional (está en requirements.txt, pero el resto
+del paquete no la necesita). Sin NumPy el módulo se importa igualmente, pero
+accepts_batch() lanza ImportError: no hay una implementación alternativa en
+Python puro. En ese caso las cadenas se evalúan una a una con accepts() del
+autómata o de su tabla compilada, que es lo que hace benchmark.py, que omite
+la columna de NumPy.
+"""
+
+from automaton import CompiledAutomaton
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def accepts_batch(automaton, cadenas):
+    """
+    Evalúa un lote de cadenas con un autómata determinista.
+
+    Las filas de la matriz se ordenan por longitud decreciente, de modo que en
+    la columna j solo se actualiza el prefijo de filas con más de j símbolos.
+
+    Args:
+        automaton (FiniteAutomaton | CompiledAutomaton): Autómata a evaluar.
+            Si no está compilado se compila (y determiniza si hace falta).
+        cadenas (list[str]): Lote de cadenas.
+
+    Returns:
+        numpy.ndarray: Vector booleano con el resultado de cada cadena.
+
+    Raises:
+        ImportError: Si NumPy no está instalado.
+    """
+    if np is None:
+        raise ImportError("accepts_batch requires numpy")
+
+    compiled = automaton if isinstance(automaton, CompiledAutomaton) else automaton._engine("dfa")
+    table, finals, lut = _tables(compiled)
+    n_symbols = compiled.n_symbols
+
+    cadenas = list(cadenas)
+    lengths = np.fromiter(map(len, cadenas), dtype=np.int64, count=len(cadenas))
+    max_length = int(lengths.max()) if len(cadenas) else 0
+
+    # Columna de cada carácter: los que no están en el alfabeto van a n_symbols
+    codes = np.frombuffer("".join(cadenas).encode("utf-32-le"), dtype=np.uint32)
+    known = codes < len(lut)
+    columns = np.full(len(codes), n_symbols, dtype=np.int32)
+    columns[known] = lut[codes[known]]
+
+    dtype = np.uint8 if n_symbols < 255 else np.int32
+    matrix = np.zeros((len(cadenas), max_length), dtype=dtype)
+    matrix[np.arange(max_length) < lengths[:, None]] = columns
+
+    order = np.argsort(-lengths, kind="stable")
+    matrix = matrix[order]
+    active = np.searchsorted(-lengths[order], -np.arange(1, max_length + 1), side="right")
+
+    states = np.full(len(cadenas), compiled.initial_state, dtype=np.int32)
+    for j in range(max_length):
+        rows = active[j]
+        states[:rows] = table[states[:rows], matrix[:rows, j]]
+
+    accepted = np.empty(len(cadenas), dtype=bool)
+    accepted[order] = finals[states]
+    return accepted
+
+
+def _tables(compiled):
+    """
+    Tablas NumPy de un autómata compilado.
+
+    Returns:
+        tuple: Tabla (n_states + 1) x (n_symbols + 1) con un estado muerto
+               absorbente y una columna para símbolos desconocidos, vector de
+               estados finales y tabla de códigos Unicode -> columna.
+    """
+    n_states, n_symbols = compiled.n_states, compiled.n_symbols
+    dead = n_states
+
+    table = np.full((n_states + 1, n_symbols + 1), dead, dtype=np.int32)
+    if n_symbols:
+        body = np.asarray(compiled.table, dtype=np.int32).reshape(n_states, n_symbols)
+        table[:n_states, :n_symbols] = np.where(body < 0, dead, body)
+
+    finals = np.zeros(n_states + 1, dtype=bool)
+    bits = np.unpackbits(np.frombuffer(bytes(compiled.finals), dtype=np.uint8), bitorder="little")
+    finals[:n_states] = bits[:n_states]
+
+    codes = {ord(symbol): col for symbol, col in compiled.symbol_index.items()
+             if isinstance(symbol, str) and len(symbol) == 1}
+    lut = np.full(max(codes, default=-1) + 1, n_symbols, dtype=np.int32)
+    for code, col in codes.items():
+        lut[code] = col
+
+    return table, finals, lut
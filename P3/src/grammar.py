@@ -308,7 +308,8 @@ class LL1Table:
         Method to analyze a string using the LL(1) table.
 
         Args:
-            input_string: string to analyze.
+            input_string: string to analyze, or any sequence of terminals
+                ending with "$" (e.g. the TokenStream of a P2 lexer.Lexer).
             start: initial symbol.
 
         Returns: